@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the class-search page load with and without the lean page profile.
+
+Loads the page --runs times per profile in one headless Chrome session each,
+with the browser cache cleared before every load, and reports the time until
+the page counts as loaded (driver.get() plus the scraper's page_load wait)
+and the requests, blocked requests and bytes transferred, taken from the
+DevTools network events in Chrome's performance log. Each run also checks
+that the search form's fields can still be found.
+
+Without --url a local schedule_mock_server.py is started with --assets, so
+the page carries a stylesheet, a web font, images and a cross-host
+analytics script like the live site.
+
+    python benchmark_page_load.py --runs 10 --latency 0.05
+    python benchmark_page_load.py --url "https://commtech.byu.edu/noauth/classSchedule/index.php" --block-host cdn.example.com
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from schedule_driver_pool import create_driver
+from schedule_page_profile import FULL_PROFILE, LEAN_PROFILE, PageProfile, network_summary, with_hosts
+from schedule_readiness import Readiness, document_ready
+from schedule_selectors import classify, probe_form
+
+
+def load_once(driver, url: str) -> Dict:
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.get_log("performance")  # drop events from before this load
+    start = time.perf_counter()
+    driver.get(url)
+    Readiness(driver).wait("page_load", document_ready)
+    elapsed = time.perf_counter() - start
+    run = network_summary(driver.get_log("performance"))
+    run["page_load_ms"] = round(elapsed * 1000, 1)
+    roles = classify(probe_form(driver).controls)
+    run["form_ok"] = all(role in roles for role in ("term_select", "dept_field", "catalog_field", "search_button"))
+    return run
+
+
+def bench_profile(profile: PageProfile, url: str, runs: int) -> Dict:
+    driver = create_driver(profile, performance_log=True)
+    try:
+        driver.get(url)  # warm up the session (DNS, connections) before timing
+        loads: List[Dict] = [load_once(driver, url) for _ in range(runs)]
+    finally:
+        driver.quit()
+    by_type: Dict[str, int] = {}
+    for load in loads:
+        for kind, size in load["bytes_by_type"].items():
+            by_type[kind] = by_type.get(kind, 0) + size
+    return {
+        "profile": profile.name,
+        "page_load_strategy": profile.page_load_strategy,
+        "runs": runs,
+        "page_load_ms": {
+            "median": round(statistics.median(load["page_load_ms"] for load in loads), 1),
+            "min": min(load["page_load_ms"] for load in loads),
+            "max": max(load["page_load_ms"] for load in loads),
+        },
+        "requests": round(statistics.mean(load["requests"] for load in loads), 1),
+        "blocked": round(statistics.mean(load["blocked"] for load in loads), 1),
+        "bytes": round(statistics.mean(load["bytes"] for load in loads)),
+        "bytes_by_type": {kind: round(size / runs) for kind, size in sorted(by_type.items())},
+        "form_ok": all(load["form_ok"] for load in loads),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page-load time and bytes with the full and the lean page profile")
+    parser.add_argument('--url', help="page to load (default: a local mock server with page assets)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--block-host', action='append', default=[], metavar='HOST',
+                        help="also block this third-party host in the lean profile (repeatable)")
+    parser.add_argument('--latency', type=float, default=0.02, help="mock server latency per request, seconds")
+    args = parser.parse_args()
+
+    profiles = (FULL_PROFILE, with_hosts(LEAN_PROFILE, args.block_host))
+    if args.url:
+        report = [bench_profile(profile, args.url, args.runs) for profile in profiles]
+    else:
+        from schedule_mock_server import MockClassSearchServer
+        with MockClassSearchServer(latency=args.latency, assets=True) as server:
+            url = f"{server.base_url}?yearTerm=20261&creditType=2"
+            report = [bench_profile(profile, url, args.runs) for profile in profiles]
+    print(json.dumps(report, indent=2))
+    full, lean = report
+    print(f"lean profile: page load {lean['page_load_ms']['median']:.0f} ms vs {full['page_load_ms']['median']:.0f} ms, "
+          f"{lean['bytes']:,} vs {full['bytes']:,} bytes, {lean['blocked']:.0f} requests blocked")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark the table parser backends on class-search pages of several sizes.
+
+Parses synthetic results pages (and any recorded pages given with --pages)
+with every installed backend, checks that each backend returns exactly the
+rows of the html.parser reference, and reports rows/second per backend.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+from schedule_http import RESULT_COLUMNS
+from schedule_parsers import BACKENDS, available_backends, get_backend
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+SAMPLE_ROW = ("{section:03d}", "DAY", "Classroom", "Conner, Greg &amp; Staff", "3.00", "Winter 2026",
+              "MWF", "2:00 PM", "2:50 PM", "TMCB 121", "35/35", "0")
+
+
+def synthetic_page(row_count: int) -> str:
+    """A class-search results page in the 12-column layout with `row_count` sections"""
+    header = "".join(f"<th>{column}</th>" for column in RESULT_COLUMNS)
+    rows = []
+    for i in range(row_count):
+        cells = "".join(f"<td><span>{value.format(section=i + 1)}</span></td>" for value in SAMPLE_ROW)
+        rows.append(f"<tr class=\"row\">{cells}</tr>\n")
+    return (
+        "<html><head><title>Class Schedule</title></head><body>"
+        "<table class=\"layout\"><tr><td>BYU Class Schedule</td></tr></table>"
+        f"<p>{row_count} courses found</p>"
+        f"<table id=\"results\"><thead><tr>{header}</tr></thead><tbody>\n{''.join(rows)}</tbody></table>"
+        "</body></html>"
+    )
+
+
+def load_pages(sizes, pages_dir=None) -> List[Tuple[str, str]]:
+    pages = [(f"synthetic-{size}", synthetic_page(size)) for size in sizes]
+    if pages_dir:
+        for path in sorted(glob.glob(os.path.join(pages_dir, "**", "*.html"), recursive=True)):
+            with open(path, encoding='utf-8') as f:
+                pages.append((os.path.relpath(path, pages_dir), f.read()))
+    return pages
+
+
+def time_backend(backend, html: str, min_seconds: float) -> Tuple[float, int]:
+    """Best seconds per parse over repeated runs, and the row count"""
+    best = float('inf')
+    spent = 0.0
+    runs = 0
+    rows = 0
+    while spent < min_seconds or runs < 3:
+        start = time.perf_counter()
+        rows = len(backend.rows(html))
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+    return best, rows
+
+
+def run(sizes=DEFAULT_SIZES, pages_dir=None, min_seconds: float = 0.5) -> List[Dict]:
+    reference = get_backend("html.parser")
+    report = []
+    for label, html in load_pages(sizes, pages_dir):
+        expected = reference.rows(html)
+        for name in available_backends():
+            backend = get_backend(name)
+            seconds, row_count = time_backend(backend, html, min_seconds)
+            report.append({
+                "page": label,
+                "bytes": len(html.encode('utf-8')),
+                "backend": name,
+                "rows": row_count,
+                "seconds": seconds,
+                "rows_per_second": row_count / seconds if seconds else 0.0,
+                "matches_reference": backend.rows(html) == expected,
+            })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML table parser backends")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="row counts of the synthetic pages")
+    parser.add_argument('--pages', metavar='DIR', help="also parse every recorded *.html page under DIR")
+    parser.add_argument('--min-seconds', type=float, default=0.5, help="minimum timing per backend and page")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    missing = [name for name in BACKENDS if name not in available_backends()]
+    report = run(args.sizes, args.pages, args.min_seconds)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'page':<28} {'backend':<12} {'rows':>7} {'ms/parse':>10} {'rows/s':>12}  same rows")
+    for entry in report:
+        print(f"{entry['page']:<28} {entry['backend']:<12} {entry['rows']:>7} "
+              f"{entry['seconds'] * 1000:>10.2f} {entry['rows_per_second']:>12,.0f}  "
+              f"{'yes' if entry['matches_reference'] else 'NO'}")
+    if missing:
+        print(f"\nnot installed: {', '.join(missing)}")
+    print(f"fastest available backend: {available_backends()[0]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure memory per scraped section: result dicts versus Section records.
+
+Parses synthetic full-term results pages (many courses, the mock server's
+row generator) and keeps the results either as the scrapers' dicts or as
+schedule_section.Section records, measuring what stays allocated with
+tracemalloc. Also checks that every Section serializes back to the same
+record as the dict it replaces.
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from schedule_columns import column_map
+from schedule_http import SimpleTableParser
+from schedule_mock_server import render_page, result_rows
+from schedule_section import Section, records_from_sections
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+DEPARTMENTS = ("MATH", "CS", "PHSCS", "CHEM", "STAT", "ECON", "ENGL", "HIST")
+
+
+def term_page(section_count: int, term: str = "Winter 2026") -> str:
+    """One results page holding `section_count` sections spread over many courses"""
+    rows = []
+    course = 0
+    while len(rows) < section_count:
+        department = DEPARTMENTS[course % len(DEPARTMENTS)]
+        rows.extend(result_rows(department, str(100 + course // len(DEPARTMENTS)), term, 8))
+        course += 1
+    return render_page("20261", rows=rows[:section_count])
+
+
+def parse_dicts(html: str) -> List:
+    parser = SimpleTableParser()
+    parser.feed(html)
+    parser.close()
+    columns = column_map(parser.header)
+    return [columns.project(row) for row in parser.rows]
+
+
+def parse_sections(html: str) -> List:
+    parser = SimpleTableParser()
+    parser.feed(html)
+    parser.close()
+    columns = column_map(parser.header)
+    return [Section.from_row(row, columns) for row in parser.rows]
+
+
+def retained_bytes(build: Callable[[str], List], html: str):
+    """Bytes still allocated after build(html) returns, and its result"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(html)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="sections per snapshot")
+    args = parser.parse_args()
+
+    print(f"{'sections':>9} {'dict bytes':>12} {'per section':>12} {'Section bytes':>14} {'per section':>12} "
+          f"{'saved':>6}  same JSON")
+    for size in args.sizes:
+        html = term_page(size)
+        dict_bytes, records = retained_bytes(parse_dicts, html)
+        section_bytes, sections = retained_bytes(parse_sections, html)
+        same = records_from_sections(sections) == records
+        del records, sections
+        print(f"{size:>9,} {dict_bytes:>12,} {dict_bytes / size:>12.0f} {section_bytes:>14,} "
+              f"{section_bytes / size:>12.0f} {1 - section_bytes / dict_bytes:>6.0%}  {'yes' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
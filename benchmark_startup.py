@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the scraper entry point, with an enforced budget.
+
+Runs the v0.8.0 scraper under `python -X importtime` several times per
+scenario and reports the fastest run's wall time, the import time spent
+beyond a bare interpreter, the slowest imports, and whether any module that
+only the browser path needs was loaded:
+
+    help  -- `--help`: argument parsing only
+    http  -- one lookup answered over HTTP by a local schedule_mock_server.py
+
+Exits with status 1 when a scenario's imports exceed --budget-ms or a
+forbidden module (selenium, webdriver_manager by default) was imported, so
+it can guard the fast path in CI:
+
+    python benchmark_startup.py --runs 5 --budget-ms 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+SCRAPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "byu_class_schedule_scraper_v0.8.0.py")
+DEFAULT_BUDGET_MS = 150.0
+DEFAULT_FORBIDDEN = ("selenium", "webdriver_manager")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, nesting depth) for every `-X importtime` line"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def run_once(args: List[str], cwd: str) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited {proc.returncode}: {proc.stderr[-500:]}")
+    return elapsed, parse_importtime(proc.stderr)
+
+
+def measure(name: str, args: List[str], runs: int, baseline: set, forbidden: Tuple[str, ...], top: int,
+            cwd: str) -> Dict:
+    best = None
+    for _ in range(runs):
+        elapsed, imports = run_once(args, cwd)
+        if best is None or elapsed < best[0]:
+            best = (elapsed, imports)
+    elapsed, imports = best
+    # Top-level imports beyond what a bare interpreter loads are the entry point's cost
+    own = [entry for entry in imports if entry[3] == 0 and entry[0] not in baseline]
+    loaded = {entry[0].split(".")[0] for entry in imports}
+    return {
+        "scenario": name,
+        "wall_ms": round(elapsed * 1000, 1),
+        "imports_ms": round(sum(entry[2] for entry in own) / 1000, 1),
+        "modules": len(imports),
+        "slowest": [{"module": module, "cumulative_ms": round(cumulative / 1000, 1)}
+                    for module, _, cumulative, _ in sorted(own, key=lambda entry: -entry[2])[:top]],
+        "forbidden_loaded": sorted(module for module in forbidden if module in loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report and budget check for the scraper entry point")
+    parser.add_argument('--runs', type=int, default=5, help="runs per scenario; the fastest is reported")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="most import time a scenario may add to a bare interpreter")
+    parser.add_argument('--forbid', action='append', metavar='MODULE',
+                        help=f"module that must not be imported (default: {', '.join(DEFAULT_FORBIDDEN)})")
+    parser.add_argument('--top', type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+    forbidden = tuple(args.forbid or DEFAULT_FORBIDDEN)
+
+    cwd = os.path.dirname(SCRAPER)
+    baseline = {entry[0] for entry in run_once(["-c", "pass"], cwd)[1] if entry[3] == 0}
+    from schedule_mock_server import MockClassSearchServer
+    with MockClassSearchServer() as server, tempfile.TemporaryDirectory() as tmp:
+        scenarios = {
+            "help": [SCRAPER, "--help"],
+            "http": [SCRAPER, "--base-url", server.base_url, "--no-cache", "--out", os.path.join(tmp, "out.json")],
+        }
+        report = [measure(name, command, args.runs, baseline, forbidden, args.top, cwd)
+                  for name, command in scenarios.items()]
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    for result in report:
+        if result["imports_ms"] > args.budget_ms:
+            failures.append(f"{result['scenario']}: imports took {result['imports_ms']} ms "
+                            f"(budget {args.budget_ms:g} ms)")
+        if result["forbidden_loaded"]:
+            failures.append(f"{result['scenario']}: imported {', '.join(result['forbidden_loaded'])}")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
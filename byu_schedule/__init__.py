@@ -0,0 +1,22 @@
+"""
+BYU class schedule scraper.
+
+Every way of looking a course up is a Backend (backends.py): http, selenium
+and replay, plus AutoBackend, which tries them in turn, fastest first when
+given a ranking from `--bench N --save-routes FILE`. They share core.py's
+extraction and normalization, so every backend returns the same records.
+
+    python -m byu_schedule --course "CS 235"
+    python -m byu_schedule --list-backends
+
+The schedule_*.py helper modules stay at the top of the repository; each is
+also a command of its own.
+"""
+from .backends import (BACKENDS, AutoBackend, Backend, HttpBackend, ReplayBackend, SeleniumBackend,
+                       available_backends, get_backend, load_routes)
+from .core import extract_results, normalize
+
+__all__ = [
+    "BACKENDS", "AutoBackend", "Backend", "HttpBackend", "ReplayBackend", "SeleniumBackend",
+    "available_backends", "get_backend", "load_routes", "extract_results", "normalize",
+]
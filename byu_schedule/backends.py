@@ -0,0 +1,301 @@
+"""
+Lookup strategies behind one interface.
+
+    http      -- ClassSearchClient: the form replayed over HTTP, no browser
+    selenium  -- headless Chrome driving the class-search page
+    replay    -- a recorded fixture: its HTTP responses, then its results pages
+
+A Backend answers lookup(query) with the course's result records ([] when
+the course has no sections) and raises when it could not read an answer,
+so AutoBackend can try the next one. lookup_many() answers a batch and
+returns the queries it could not answer. AutoBackend tries its backends in
+order, by default the order they are given, or fastest first from a routes
+file written by `python -m byu_schedule --bench N --save-routes FILE`.
+"""
+import importlib.util
+import json
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from schedule_batch import CourseQuery, filter_by_instructor, run_http_batch, tag_results
+from schedule_http import BYU_CLASS_SEARCH_URL, DEFAULT_TERM, ClassSearchClient
+from schedule_trace import get_tracer, span
+
+from .core import extract_results
+
+log = logging.getLogger(__name__)
+
+Results = List[Dict[str, str]]
+
+
+class Backend:
+    name = ""
+
+    def unavailable(self) -> Optional[str]:
+        """Why this backend cannot run here, or None"""
+        return None
+
+    def lookup(self, query: CourseQuery) -> Results:
+        raise NotImplementedError
+
+    def lookup_many(self, queries: Sequence[CourseQuery]) -> Tuple[Results, List[CourseQuery]]:
+        """Results of every query it could answer (filtered by instructor and tagged), and the rest"""
+        results: Results = []
+        pending: List[CourseQuery] = []
+        for query in queries:
+            try:
+                found = self.lookup(query)
+            except Exception as e:
+                log.warning("%s lookup failed for %s: %s", self.name, query.label, e)
+                pending.append(query)
+                continue
+            results.extend(tag_results(filter_by_instructor(found, query.instructor), query))
+        return results, pending
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class HttpBackend(Backend):
+    """
+    cache        -- schedule_cache.ResponseCache
+    recorder     -- schedule_fixtures.FixtureRecorder to save every response in
+    form         -- a captured search form (schedule_endpoint), skipping the landing page
+    concurrency  -- batch lookups in flight (1, or recording, runs them in turn on one client)
+    """
+    name = "http"
+
+    def __init__(self, base_url: str = BYU_CLASS_SEARCH_URL, term: str = DEFAULT_TERM, cache=None, recorder=None,
+                 form=None, concurrency: int = 8):
+        self.base_url = base_url
+        self.term = term
+        self.cache = cache
+        self.recorder = recorder
+        self.form = form
+        self.concurrency = concurrency
+        self._client: Optional[ClassSearchClient] = None
+
+    @property
+    def client(self) -> ClassSearchClient:
+        """One client per backend, so cookies and the parsed form stay warm between lookups"""
+        if self._client is None:
+            client = ClassSearchClient(base_url=self.base_url, term=self.term, cache=self.cache, form=self.form)
+            self._client = get_tracer().attach(client)
+            if self.recorder is not None:
+                self.recorder.attach(self._client)
+        return self._client
+
+    def lookup(self, query: CourseQuery) -> Results:
+        with span("http_lookup", course=f"{query.department} {query.catalog}"):
+            return self.client.search(query.department, query.catalog)
+
+    def lookup_many(self, queries: Sequence[CourseQuery]) -> Tuple[Results, List[CourseQuery]]:
+        with span("http_batch", queries=len(queries)):
+            if self.concurrency > 1 and self.recorder is None:
+                from schedule_async import run_http_batch_async
+                return run_http_batch_async(list(queries), self.concurrency, term=self.term,
+                                            base_url=self.base_url, cache=self.cache, form=self.form)
+            return run_http_batch(queries, self.client)
+
+
+class SeleniumBackend(Backend):
+    """
+    pool          -- schedule_driver_pool.DriverPool (default: the process-wide pool)
+    recorder      -- schedule_fixtures.FixtureRecorder to save each page in
+    extraction    -- "snapshot" or "per_element" (see core.extract_results)
+    private_pool  -- without a `pool`, start a one-browser pool of its own that close() quits
+    """
+    name = "selenium"
+
+    def __init__(self, base_url: str = BYU_CLASS_SEARCH_URL, pool=None, recorder=None, extraction: str = "snapshot",
+                 private_pool: bool = False):
+        self.base_url = base_url
+        self.pool = pool
+        self.recorder = recorder
+        self.extraction = extraction
+        self.private_pool = private_pool and pool is None
+
+    def unavailable(self) -> Optional[str]:
+        for module in ("selenium", "webdriver_manager"):
+            if importlib.util.find_spec(module) is None:
+                return f"{module} is not installed"
+        return None
+
+    def driver_pool(self):
+        if self.pool is None:
+            from schedule_driver_pool import DriverPool, get_default_pool
+            self.pool = DriverPool(size=1) if self.private_pool else get_default_pool()
+        return self.pool
+
+    def close(self):
+        if self.private_pool and self.pool is not None:
+            self.pool.close()
+
+    def lookup(self, query: CourseQuery) -> Results:
+        from .browser import scrape_course
+        with span("driver_setup"):
+            driver = self.driver_pool().acquire()
+        try:
+            return scrape_course(driver, query.department, query.catalog, query.instructor or "Conner",
+                                 self.extraction, self.recorder, self.base_url)
+        finally:
+            self.pool.release(driver)
+
+    def lookup_many(self, queries: Sequence[CourseQuery]) -> Tuple[Results, List[CourseQuery]]:
+        from .browser import scrape_batch
+        try:
+            with span("driver_setup"):
+                driver = self.driver_pool().acquire()
+        except Exception as e:
+            log.warning("Failed to setup Chrome driver: %s", e)
+            return [], list(queries)
+        try:
+            return scrape_batch(driver, queries, self.extraction, self.recorder, self.base_url)
+        except Exception as e:
+            log.error("Error during scraping: %s", e)
+            return [], list(queries)
+        finally:
+            self.pool.release(driver)
+
+
+class ReplayBackend(Backend):
+    """A recorded fixture (schedule_fixtures): the HTTP client against its responses, else its results pages"""
+    name = "replay"
+
+    def __init__(self, replayer, cache=None):
+        self.replayer = replayer
+        self.cache = cache
+        self._client: Optional[ClassSearchClient] = None
+
+    @property
+    def client(self) -> ClassSearchClient:
+        if self._client is None:
+            self._client = self.replayer.client(cache=self.cache)
+        return self._client
+
+    def lookup(self, query: CourseQuery) -> Results:
+        try:
+            with span("http_lookup", course=f"{query.department} {query.catalog}"):
+                return self.client.search(query.department, query.catalog)
+        except Exception as e:
+            log.warning("Recorded HTTP response unusable: %s", e)
+        return self.replay_page(query)
+
+    def lookup_many(self, queries: Sequence[CourseQuery]) -> Tuple[Results, List[CourseQuery]]:
+        results, pending = run_http_batch(queries, self.client)
+        for query in pending:
+            found = self.replay_page(query)
+            results.extend(tag_results(filter_by_instructor(found, query.instructor), query))
+        return results, []
+
+    def replay_page(self, query: CourseQuery) -> Results:
+        """Run the browser-side extraction on the results page recorded for this course"""
+        department, catalog = query.department, query.catalog
+        driver = self.replayer.page("results", f"{department} {catalog}")
+        if driver is None:
+            log.warning("No recorded results page for %s %s", department, catalog)
+            return []
+        log.info("Replaying recorded results page for %s %s", department, catalog)
+        with span("extraction", course=f"{department} {catalog}"):
+            return extract_results(driver, department, catalog, query.instructor or "Conner")
+
+
+class AutoBackend(Backend):
+    """
+    Tries `backends` in order, skipping unavailable ones. `routes` (a list
+    of backend names, fastest first) reorders them; backends it does not
+    name keep their place after the ranked ones.
+    """
+    name = "auto"
+
+    def __init__(self, backends: Iterable[Backend], routes: Optional[Sequence[str]] = None):
+        backends = list(backends)
+        if routes:
+            rank = {name: i for i, name in enumerate(routes)}
+            backends.sort(key=lambda backend: rank.get(backend.name, len(rank)))
+        self.backends = []
+        for backend in backends:
+            reason = backend.unavailable()
+            if reason is None:
+                self.backends.append(backend)
+            else:
+                log.debug("Skipping the %s backend: %s", backend.name, reason)
+        self.stats: Dict[str, Dict[str, float]] = {
+            backend.name: {"answered": 0, "failed": 0, "seconds": 0.0} for backend in self.backends}
+
+    def unavailable(self) -> Optional[str]:
+        return None if self.backends else "no backend can run here"
+
+    def lookup(self, query: CourseQuery) -> Results:
+        errors = []
+        for backend in self.backends:
+            log.info("Trying the %s backend...", backend.name)
+            start = time.perf_counter()
+            try:
+                results = backend.lookup(query)
+            except Exception as e:
+                log.warning("%s backend failed: %s", backend.name, e)
+                self.stats[backend.name]["failed"] += 1
+                errors.append(f"{backend.name}: {e}")
+                continue
+            self.stats[backend.name]["answered"] += 1
+            self.stats[backend.name]["seconds"] += time.perf_counter() - start
+            log.info("%s backend found %d results", backend.name, len(results))
+            return results
+        raise LookupError(f"no backend answered {query.label} ({'; '.join(errors) or 'none available'})")
+
+    def lookup_many(self, queries: Sequence[CourseQuery]) -> Tuple[Results, List[CourseQuery]]:
+        log.info("Running batch of %d queries...", len(queries))
+        results: Results = []
+        pending = list(queries)
+        for backend in self.backends:
+            if not pending:
+                break
+            log.info("%s backend: %d queries...", backend.name, len(pending))
+            start = time.perf_counter()
+            found, left = backend.lookup_many(pending)
+            self.stats[backend.name]["answered"] += len(pending) - len(left)
+            self.stats[backend.name]["failed"] += len(left)
+            self.stats[backend.name]["seconds"] += time.perf_counter() - start
+            results.extend(found)
+            pending = left
+        if pending:
+            log.warning("No backend answered %d queries: %s", len(pending),
+                        ", ".join(query.label for query in pending))
+        return results, pending
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+BACKENDS = {backend.name: backend for backend in (HttpBackend, SeleniumBackend, ReplayBackend)}
+
+
+def get_backend(name: str, **options) -> Backend:
+    """A backend by name, e.g. get_backend("http", base_url=..., cache=...)"""
+    try:
+        return BACKENDS[name](**options)
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r} (choose from {', '.join(sorted(BACKENDS))})") from None
+
+
+def load_routes(path: str) -> List[str]:
+    """Backend names fastest first, from a --save-routes file"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)["ranking"]
+
+
+def available_backends(backends: Iterable[Backend]) -> Dict[str, Optional[str]]:
+    """name -> None when the backend can run here, else the reason it cannot"""
+    return {backend.name: backend.unavailable() for backend in backends}
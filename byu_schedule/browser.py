@@ -0,0 +1,375 @@
+"""
+The Selenium flow against the class-search page.
+
+open_class_search() loads the page and chooses the term, search_course()
+fills in and submits the form. scrape_course() and scrape_batch() run whole
+lookups on a driver and raise when the page cannot be driven (the selenium
+backend uses them); fetch_schedule_selenium() / fetch_batch_selenium() wrap
+them with a browser borrowed from a schedule_driver_pool.DriverPool and log
+failures instead. Selenium and the pool are imported by the
+functions that use them, so importing this module does not load them.
+"""
+import logging
+
+from schedule_batch import filter_by_instructor, tag_results
+from schedule_endpoint import capture_template, logging_pool
+from schedule_http import BYU_CLASS_SEARCH_URL, DEFAULT_TERM
+from schedule_selectors import control_of, discover_form, get_selector_cache, remember_fields
+from schedule_trace import get_tracer, span
+
+from .core import extract_results
+
+log = logging.getLogger(__name__)
+
+
+def open_class_search(driver, term=DEFAULT_TERM, base_url=BYU_CLASS_SEARCH_URL):
+    """Load the class search page and choose the term; returns the readiness tracker"""
+    from schedule_readiness import Readiness, document_ready
+    log.info("Accessing BYU class schedule...")
+    with span("page_load"):
+        # Use the specific URL with parameters
+        driver.get(f"{base_url}?yearTerm=20133&creditType=2")
+
+        log.debug("Waiting for page to load...")
+        readiness = Readiness(driver)
+        readiness.wait("page_load", document_ready)
+
+    with span("term_selection", term=term):
+        select_term(driver, readiness, term)
+
+    return readiness
+
+
+def select_term(driver, readiness, term=DEFAULT_TERM):
+    """Choose `term` in the term dropdown and wait for the page to settle"""
+    from selenium.webdriver.support.ui import Select
+    from schedule_readiness import select_populated
+
+    # First, select the term from the term dropdown
+    log.debug("Looking for term selector...")
+    term_found = False
+    term_select = None
+    try:
+        # One probe of the form finds the dropdown and its option texts
+        probe, fields = discover_form(driver, get_selector_cache())
+        control = control_of(probe, fields.term_select) if fields.term_select is not None else None
+        if control is not None and len(control["options"] or ()) >= 2:
+            term_select, option_texts = fields.term_select, control["options"]
+        else:
+            # Not there or not populated yet: wait for it the slow way
+            term_select = readiness.wait("term_select", select_populated())
+            if not term_select:
+                raise RuntimeError("term selector did not appear")
+            option_texts = [option.text for option in Select(term_select).options]
+        log.debug("Found term selector")
+
+        option_text = next((text for text in option_texts if term in text), None)
+        if option_text is not None:
+            log.info("Found %s option: %s", term, option_text)
+            Select(term_select).select_by_visible_text(option_text)
+            term_found = True
+        else:
+            log.warning("%s not found in dropdown, checking all options:", term)
+            for text in option_texts:
+                log.debug("  - %s", text)
+
+    except Exception as e:
+        log.warning("Error with term selector: %s", e)
+
+    # Wait for page to update after term selection
+    if term_found:
+        log.debug("Waiting for page to update after term selection...")
+        readiness.wait_for_term_update(term_select)
+
+
+def find_search_fields(driver):
+    """Locate the department and catalog number inputs; returns (dept_field, catalog_field)"""
+    from selenium.webdriver.common.by import By
+    log.debug("Looking for search fields...")
+
+    # Get all input fields and examine them
+    inputs = driver.find_elements(By.TAG_NAME, "input")
+    log.debug("Found %d input fields", len(inputs))
+
+    # Examine each input field to find the right ones
+    dept_field = None
+    catalog_field = None
+    debug = log.isEnabledFor(logging.DEBUG)
+
+    for i, input_field in enumerate(inputs):
+        try:
+            placeholder = input_field.get_attribute("placeholder")
+            name = input_field.get_attribute("name")
+            id_attr = input_field.get_attribute("id")
+
+            # type and value are only shown, never matched on
+            if debug:
+                log.debug("Input %d: type=%s, name=%s, id=%s, placeholder=%s, value=%s", i,
+                          input_field.get_attribute("type"), name, id_attr, placeholder,
+                          input_field.get_attribute("value"))
+
+            # Look for department field
+            if (placeholder and ("department" in placeholder.lower() or "dept" in placeholder.lower() or "subject" in placeholder.lower())) or \
+               (name and ("dept" in name.lower() or "subject" in name.lower())) or \
+               (id_attr and ("dept" in id_attr.lower() or "subject" in id_attr.lower())):
+                dept_field = input_field
+                log.debug("  -> Identified as department field")
+
+            # Look for catalog field
+            if (placeholder and ("catalog" in placeholder.lower() or "course" in placeholder.lower() or "number" in placeholder.lower())) or \
+               (name and ("catalog" in name.lower() or "course" in name.lower() or "number" in name.lower())) or \
+               (id_attr and ("catalog" in id_attr.lower() or "course" in id_attr.lower() or "number" in id_attr.lower())):
+                catalog_field = input_field
+                log.debug("  -> Identified as catalog field")
+
+        except Exception as e:
+            log.debug("Error examining input %d: %s", i, e)
+
+    # If we still haven't found the fields, try looking for them by their position or context
+    if not dept_field or not catalog_field:
+        log.debug("Trying alternative field identification...")
+
+        # Look for fields near labels or in specific positions
+        try:
+            # Try to find fields by looking for labels or nearby text
+            page_text = driver.page_source
+
+            # Look for "Department" text and find nearby input
+            if "Department" in page_text:
+                log.debug("Found 'Department' text in page")
+                # Try to find input field that might be near this text
+                dept_candidates = driver.find_elements(By.XPATH, "//input[preceding::*[contains(text(), 'Department')]]")
+                if dept_candidates:
+                    dept_field = dept_candidates[0]
+                    log.debug("Found department field by XPath")
+
+            # Look for "Catalog Number" text and find nearby input
+            if "Catalog Number" in page_text:
+                log.debug("Found 'Catalog Number' text in page")
+                # Try to find input field that might be near this text
+                catalog_candidates = driver.find_elements(By.XPATH, "//input[preceding::*[contains(text(), 'Catalog')]]")
+                if catalog_candidates:
+                    catalog_field = catalog_candidates[0]
+                    log.debug("Found catalog field by XPath")
+
+        except Exception as e:
+            log.warning("Error in alternative field identification: %s", e)
+
+    return dept_field, catalog_field
+
+
+def find_search_button(driver):
+    """Locate the form's search/submit button, or None"""
+    from selenium.webdriver.common.by import By
+    log.debug("Looking for search button...")
+    search_button = None
+    try:
+        # Try different selectors for the search button
+        button_selectors = [
+            "input[type='submit']",
+            "button[type='submit']",
+            "input[value*='Search']",
+            "input[value*='search']",
+            "button:contains('Search')",
+            "input[value*='Submit']"
+        ]
+
+        for selector in button_selectors:
+            try:
+                search_button = driver.find_element(By.CSS_SELECTOR, selector)
+                log.debug("Found search button with selector: %s", selector)
+                break
+            except:
+                continue
+
+        if not search_button:
+            # Try to find by value text
+            inputs = driver.find_elements(By.TAG_NAME, "input")
+            for input_field in inputs:
+                try:
+                    value = input_field.get_attribute("value")
+                    if value and ("search" in value.lower() or "submit" in value.lower()):
+                        search_button = input_field
+                        log.debug("Found search button by value: %s", value)
+                        break
+                except:
+                    continue
+
+    except Exception as e:
+        log.warning("Error finding search button: %s", e)
+
+    return search_button
+
+
+def search_course(driver, readiness, department, catalog):
+    """Fill in the department and catalog fields on the loaded form and submit it"""
+    from schedule_readiness import mark_page, results_changed
+    with span("field_discovery"):
+        # One script call finds every control; a known form layout reuses the cached roles
+        selectors = get_selector_cache()
+        probe, fields = discover_form(driver, selectors)
+        dept_field, catalog_field, search_button = fields.dept_field, fields.catalog_field, fields.search_button
+        log.debug("Form %s: fields %s", probe.fingerprint, "from cache" if fields.cached else "probed")
+        if dept_field is None or catalog_field is None:
+            found_dept, found_catalog = find_search_fields(driver)
+            dept_field = dept_field or found_dept
+            catalog_field = catalog_field or found_catalog
+        if search_button is None:
+            # Look for the search button
+            search_button = find_search_button(driver)
+        if not fields.cached:
+            remember_fields(selectors, probe, fields._replace(dept_field=dept_field, catalog_field=catalog_field,
+                                                              search_button=search_button))
+
+    with span("search", course=f"{department} {catalog}"):
+        # Fill in the search fields
+        if dept_field:
+            log.debug("Entering '%s' in department field", department)
+            dept_field.clear()
+            dept_field.send_keys(department)
+        else:
+            log.warning("Department field not found")
+
+        if catalog_field:
+            log.debug("Entering '%s' in catalog field", catalog)
+            catalog_field.clear()
+            catalog_field.send_keys(catalog)
+        else:
+            log.warning("Catalog field not found")
+
+        # Click the search button if found
+        if search_button:
+            log.debug("Clicking search button...")
+            before_search = mark_page(driver)
+            search_button.click()
+            if readiness.wait("results", results_changed(before_search)) is None:
+                log.warning("Results for %s %s did not load within %.0fs", department, catalog,
+                            readiness.phase_timeouts["results"])
+        else:
+            log.warning("Search button not found")
+
+
+def scrape_course(driver, department="MATH", catalog="451", instructor="Conner", extraction="snapshot",
+                  recorder=None, base_url=BYU_CLASS_SEARCH_URL):
+    """Look one course up on `driver`; raises when the page could not be driven"""
+    with get_tracer().watch_driver(driver):
+        readiness = open_class_search(driver, base_url=base_url)
+        if recorder is not None:
+            recorder.record_page("term_selected", driver)
+        search_course(driver, readiness, department, catalog)
+        log.info("Wait timings: %s", readiness.summary())
+        if recorder is not None:
+            recorder.record_page("results", driver, f"{department} {catalog}")
+        with span("extraction", course=f"{department} {catalog}"):
+            return extract_results(driver, department, catalog, instructor, extraction)
+
+
+def scrape_batch(driver, queries, extraction="snapshot", recorder=None, base_url=BYU_CLASS_SEARCH_URL):
+    """Look several courses up on `driver`, choosing the term only once; returns (results, queries that failed)"""
+    results = []
+    pending = []
+    with get_tracer().watch_driver(driver):
+        readiness = open_class_search(driver, base_url=base_url)
+        if recorder is not None:
+            recorder.record_page("term_selected", driver)
+        for query in queries:
+            log.info("Searching %s...", query.label)
+            try:
+                search_course(driver, readiness, query.department, query.catalog)
+                if recorder is not None:
+                    recorder.record_page("results", driver, f"{query.department} {query.catalog}")
+                with span("extraction", course=query.label):
+                    found = extract_results(driver, query.department, query.catalog,
+                                            query.instructor or "Conner", extraction)
+                results.extend(tag_results(filter_by_instructor(found, query.instructor), query))
+            except Exception as e:
+                log.error("Error searching %s: %s", query.label, e)
+                pending.append(query)
+        log.info("Wait timings: %s", readiness.summary())
+    return results, pending
+
+
+def fetch_schedule_selenium(department="MATH", catalog="451", instructor="Conner", extraction="snapshot", pool=None,
+                            recorder=None, base_url=BYU_CLASS_SEARCH_URL):
+    """Fetch schedule from BYU class schedule website.
+
+    extraction="snapshot" reads every table in one execute_script call;
+    extraction="per_element" walks rows and cells through WebDriver.
+    The browser is borrowed from `pool` (default: the process-wide pool)
+    and handed back afterwards instead of being quit. With a `recorder`
+    (schedule_fixtures.FixtureRecorder) the page source is saved after the
+    term is chosen and after the search.
+    """
+    from schedule_driver_pool import get_default_pool
+    log.info("Setting up Chrome driver...")
+    pool = pool or get_default_pool()
+
+    try:
+        with span("driver_setup"):
+            driver = pool.acquire()
+    except Exception as e:
+        log.error("Failed to setup Chrome driver: %s", e)
+        return []
+
+    results = []
+
+    try:
+        results = scrape_course(driver, department, catalog, instructor, extraction, recorder, base_url)
+    except Exception as e:
+        log.error("Error during scraping: %s", e)
+    finally:
+        pool.release(driver)
+
+    return results
+
+
+def fetch_batch_selenium(queries, extraction="snapshot", pool=None, recorder=None, base_url=BYU_CLASS_SEARCH_URL):
+    """Run several course queries through one browser session, choosing the term only once"""
+    from schedule_driver_pool import get_default_pool
+    log.debug("Setting up Chrome driver...")
+    pool = pool or get_default_pool()
+
+    try:
+        with span("driver_setup"):
+            driver = pool.acquire()
+    except Exception as e:
+        log.error("Failed to setup Chrome driver: %s", e)
+        return []
+
+    results = []
+
+    try:
+        results, _ = scrape_batch(driver, queries, extraction, recorder, base_url)
+    except Exception as e:
+        log.error("Error during scraping: %s", e)
+    finally:
+        pool.release(driver)
+
+    return results
+
+
+def discover_endpoint(department="MATH", catalog="451", instructor="Conner", base_url=BYU_CLASS_SEARCH_URL):
+    """Look up one course in a browser that logs its network traffic; returns
+    (RequestTemplate of the search request or None, results)"""
+    pool = logging_pool()
+    try:
+        with span("driver_setup"):
+            driver = pool.acquire()
+    except Exception as e:
+        log.error("Failed to setup Chrome driver: %s", e)
+        pool.close()
+        return None, []
+
+    template, results = None, []
+    # The lookup and the log capture share one session: a new one would start with an empty log
+    try:
+        results = scrape_course(driver, department, catalog, instructor, base_url=base_url)
+        template = capture_template(driver, department, catalog, base_url)
+        if template is None:
+            log.warning("No request carrying %s %s was found in the network log", department, catalog)
+    except Exception as e:
+        log.warning("No search request template captured; the lookup failed: %s", e)
+    finally:
+        pool.release(driver)
+        pool.close()
+    return template, results
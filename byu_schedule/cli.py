@@ -0,0 +1,297 @@
+"""
+The scraper's command line: one course, or a batch, through a chosen backend.
+
+--backend auto (the default) tries the http backend and falls back to the
+selenium one (only the replay backend when --replay is given, and never
+the browser in --offline mode). --bench N looks the courses up N times
+through every backend that can run here and ranks them: fastest first among
+those that answered every course and agreed with the reference backend.
+--save-routes keeps that ranking so later runs with --routes try the
+fastest working backend first.
+
+    python -m byu_schedule --course "CS 235"
+    python -m byu_schedule --backend http --query "MATH 451" --query "CS 235"
+    python -m byu_schedule --bench 5 --no-cache --query "MATH 451" --save-routes routes.json
+    python -m byu_schedule --routes routes.json --batch courses.txt
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional, Sequence
+
+from schedule_batch import CourseQuery, batch_output, load_queries, parse_query
+from schedule_cache import add_cache_arguments, cache_from_args
+from schedule_endpoint import DEFAULT_TEMPLATE_PATH, RequestTemplate
+from schedule_fixtures import FixtureRecorder, FixtureReplayer
+from schedule_http import BYU_CLASS_SEARCH_URL, DEFAULT_TERM
+from schedule_log import add_logging_arguments, logging_from_args
+from schedule_page_profile import LEAN_PROFILE, set_page_profile, with_hosts
+from schedule_selectors import SelectorCache, set_selector_cache
+from schedule_store import DEFAULT_STORE_PATH, SectionStore
+from schedule_trace import Tracer, set_tracer, span, trace_path_for
+
+from .backends import (BACKENDS, AutoBackend, Backend, HttpBackend, ReplayBackend, SeleniumBackend,
+                       available_backends, load_routes)
+from .core import normalize
+
+log = logging.getLogger("byu_class_schedule_scraper")
+
+VERSION = "0.9.0"
+
+
+def backend_chain(cache=None, recorder=None, replayer=None, base_url=BYU_CLASS_SEARCH_URL, form=None,
+                  concurrency=8, pool=None, private_pool=False) -> List[Backend]:
+    """The backends `auto` tries, in order; with `private_pool` closing them quits their browsers"""
+    if replayer is not None:
+        return [ReplayBackend(replayer, cache)]
+    backends: List[Backend] = [HttpBackend(base_url, cache=cache, recorder=recorder, form=form,
+                                           concurrency=concurrency)]
+    if cache is not None and cache.mode == "offline":
+        log.info("Offline mode, not falling back to Selenium")
+        return backends
+    backends.append(SeleniumBackend(base_url, pool=pool, recorder=recorder, private_pool=private_pool))
+    return backends
+
+
+def select_backend(name: str, chain: List[Backend], routes: Optional[Sequence[str]] = None) -> Backend:
+    if name == "auto":
+        return AutoBackend(chain, routes)
+    for backend in chain:
+        if backend.name == name:
+            return backend
+    raise ValueError(f"the {name} backend cannot be used with these options")
+
+
+def section_keys(results: List[Dict[str, str]]) -> set:
+    """What two backends must agree on: each section's course, number, days, time and instructor"""
+    return {(record.get("department", ""), record.get("catalog", ""), record.get("section", ""),
+             record.get("days", ""), record.get("start_time", ""), record.get("instructor", ""))
+            for record in normalize(results)}
+
+
+def bench_backend(backend: Backend, queries: Sequence[CourseQuery], runs: int) -> Dict:
+    """Median lookup latency of one backend over `runs` passes through the queries"""
+    latencies: List[float] = []
+    failed: Dict[str, str] = {}
+    results: List[Dict[str, str]] = []
+    for _ in range(runs):
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            try:
+                found = backend.lookup(query)
+            except Exception as e:
+                failed[query.label] = str(e)
+                continue
+            latencies.append(time.perf_counter() - start)
+            results.extend({**record, "department": query.department, "catalog": query.catalog} for record in found)
+    return {
+        "backend": backend.name,
+        "runs": runs,
+        "median_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None,
+        "ok": not failed,
+        "failed": failed,
+        "results": len(normalize(results)),
+        "_keys": section_keys(results),
+    }
+
+
+def bench(chain: List[Backend], queries: Sequence[CourseQuery], runs: int, reference: Optional[str] = None) -> Dict:
+    """
+    Benchmark every backend in `chain` that can run here. A backend's results
+    are compared with the reference backend's (default: the first one that
+    answered every course); the ranking lists the backends that answered
+    everything and agreed, fastest first.
+    """
+    report = []
+    for backend in chain:
+        reason = backend.unavailable()
+        if reason is not None:
+            report.append({"backend": backend.name, "ok": False, "unavailable": reason})
+            continue
+        log.info("Benchmarking the %s backend (%d runs)...", backend.name, runs)
+        report.append(bench_backend(backend, queries, runs))
+
+    answered = [entry for entry in report if entry["ok"]]
+    if reference is None and answered:
+        reference = answered[0]["backend"]
+    expected = next((entry["_keys"] for entry in answered if entry["backend"] == reference), None)
+    for entry in report:
+        keys = entry.pop("_keys", None)
+        if keys is not None:
+            entry["agrees"] = expected is not None and keys == expected
+    ranking = [entry["backend"] for entry in sorted(answered, key=lambda entry: entry["median_ms"])
+               if entry["agrees"]]
+    return {
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "queries": [query.label for query in queries],
+        "reference": reference,
+        "backends": report,
+        "ranking": ranking,
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Scrape the BYU class schedule for one or more courses")
+    parser.add_argument('--department', default='MATH')
+    parser.add_argument('--course', default='451', help="catalog number, or 'DEPT NUMBER'")
+    parser.add_argument('--instructor', default='Conner')
+    parser.add_argument('--batch', metavar='FILE', help="file of queries: one 'DEPT NUMBER [INSTRUCTOR]' per line, or JSON")
+    parser.add_argument('--query', action='append', default=[], metavar='QUERY',
+                        help="add a 'DEPT NUMBER [INSTRUCTOR]' query to the batch (repeatable)")
+    parser.add_argument('--concurrency', type=int, default=8, help="HTTP lookups in flight during a batch")
+    parser.add_argument('--out', default='byu_math451_winter2026_schedule.json')
+    parser.add_argument('--base-url', default=BYU_CLASS_SEARCH_URL,
+                        help="class search page, e.g. a local schedule_mock_server.py instance")
+    parser.add_argument('--backend', choices=["auto"] + sorted(BACKENDS), default="auto",
+                        help="how to look courses up (default: auto, the fastest backend that works)")
+    parser.add_argument('--list-backends', action='store_true', help="show which backends can run here and exit")
+    parser.add_argument('--bench', type=int, metavar='N',
+                        help="time N passes of the lookups through every backend, print the ranking and exit "
+                             "(add --no-cache to time the site rather than the cache)")
+    parser.add_argument('--bench-reference', choices=sorted(BACKENDS), metavar='BACKEND',
+                        help="backend whose results the others must match (default: the first that answers)")
+    parser.add_argument('--save-routes', metavar='FILE', help="with --bench, save the ranking for --routes")
+    parser.add_argument('--routes', metavar='FILE', help="with --backend auto, try backends in this saved ranking")
+    parser.add_argument('--trace', nargs='?', const='', metavar='PATH',
+                        help="write a Chrome trace-event timing trace (default: next to --out as *.trace.json)")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE_PATH, metavar='DB',
+                        help=f"also upsert the results into a SQLite section store (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument('--lean', action='store_true',
+                        help="load pages eagerly in the browser, without images, fonts, css, media or analytics")
+    parser.add_argument('--block-host', action='append', default=[], metavar='HOST',
+                        help="with --lean, also block requests to this third-party host (repeatable)")
+    parser.add_argument('--provenance', action='store_true',
+                        help="give each result the source and confidence of every field")
+    endpoint = parser.add_mutually_exclusive_group()
+    endpoint.add_argument('--discover-endpoint', nargs='?', const=DEFAULT_TEMPLATE_PATH, metavar='PATH',
+                          help="look the course up in a browser, capture the search request from its network log "
+                               f"and save it as a request template (default: {DEFAULT_TEMPLATE_PATH})")
+    endpoint.add_argument('--endpoint', metavar='PATH', help="send HTTP lookups straight to a captured search request")
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument('--record', metavar='DIR', help="save every response and page snapshot as a fixture in DIR")
+    fixtures.add_argument('--replay', metavar='DIR', help="serve responses and pages from the fixture in DIR, offline")
+    add_cache_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    logging_from_args(args)
+    cache = cache_from_args(args)
+    set_selector_cache(SelectorCache(None if args.no_cache else args.cache_dir))
+    set_page_profile(with_hosts(LEAN_PROFILE, args.block_host) if args.lean else None)
+    if args.discover_endpoint and (args.batch or args.query):
+        parser.error("--discover-endpoint takes a single course, not a batch")
+    if args.save_routes and not args.bench:
+        parser.error("--save-routes needs --bench")
+    if args.replay and args.backend not in ("auto", "replay"):
+        parser.error(f"--replay serves lookups from a fixture; it cannot be combined with --backend {args.backend}")
+    if args.backend == "replay" and not args.replay:
+        parser.error("--backend replay needs --replay DIR")
+    recorder = FixtureRecorder(args.record) if args.record else None
+    replayer = FixtureReplayer(args.replay) if args.replay else None
+    form = None
+    if args.endpoint:
+        try:
+            form = RequestTemplate.load(args.endpoint).form()
+        except (OSError, ValueError, TypeError) as e:
+            parser.error(f"--endpoint {args.endpoint}: {e}")
+    chain = backend_chain(cache, recorder, replayer, args.base_url, form, args.concurrency, private_pool=True)
+
+    if args.list_backends:
+        print(json.dumps({name: reason or "available" for name, reason in available_backends(chain).items()},
+                         indent=2))
+        return
+
+    department, catalog = args.department, args.course
+    if ' ' in catalog.strip():
+        department, catalog = catalog.split(None, 1)
+    if args.batch or args.query:
+        queries = load_queries(args.batch) if args.batch else []
+        queries.extend(parse_query(query) for query in args.query)
+    else:
+        queries = [CourseQuery(department, catalog, args.instructor)]
+
+    if args.bench:
+        if args.backend != "auto":
+            chain = [backend for backend in chain if backend.name == args.backend]
+        try:
+            report = bench(chain, queries, args.bench, args.bench_reference)
+        finally:
+            for backend in chain:
+                backend.close()
+        if args.save_routes:
+            with open(args.save_routes, "w") as f:
+                json.dump(report, f, indent=2)
+            log.info("Saved backend ranking to %s", args.save_routes)
+        print(json.dumps(report, indent=2))
+        return
+
+    routes = load_routes(args.routes) if args.routes else None
+    try:
+        backend = select_backend(args.backend, chain, routes)
+    except ValueError as e:
+        parser.error(str(e))
+    tracer = Tracer() if args.trace is not None else None
+    set_tracer(tracer)
+
+    log.info("Starting BYU class schedule scraper v%s (%s backend)...", VERSION, backend.name)
+    try:
+        with span("scrape"):
+            if args.batch or args.query:
+                results, _ = backend.lookup_many(queries)
+                results = normalize(results, DEFAULT_TERM, provenance=args.provenance)
+                output = batch_output(queries, results)
+            else:
+                if args.discover_endpoint:
+                    from .browser import discover_endpoint
+                    template, results = discover_endpoint(department, catalog, args.instructor, args.base_url)
+                    if template is not None:
+                        template.save(args.discover_endpoint)
+                        log.info("Saved search request template to %s", args.discover_endpoint)
+                else:
+                    try:
+                        results = backend.lookup(queries[0])
+                    except Exception as e:
+                        log.warning("Lookup failed: %s", e)
+                        results = []
+                # The extraction passes can report one section several times; keep one record each
+                results = normalize(results, DEFAULT_TERM, department, catalog, provenance=args.provenance)
+                output = {"ok": bool(results), "results": results}
+    finally:
+        backend.close()
+
+    if recorder is not None and results:
+        recorder.save()
+        log.info("Recorded fixture in %s", args.record)
+    elif recorder is not None:
+        log.warning("No results; keeping the previous fixture in %s", args.record)
+
+    # Save results to file
+    with open(args.out, "w") as f:
+        json.dump(output, f, indent=2)
+
+    if args.store:
+        # Batch results carry their own department/catalog tags
+        with SectionStore(args.store) as store:
+            count = store.upsert(results, DEFAULT_TERM, department, catalog)
+        log.info("Stored %d sections in %s", count, args.store)
+
+    if tracer is not None:
+        trace_path = args.trace or trace_path_for(args.out)
+        tracer.write(trace_path)
+        log.info("Wrote timing trace to %s", trace_path)
+
+    log.info("Scraping completed. Found %d results.", len(results))
+    print(json.dumps(output, indent=2))
+
+    if results:
+        log.info("Schedule found! Proceeding to generate grid...")
+    else:
+        log.info("No schedule found. Will use fallback MWF schedule.")
+
+
+if __name__ == "__main__":
+    main()
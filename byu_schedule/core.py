@@ -0,0 +1,201 @@
+"""
+Extraction and normalization shared by every backend.
+
+extract_results() reads the results on a loaded page: the table snapshot
+(one execute_script call) or a row-by-row WebDriver walk, then token
+pattern matching over the page source when no table could be read. It runs
+on a live browser (the selenium backend) as well as on a recorded page
+(the replay backend's ReplayDriver). normalize() merges what the passes and
+backends reported into one record per section.
+"""
+import logging
+
+from schedule_columns import column_map
+from schedule_dom import extract_schedule_tables, pattern_match_row, snapshot_tables
+from schedule_http import DEFAULT_TERM
+from schedule_patterns import scan_sections, token_counts
+from schedule_reconcile import reconcile
+from schedule_trace import get_tracer
+
+log = logging.getLogger(__name__)
+
+
+def extract_tables_per_element(driver, department="MATH", catalog="451", instructor_hint="Conner"):
+    """Walk every table row by row through WebDriver (one RPC per element)"""
+    from selenium.webdriver.common.by import By
+    # Row dumps need extra .text round-trips; only pay for them when they will be shown
+    debug = log.isEnabledFor(logging.DEBUG)
+    results = []
+    tables = driver.find_elements(By.TAG_NAME, "table")
+    log.debug("Found %d tables", len(tables))
+
+    # Examine both tables carefully
+    for table_idx, table in enumerate(tables):
+        rows = table.find_elements(By.TAG_NAME, "tr")
+        log.debug("Examining Table %d: %d rows", table_idx, len(rows))
+
+        # Look at the first few rows to understand the structure
+        for row_idx in range(min(3, len(rows)) if debug else 0):
+            row = rows[row_idx]
+            cells = row.find_elements(By.TAG_NAME, "td")
+            th_cells = row.find_elements(By.TAG_NAME, "th")
+
+            if th_cells:
+                log.debug("  Row %d (header): %s", row_idx, [cell.text for cell in th_cells])
+            elif cells:
+                log.debug("  Row %d (data): %s", row_idx, [cell.text for cell in cells])
+
+        # If this table has more than 2 rows and looks like a schedule table, examine it more closely
+        if len(rows) > 2:
+            log.debug("  Table %d has %d rows - examining for schedule data...", table_idx, len(rows))
+
+            # Look for header row
+            header_row = rows[0]
+            header_cells = header_row.find_elements(By.TAG_NAME, "th")
+            if not header_cells:
+                header_cells = header_row.find_elements(By.TAG_NAME, "td")
+
+            if header_cells:
+                header_texts = [cell.text for cell in header_cells]
+                log.debug("  Headers: %s", header_texts)
+                # Header names decide which cell holds which field, once for the whole table
+                columns = column_map(header_texts)
+                log.debug("  Columns: %s", columns)
+
+                # Look for schedule-related headers
+                header_texts = [text.lower() for text in header_texts]
+                if any(keyword in ' '.join(header_texts) for keyword in ['section', 'instructor', 'days', 'time', 'location']):
+                    log.debug("  This looks like a schedule table!")
+
+                    # Process data rows
+                    for row_idx in range(1, len(rows)):
+                        row = rows[row_idx]
+                        cells = row.find_elements(By.TAG_NAME, "td")
+
+                        if len(cells) > 5:
+                            cell_texts = [cell.text.strip() for cell in cells]
+                            row_text = " ".join(cell_texts)
+                            log.debug("    Row %d: %s", row_idx, row_text)
+
+                            # Look for MATH 451 rows
+                            if catalog in row_text and department in row_text:
+                                log.debug("    Found %s %s row!", department, catalog)
+
+                                try:
+                                    if columns.fits(cell_texts):
+                                        record = columns.project(cell_texts)
+                                        if debug:
+                                            for field, value in record.items():
+                                                log.debug("      %s: %s", field.replace("_", " ").capitalize(), value)
+
+                                        # The requested instructor's section, or any other section of the course for reference
+                                        results.append(record)
+                                        if instructor_hint in record["instructor"]:
+                                            log.debug("      Added %s's section to results", instructor_hint)
+                                        else:
+                                            log.debug("      Added %s %s section to results", department, catalog)
+
+                                except Exception as e:
+                                    log.warning("      Error extracting row data: %s", e)
+
+                                    # Try alternative extraction if the first method failed
+                                    try:
+                                        # Look for specific patterns in the row text
+                                        if instructor_hint in row_text:
+                                            # Extract days, time and room from the text in one tokenizer pass
+                                            results.append(pattern_match_row(row_text, "pattern_matching", f"{department} {catalog}", instructor_hint))
+                                            log.debug("      Added %s's section using pattern matching", instructor_hint)
+
+                                    except Exception as e2:
+                                        log.warning("      Error in alternative extraction: %s", e2)
+
+        # Also check the smaller table (might be the results table)
+        elif len(rows) <= 3:
+            log.debug("  Table %d has %d rows - might be results table...", table_idx, len(rows))
+
+            for row_idx, row in enumerate(rows):
+                cells = row.find_elements(By.TAG_NAME, "td")
+                th_cells = row.find_elements(By.TAG_NAME, "th")
+
+                if th_cells:
+                    if debug:
+                        log.debug("    Row %d (header): %s", row_idx, [cell.text for cell in th_cells])
+                elif cells:
+                    # Check if this row contains info for the course
+                    cell_texts = [cell.text for cell in cells]
+                    log.debug("    Row %d (data): %s", row_idx, cell_texts)
+                    row_text = " ".join(cell_texts)
+                    if catalog in row_text and department in row_text:
+                        log.debug("    Found %s %s info in small table!", department, catalog)
+
+                        # Try to extract what we can
+                        if instructor_hint in row_text:
+                            # Extract days, time and room from the text in one tokenizer pass
+                            results.append(pattern_match_row(row_text, "small_table_pattern_matching", f"{department} {catalog}", instructor_hint))
+                            log.debug("      Added %s's section from small table", instructor_hint)
+
+    return results
+
+
+def extract_results(driver, department="MATH", catalog="451", instructor_hint="Conner", extraction="snapshot"):
+    """Read the results currently on the page, falling back to page-source pattern matching"""
+    course = f"{department} {catalog}"
+    results = []
+
+    # Check for results
+    log.debug("Checking for search results...")
+    page_source = driver.page_source
+    get_tracer().count("page_source_chars", len(page_source))
+
+    if course in page_source:
+        log.debug("Found %s in page source", course)
+    if instructor_hint in page_source:
+        log.debug("Found '%s' in page source", instructor_hint)
+    if DEFAULT_TERM in page_source:
+        log.debug("Found '%s' in page source", DEFAULT_TERM)
+
+    # Now let's properly extract the schedule data from the results
+    log.debug("Extracting schedule data from results...")
+
+    try:
+        if extraction == "snapshot":
+            tables = snapshot_tables(driver)
+            log.debug("Found %d tables", len(tables))
+            results.extend(extract_schedule_tables(tables, department, catalog, instructor_hint))
+        else:
+            results.extend(extract_tables_per_element(driver, department, catalog, instructor_hint))
+    except Exception as e:
+        log.warning("Error processing results: %s", e)
+
+    # If we still don't have results, try a different approach
+    if not results:
+        log.info("No results extracted, trying alternative parsing...")
+        try:
+            # One tokenizer pass over the page source finds the instructor's
+            # sections together with their days, times and rooms
+            instructor_sections = scan_sections(page_source, instructor_hint, course)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Fallback token counts: %s", token_counts(page_source, instructor_hint))
+            if instructor_sections:
+                log.debug("Found %s schedule sections: %s", instructor_hint, instructor_sections)
+
+                for section in instructor_sections:
+                    results.append({
+                        "section": course,
+                        "instructor": section.instructor,
+                        "days": section.days,
+                        "time": section.time,
+                        "location": section.room,
+                        "extracted_from": "conner_pattern_matching"
+                    })
+                    log.info("Added %s's section using advanced pattern matching", instructor_hint)
+
+        except Exception as e:
+            log.warning("Error in alternative parsing: %s", e)
+
+    return results
+
+
+def normalize(results, term=DEFAULT_TERM, department="", catalog="", provenance=False):
+    """One record per section (see schedule_reconcile); department/catalog fill in for untagged records"""
+    return reconcile(results, term, department, catalog, provenance=provenance)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Concurrent class-search lookups on asyncio.
+
+Fans department/catalog/term queries out over the HTTP client with a global
+concurrency bound and a per-host connection limit, so a department-wide
+refresh takes roughly the slowest lookup instead of the sum of all of them.
+urllib is blocking, so each request runs on a worker thread owned by the
+engine; the parse step is the same SimpleTableParser pass as ClassSearchClient.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from schedule_batch import CourseQuery, filter_by_instructor, tag_results
+from schedule_http import BYU_CLASS_SEARCH_URL, DEFAULT_TERM, ClassSearchClient
+from schedule_trace import get_tracer
+
+log = logging.getLogger(__name__)
+
+
+class SweepQuery(NamedTuple):
+    department: str
+    catalog: str
+    term: str = DEFAULT_TERM
+    instructor: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.department} {self.catalog} [{self.term}]"
+
+
+class QueryOutcome(NamedTuple):
+    query: SweepQuery
+    results: List[Dict[str, str]]
+    error: Optional[str]
+    seconds: float  # time spent on the request itself, excluding queueing
+
+
+class AsyncClassSearch:
+    """
+    concurrency -- maximum lookups in flight overall
+    per_host    -- maximum lookups in flight against one host
+    form        -- a known schedule_http.SearchForm, so the landing page is never read
+    """
+    def __init__(self, base_url: str = BYU_CLASS_SEARCH_URL, concurrency: int = 32, per_host: int = 8,
+                 timeout: float = 30, cache=None, form=None):
+        self.base_url = base_url
+        self.form = form
+        self.cache = cache
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self._clients: Dict[str, ClassSearchClient] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._form_lock: Optional[asyncio.Lock] = None
+
+    def client_for(self, term: str) -> ClassSearchClient:
+        """One client per term; they share the search form once it has been read"""
+        client = self._clients.get(term)
+        if client is None:
+            client = ClassSearchClient(base_url=self.base_url, term=term, timeout=self.timeout, cache=self.cache)
+            get_tracer().attach(client)
+            loaded = next((c.form for c in self._clients.values() if c.form is not None), self.form)
+            client.form = loaded
+            self._clients[term] = client
+        return client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def _run(self, url: str, func, *args):
+        """Run a blocking call that requests `url` on the engine's threads; returns (value, seconds spent on the call)"""
+        loop = asyncio.get_running_loop()
+        async with self._global, self._host_semaphore(url):
+            start = time.perf_counter()
+            # Credit the worker thread's bytes and requests to the span the batch runs in
+            value = await loop.run_in_executor(self._executor, get_tracer().bind(func), *args)
+            return value, time.perf_counter() - start
+
+    async def _ensure_form(self, client: ClassSearchClient):
+        # Read the landing page once, not once per concurrent query
+        async with self._form_lock:
+            if client.form is None:
+                await self._run(self.base_url, client.load_form)
+                for other in self._clients.values():
+                    if other.form is None:
+                        other.form = client.form
+
+    async def lookup(self, query: SweepQuery) -> QueryOutcome:
+        client = self.client_for(query.term)
+        try:
+            await self._ensure_form(client)
+            # The search goes to the form's action, which may be on another host than the landing page
+            url, _ = client.request_for(query.department, query.catalog)
+            rows, seconds = await self._run(url, client.search, query.department, query.catalog)
+            return QueryOutcome(query, filter_by_instructor(rows, query.instructor), None, seconds)
+        except Exception as e:
+            return QueryOutcome(query, [], str(e) or type(e).__name__, 0.0)
+
+    async def lookup_all(self, queries: List[SweepQuery]) -> List[QueryOutcome]:
+        self._global = asyncio.Semaphore(self.concurrency)
+        self._hosts = {}
+        self._form_lock = asyncio.Lock()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            try:
+                return await asyncio.gather(*(self.lookup(query) for query in queries))
+            finally:
+                self._executor = None
+
+
+def sweep(queries: List[SweepQuery], concurrency: int = 32, per_host: int = 8,
+          base_url: str = BYU_CLASS_SEARCH_URL, cache=None, form=None) -> List[QueryOutcome]:
+    """Run every query concurrently; outcomes come back in query order"""
+    engine = AsyncClassSearch(base_url=base_url, concurrency=concurrency, per_host=per_host, cache=cache,
+                              form=form)
+    return asyncio.run(engine.lookup_all(queries))
+
+
+def run_http_batch_async(queries: List[CourseQuery], concurrency: int = 8, per_host: int = 8,
+                         term: str = DEFAULT_TERM, base_url: str = BYU_CLASS_SEARCH_URL, cache=None,
+                         form=None) -> Tuple[List[Dict[str, str]], List[CourseQuery]]:
+    """Concurrent drop-in for schedule_batch.run_http_batch: (results, queries left for the browser)"""
+    outcomes = sweep([SweepQuery(q.department, q.catalog, term, q.instructor) for q in queries],
+                     concurrency, per_host, base_url, cache, form)
+    results: List[Dict[str, str]] = []
+    pending: List[CourseQuery] = []
+    for query, outcome in zip(queries, outcomes):
+        if outcome.error is not None:
+            log.warning("HTTP lookup failed for %s: %s", query.label, outcome.error)
+            pending.append(query)
+            continue
+        log.info("HTTP lookup for %s: %d results (%.2fs)", query.label, len(outcome.results), outcome.seconds)
+        results.extend(tag_results(outcome.results, query))
+    return results, pending
+
+
+def main():
+    import argparse
+    import json
+    from schedule_batch import load_queries, parse_query
+    from schedule_cache import add_cache_arguments, cache_from_args
+    from schedule_log import add_logging_arguments, logging_from_args
+
+    parser = argparse.ArgumentParser(description="Look up many BYU courses concurrently over HTTP")
+    parser.add_argument('--batch', metavar='FILE', help="file of 'DEPT NUMBER [INSTRUCTOR]' queries, or JSON")
+    parser.add_argument('--query', action='append', default=[], metavar='QUERY')
+    parser.add_argument('--term', action='append', default=[], help="term label, repeatable (default: Winter 2026)")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--per-host', type=int, default=8)
+    parser.add_argument('--base-url', default=BYU_CLASS_SEARCH_URL)
+    parser.add_argument('--out', help="write the combined JSON here as well as to stdout")
+    add_cache_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    logging_from_args(args)
+
+    courses = load_queries(args.batch) if args.batch else []
+    courses.extend(parse_query(query) for query in args.query)
+    terms = args.term or [DEFAULT_TERM]
+    queries = [SweepQuery(c.department, c.catalog, term, c.instructor) for term in terms for c in courses]
+
+    start = time.perf_counter()
+    outcomes = sweep(queries, args.concurrency, args.per_host, args.base_url, cache_from_args(args))
+    wall = time.perf_counter() - start
+
+    results = []
+    for outcome in outcomes:
+        results.extend(tag_results(outcome.results, outcome.query))
+    payload = {
+        "ok": not any(o.error for o in outcomes),
+        "count": len(results),
+        "wall_seconds": round(wall, 3),
+        "sum_of_latencies_seconds": round(sum(o.seconds for o in outcomes), 3),
+        "errors": [{"query": o.query.label, "error": o.error} for o in outcomes if o.error],
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(json.dumps(payload, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Multi-course lookups for the schedule scraper.
+
+A batch is a list of (department, catalog number, optional instructor)
+queries, given on the command line or in a file. All queries share one HTTP
+client (the search form is read once); anything the HTTP path cannot answer
+is handed to a single browser session by the caller.
+"""
+import csv
+import json
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from schedule_http import ClassSearchClient
+
+log = logging.getLogger(__name__)
+
+
+class CourseQuery(NamedTuple):
+    department: str
+    catalog: str
+    instructor: str = ""
+
+    @property
+    def label(self) -> str:
+        course = f"{self.department} {self.catalog}"
+        return f"{course} ({self.instructor})" if self.instructor else course
+
+
+def parse_query(text: str) -> CourseQuery:
+    """
+    Accepts "MATH 451", "MATH 451 Conner", "MATH,451,Conner" or "MATH451".
+    The instructor part is optional and may contain spaces.
+    """
+    text = text.strip()
+    if ',' in text:
+        parts = [part.strip() for part in next(csv.reader([text], skipinitialspace=True))]
+    else:
+        parts = text.split(None, 2)
+        if len(parts) == 1:
+            # "MATH451": split where the catalog number starts
+            word = parts[0]
+            digit = next((i for i, ch in enumerate(word) if ch.isdigit()), len(word))
+            parts = [word[:digit], word[digit:]]
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        raise ValueError(f"expected 'DEPARTMENT CATALOG [INSTRUCTOR]', got {text!r}")
+    instructor = parts[2] if len(parts) > 2 else ""
+    return CourseQuery(parts[0].upper(), parts[1], instructor)
+
+
+def load_queries(path: str) -> List[CourseQuery]:
+    """
+    Read queries from a file: JSON (a list of objects with department/catalog/
+    instructor keys, or of query strings) or one query per line, '#' comments allowed.
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith('.json'):
+        queries = []
+        for item in json.loads(text):
+            if isinstance(item, str):
+                queries.append(parse_query(item))
+            else:
+                queries.append(CourseQuery(str(item["department"]).upper(), str(item["catalog"]),
+                                           item.get("instructor") or ""))
+        return queries
+    return [parse_query(line) for line in text.splitlines()
+            if line.strip() and not line.lstrip().startswith('#')]
+
+
+def filter_by_instructor(results: List[Dict[str, str]], instructor: str) -> List[Dict[str, str]]:
+    if not instructor:
+        return results
+    needle = instructor.lower()
+    return [r for r in results if needle in r.get("instructor", "").lower()]
+
+
+def tag_results(results: List[Dict[str, str]], query: CourseQuery) -> List[Dict[str, str]]:
+    """Record which course each result belongs to so a combined result set stays unambiguous"""
+    for result in results:
+        result["department"] = query.department
+        result["catalog"] = query.catalog
+    return results
+
+
+def run_http_batch(queries: Iterable[CourseQuery], client: ClassSearchClient
+                   ) -> Tuple[List[Dict[str, str]], List[CourseQuery]]:
+    """Answer what the HTTP client can; returns (results, queries left for the browser)"""
+    results: List[Dict[str, str]] = []
+    pending: List[CourseQuery] = []
+    for query in queries:
+        try:
+            found = client.search(query.department, query.catalog)
+        except Exception as e:
+            log.warning("HTTP lookup failed for %s: %s", query.label, e)
+            pending.append(query)
+            continue
+        found = filter_by_instructor(found, query.instructor)
+        log.info("HTTP lookup for %s: %d results", query.label, len(found))
+        results.extend(tag_results(found, query))
+    return results, pending
+
+
+def batch_output(queries: List[CourseQuery], results: List[Dict[str, str]]) -> Dict:
+    return {
+        "ok": bool(results),
+        "count": len(results),
+        "queries": [query._asdict() for query in queries],
+        "results": results,
+    }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for class-search HTTP responses.
+
+Entries are keyed by URL plus form payload and store the body together with
+the ETag / Last-Modified validators. Within the TTL an entry is served
+without touching the network; after that it is revalidated with a
+conditional request, so an unchanged page costs a 304. In offline mode only
+the cache is consulted, which lets CI and benchmark runs work without
+network access.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+from urllib.error import HTTPError
+
+from schedule_http import open_url
+
+DEFAULT_CACHE_DIR = ".schedule_cache"
+DEFAULT_TTL = 600
+
+CACHE_MODES = ("default", "refresh", "offline")
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a request has no cached response"""
+
+
+class CacheEntry:
+    def __init__(self, url: str, data: Optional[Dict[str, str]], body: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, fetched_at: float = 0.0):
+        self.url = url
+        self.data = data
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    directory -- where entries live (one .json metadata file and one .html body each)
+    ttl       -- seconds an entry is served without revalidation
+    mode      -- "default": serve fresh entries, revalidate stale ones;
+                 "refresh": always revalidate;
+                 "offline": never touch the network, raise CacheMiss on a miss
+    """
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL, mode: str = "default"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"cache mode must be one of {', '.join(CACHE_MODES)}")
+        self.directory = directory
+        self.ttl = ttl
+        self.mode = mode
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "offline": 0}
+
+    @staticmethod
+    def key(url: str, data: Optional[Dict[str, str]] = None) -> str:
+        payload = sorted(data.items()) if data else None
+        return hashlib.sha256(json.dumps([url, payload]).encode()).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, "http", key[:2], key)
+        return base + ".json", base + ".html"
+
+    def load(self, url: str, data: Optional[Dict[str, str]] = None) -> Optional[CacheEntry]:
+        meta_path, body_path = self._paths(self.key(url, data))
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, encoding='utf-8') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(url, data, body, meta.get("etag"), meta.get("last_modified"), meta.get("fetched_at", 0.0))
+
+    def store(self, entry: CacheEntry):
+        meta_path, body_path = self._paths(self.key(entry.url, entry.data))
+        meta = {
+            "url": entry.url,
+            "data": entry.data,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+        }
+        # Body first, metadata last: a reader never sees metadata without its body
+        _atomic_write(body_path, entry.body)
+        _atomic_write(meta_path, json.dumps(meta, indent=2))
+
+    def fetch(self, url: str, data: Optional[Dict[str, str]] = None, opener=None, timeout: float = 30) -> str:
+        entry = self.load(url, data)
+        if self.mode == "offline":
+            if entry is None:
+                raise CacheMiss(f"no cached response for {url}")
+            self.stats["offline"] += 1
+            return entry.body
+        if entry is not None and self.mode == "default" and entry.age() < self.ttl:
+            self.stats["fresh"] += 1
+            return entry.body
+
+        headers = entry.validators() if entry is not None else None
+        try:
+            with open_url(url, data, headers, opener, timeout) as resp:
+                body = resp.read().decode('utf-8', errors='ignore')
+                fresh = CacheEntry(url, data, body, resp.headers.get("ETag"),
+                                   resp.headers.get("Last-Modified"), time.time())
+        except HTTPError as e:
+            if e.code != 304 or entry is None:
+                raise
+            # Unchanged: keep the body, restart the TTL clock
+            entry.fetched_at = time.time()
+            self.store(entry)
+            self.stats["revalidated"] += 1
+            return entry.body
+        self.store(fresh)
+        self.stats["fetched"] += 1
+        return fresh.body
+
+    def clear(self):
+        """Delete every cached HTTP response"""
+        root = os.path.join(self.directory, "http")
+        for dirpath, _, filenames in os.walk(root, topdown=False):
+            for name in filenames:
+                os.remove(os.path.join(dirpath, name))
+            os.rmdir(dirpath)
+
+
+def _atomic_write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def add_cache_arguments(parser):
+    """Register the --cache-dir/--cache-ttl/--refresh/--offline/--no-cache options"""
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="HTTP response cache directory")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help="seconds a cached response is used without revalidation")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--refresh', action='store_true', help="revalidate every cached response")
+    group.add_argument('--offline', action='store_true', help="serve only from the cache; never touch the network")
+    group.add_argument('--no-cache', action='store_true', help="bypass the response cache")
+
+
+def cache_from_args(args) -> Optional[ResponseCache]:
+    if args.no_cache:
+        return None
+    mode = "offline" if args.offline else "refresh" if args.refresh else "default"
+    return ResponseCache(args.cache_dir, args.cache_ttl, mode)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Column schema for class-search results tables.
+
+A ColumnMap is built once per table from its header row: each header cell
+is matched against known names for the result columns (section, type, mode,
+instructor, credits, term, days, start/end time, location, available,
+waitlist), and rows are then projected onto the result record with a single
+itemgetter call. Reordered or extra columns therefore keep working; a header
+that cannot be recognised falls back to the classic 12-position layout.
+"""
+import re
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence
+
+# Column order of the classic results grid:
+# Section | Type | Mode | Instructor | Credits | Term | Days | Start | End | Location | Available | Waitlist
+RESULT_COLUMNS = (
+    "section", "type", "mode", "instructor", "credits", "term",
+    "days", "start_time", "end_time", "location", "available", "waitlist",
+)
+
+# Header spellings per column. "time" is a combined "start - end" column some layouts use.
+COLUMN_ALIASES = {
+    "section": ("section", "sec", "section number", "sect"),
+    "type": ("type", "section type", "class type"),
+    "mode": ("mode", "instruction mode", "delivery", "format"),
+    "instructor": ("instructor", "instructors", "professor", "teacher", "faculty"),
+    "credits": ("credits", "credit", "credit hours", "cr hrs", "hours"),
+    "term": ("term", "semester"),
+    "days": ("days", "day", "meeting days"),
+    "start_time": ("start", "start time", "begins", "from"),
+    "end_time": ("end", "end time", "ends", "to"),
+    "location": ("location", "room", "building", "bldg room", "where"),
+    "available": ("available", "seats", "seats available", "open seats", "avail"),
+    "waitlist": ("waitlist", "wait list", "waitlisted", "wait", "waitlist seats", "wait list seats"),
+    "time": ("time", "times", "meeting time"),
+}
+
+# A header must name at least this many columns to be trusted over the fixed layout
+MIN_RECOGNIZED = 4
+
+_EXACT = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+def normalize_header(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def _only(columns: set) -> Optional[str]:
+    return next(iter(columns)) if len(columns) == 1 else None
+
+
+def header_column(text: str) -> Optional[str]:
+    """
+    The result column a header cell names, or None. The whole header is
+    tried first, then the multi-word aliases it contains, then its single
+    words; at each step a header naming more than one column (say
+    "Seats / Wait": available and waitlist) is ambiguous and yields None.
+    """
+    name = normalize_header(text)
+    if name in _EXACT:
+        return _EXACT[name]
+    padded = f" {name} "
+    phrases = {column for alias, column in _EXACT.items() if ' ' in alias and f" {alias} " in padded}
+    if phrases:
+        return _only(phrases)
+    words = set(name.split())
+    return _only({column for alias, column in _EXACT.items() if ' ' not in alias and alias in words})
+
+
+class ColumnMap:
+    """Column name -> cell index for one table, applied to each row with project()"""
+    def __init__(self, index: Dict[str, int]):
+        self.index = index
+        self.width = max(index.values()) + 1
+        self._present = [column for column in RESULT_COLUMNS + ("time",) if column in index]
+        positions = [index[column] for column in self._present]
+        getter = itemgetter(*positions)
+        self._get = getter if len(positions) > 1 else (lambda row: (getter(row),))
+        self._combined_time = "time" in index and not ("start_time" in index and "end_time" in index)
+        # Output keys in the scraper's record order, blank until filled
+        self._template = {}
+        for column in RESULT_COLUMNS:
+            self._template[column] = ""
+            if column == "end_time":
+                self._template["time"] = ""
+
+    @classmethod
+    def from_header(cls, cells: Sequence[str]) -> Optional["ColumnMap"]:
+        index: Dict[str, int] = {}
+        for position, text in enumerate(cells):
+            column = header_column(text)
+            if column is not None and column not in index:
+                index[column] = position
+        if len(index) < MIN_RECOGNIZED:
+            return None
+        return cls(index)
+
+    def fits(self, row: Sequence[str]) -> bool:
+        """True when the row reaches every mapped column"""
+        return len(row) >= self.width
+
+    def project(self, row: Sequence[str]) -> Dict[str, str]:
+        if len(row) < self.width:
+            row = list(row) + [""] * (self.width - len(row))
+        record = dict(self._template)
+        record.update(zip(self._present, self._get(row)))
+        if self._combined_time:
+            start, _, end = record["time"].partition("-")
+            record["start_time"] = record["start_time"] or start.strip()
+            record["end_time"] = record["end_time"] or end.strip()
+        else:
+            record["time"] = f"{record['start_time']} - {record['end_time']}"
+        return record
+
+    def __repr__(self):
+        return f"ColumnMap({self.index})"
+
+
+POSITIONAL = ColumnMap({column: position for position, column in enumerate(RESULT_COLUMNS)})
+
+
+def column_map(header: Optional[Sequence[str]]) -> ColumnMap:
+    """The map for a table with this header row, or the fixed 12-column layout"""
+    return (ColumnMap.from_header(header) if header else None) or POSITIONAL
+
+
+def project_rows(header: Optional[Sequence[str]], rows: List[Sequence[str]]) -> List[Dict[str, str]]:
+    columns = column_map(header)
+    return [columns.project(row) for row in rows]
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Room and instructor double-booking detection across a term.
+
+Each result record's meeting (days, start_time, end_time) is laid out on a
+one-week timeline in minutes: one interval per meeting day, at
+day * 1440 + minutes after midnight, using schedule_patterns.day_mask and
+clock_minutes. Intervals are grouped per (term, room) and per (term,
+instructor), and each group is swept in start order with a heap of the
+meetings still in progress, so every overlap is found in
+O(n log n + conflicts) rather than by comparing every pair of sections.
+
+    python schedule_conflicts.py term_snapshot.json
+    python schedule_conflicts.py --db schedule.db --kind room
+
+Records without a parseable time, a real room (e.g. TBA) or an instructor
+are skipped for that kind of check.
+"""
+import heapq
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from schedule_patterns import clock_minutes, day_mask, split_room
+
+MINUTES_PER_DAY = 24 * 60
+DAY_NAMES = ("M", "T", "W", "Th", "F", "Sa", "Su")
+KINDS = ("room", "instructor")
+
+# Locations that are not a bookable room
+NOT_A_ROOM = {"", "TBA", "ARR", "ONLINE", "WEB"}
+# Instructor cells that do not name one person
+NOT_AN_INSTRUCTOR = {"", "STAFF", "TBA"}
+_INSTRUCTOR_SPLIT_RE = re.compile(r"\s*(?:&|;|\n)\s*")
+
+
+class Meeting(NamedTuple):
+    """One record's weekly meeting pattern"""
+    index: int
+    days: int
+    start: int
+    end: int
+
+
+class Conflict(NamedTuple):
+    kind: str
+    resource: str
+    term: str
+    first: Dict[str, str]
+    second: Dict[str, str]
+    days: int
+    start: int
+    end: int
+
+    def describe(self) -> str:
+        return (f"{self.kind} {self.resource}: {section_label(self.first)} and {section_label(self.second)} "
+                f"overlap {days_text(self.days)} {clock_text(self.start)}-{clock_text(self.end)}")
+
+    def to_record(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "resource": self.resource,
+            "term": self.term,
+            "days": days_text(self.days),
+            "start": clock_text(self.start),
+            "end": clock_text(self.end),
+            "sections": [self.first, self.second],
+        }
+
+
+def days_text(mask: int) -> str:
+    return "".join(name for bit, name in enumerate(DAY_NAMES) if mask & (1 << bit))
+
+
+def clock_text(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def section_label(record: Dict[str, str]) -> str:
+    course = " ".join(part for part in (record.get("department"), record.get("catalog")) if part)
+    section = record.get("section", "")
+    return f"{course} {section}" if course and not section.startswith(course) else section or course
+
+
+def meeting_of(index: int, record: Dict[str, str]) -> Optional[Meeting]:
+    """The record's meeting, or None when its days or times cannot be read"""
+    start_time, end_time = record.get("start_time", ""), record.get("end_time", "")
+    if not start_time and record.get("time"):
+        start_time, _, end_time = record["time"].partition("-")
+    days, start, end = day_mask(record.get("days", "")), clock_minutes(start_time), clock_minutes(end_time)
+    if not days or start is None or end is None or end <= start:
+        return None
+    return Meeting(index, days, start, end)
+
+
+def room_keys(record: Dict[str, str]) -> List[str]:
+    building, room = split_room(record.get("location", ""))
+    if building.upper() in NOT_A_ROOM or not room:
+        return []
+    return [f"{building.upper()} {room.upper()}"]
+
+
+def instructor_keys(record: Dict[str, str]) -> List[str]:
+    names = _INSTRUCTOR_SPLIT_RE.split(record.get("instructor", "").strip())
+    return [" ".join(name.split()) for name in names if name.strip().upper() not in NOT_AN_INSTRUCTOR]
+
+
+RESOURCE_KEYS = {"room": room_keys, "instructor": instructor_keys}
+
+
+def same_section(a: Dict[str, str], b: Dict[str, str]) -> bool:
+    """Two records of one section (e.g. found by two extraction passes)"""
+    if a.get("department") or a.get("catalog"):
+        return all(a.get(key, "") == b.get(key, "") for key in ("term", "department", "catalog", "section"))
+    # Untagged records only say "001"; only an identical record is the same section
+    return a == b
+
+
+def sweep(meetings: List[Meeting]) -> Dict[Tuple[int, int], List[int]]:
+    """
+    Overlapping meeting pairs within one group: (index, index) -> [days, start, end]
+    of the overlap, merged over all shared days.
+    """
+    intervals = []
+    for meeting in meetings:
+        for day in range(len(DAY_NAMES)):
+            if meeting.days & (1 << day):
+                offset = day * MINUTES_PER_DAY
+                intervals.append((offset + meeting.start, offset + meeting.end, day, meeting.index))
+    intervals.sort()
+    overlaps: Dict[Tuple[int, int], List[int]] = {}
+    active: List[Tuple[int, int, int]] = []  # (end, start, index) of meetings still in progress
+    for start, end, day, index in intervals:
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, other_start, other in active:
+            if other == index:
+                continue
+            pair = (min(index, other), max(index, other))
+            begin = start % MINUTES_PER_DAY
+            finish = min(end, other_end) - day * MINUTES_PER_DAY
+            overlap = overlaps.setdefault(pair, [0, begin, finish])
+            overlap[0] |= 1 << day
+            overlap[1] = min(overlap[1], begin)
+            overlap[2] = max(overlap[2], finish)
+        heapq.heappush(active, (end, start, index))
+    return overlaps
+
+
+def find_conflicts(records: Iterable[Dict[str, str]], kinds: Iterable[str] = KINDS,
+                   term: str = "") -> List[Conflict]:
+    """
+    Every pair of sections that share a room or an instructor at overlapping
+    times, per term. `term` fills in for records that do not carry one; the
+    same section listed twice is not a conflict with itself.
+    """
+    records = list(records)
+    meetings = {}
+    for index, record in enumerate(records):
+        meeting = meeting_of(index, record)
+        if meeting is not None:
+            meetings[index] = meeting
+    conflicts: List[Conflict] = []
+    for kind in kinds:
+        keys_of = RESOURCE_KEYS[kind]
+        groups: Dict[Tuple[str, str], List[Meeting]] = {}
+        for index, meeting in meetings.items():
+            record_term = records[index].get("term") or term
+            for key in keys_of(records[index]):
+                groups.setdefault((record_term, key), []).append(meeting)
+        for (group_term, resource), group in sorted(groups.items()):
+            if len(group) < 2:
+                continue
+            for (first, second), (days, start, end) in sorted(sweep(group).items()):
+                if same_section(records[first], records[second]):
+                    continue
+                conflicts.append(Conflict(kind, resource, group_term, records[first], records[second],
+                                          days, start, end))
+    return conflicts
+
+
+def pairwise_conflicts(records: List[Dict[str, str]], kinds: Iterable[str] = KINDS, term: str = "") -> set:
+    """The O(n^2) reference check, for verifying find_conflicts(); returns (kind, resource, i, j) tuples"""
+    found = set()
+    meetings = [meeting_of(index, record) for index, record in enumerate(records)]
+    for kind in kinds:
+        keys_of = RESOURCE_KEYS[kind]
+        for i, a in enumerate(meetings):
+            for j in range(i + 1, len(meetings)):
+                b = meetings[j]
+                if a is None or b is None or not a.days & b.days or a.end <= b.start or b.end <= a.start:
+                    continue
+                if (records[i].get("term") or term) != (records[j].get("term") or term):
+                    continue
+                if same_section(records[i], records[j]):
+                    continue
+                for key in set(keys_of(records[i])) & set(keys_of(records[j])):
+                    found.add((kind, key, i, j))
+    return found
+
+
+def synthetic_term(count: int, seed: int = 0, term: str = "Winter 2026") -> List[Dict[str, str]]:
+    """
+    A term's worth of plausible sections for benchmarking: every section gets
+    a random slot, room and instructor, so a realistic handful collide.
+    """
+    import random
+    rng = random.Random(seed)
+    slots = [("MWF", f"{hour}:00 {'AM' if hour < 12 else 'PM'}", f"{hour}:50 {'AM' if hour < 12 else 'PM'}")
+             for hour in range(8, 17)]
+    slots += [("TTh", start, end) for start, end in (("8:00 AM", "9:15 AM"), ("9:30 AM", "10:45 AM"),
+                                                       ("11:00 AM", "12:15 PM"), ("12:30 PM", "1:45 PM"),
+                                                       ("2:00 PM", "3:15 PM"), ("3:30 PM", "4:45 PM"))]
+    buildings = ("TMCB", "JFSB", "JKB", "MARB", "ESC", "CB", "EB", "HBLL", "SWKT", "KMBL")
+    rooms_per_building = max(10, count // (len(buildings) * len(slots)) + 5)
+    records = []
+    for i in range(count):
+        days, start, end = rng.choice(slots)
+        records.append({
+            "section": f"{i % 20 + 1:03d}", "type": "DAY", "mode": "Classroom",
+            "instructor": f"Instructor{rng.randrange(max(1, count // 3))}, Pat", "credits": "3.00",
+            "term": term, "days": days, "start_time": start, "end_time": end,
+            "time": f"{start} - {end}",
+            "location": f"{rng.choice(buildings)} {100 + rng.randrange(rooms_per_building)}",
+            "available": "10/30", "waitlist": "0", "department": "X", "catalog": str(100 + i // 20),
+        })
+    return records
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Find double-booked rooms and instructors in scraped sections")
+    parser.add_argument('files', nargs='*', help="scraper output files ({\"results\": [...]}) or record lists")
+    parser.add_argument('--db', help="read every section from a schedule_store database instead")
+    parser.add_argument('--term', default='', help="term for records that do not name one")
+    parser.add_argument('--kind', choices=KINDS, action='append', help="check only rooms or only instructors")
+    parser.add_argument('--json', action='store_true', help="print conflicts as JSON")
+    parser.add_argument('--verify', action='store_true', help="also run the pairwise check and compare")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="benchmark on N generated sections instead")
+    args = parser.parse_args()
+    if not args.files and not args.db and not args.synthetic:
+        parser.error("give result files, --db or --synthetic")
+
+    records: List[Dict[str, str]] = []
+    if args.db:
+        from schedule_store import SectionStore
+        with SectionStore(args.db) as store:
+            records.extend(store.find(term=args.term or None))
+    if args.files:
+        from schedule_store import load_results
+        for path in args.files:
+            records.extend(load_results(path))
+    if args.synthetic:
+        records.extend(synthetic_term(args.synthetic))
+    kinds = args.kind or KINDS
+
+    start = time.perf_counter()
+    conflicts = find_conflicts(records, kinds, args.term)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps([conflict.to_record() for conflict in conflicts], indent=2))
+    else:
+        for conflict in conflicts:
+            print(conflict.describe())
+        print(f"{len(conflicts)} conflicts among {len(records):,} sections in {elapsed * 1000:.1f} ms")
+    if args.verify:
+        start = time.perf_counter()
+        expected = pairwise_conflicts(records, kinds, args.term)
+        slow = time.perf_counter() - start
+        index = {id(record): i for i, record in enumerate(records)}
+        got = {(c.kind, c.resource, index[id(c.first)], index[id(c.second)]) for c in conflicts}
+        print(f"pairwise check: {len(expected)} conflicts in {slow * 1000:.1f} ms, "
+              f"{'same' if got == expected else 'DIFFERENT'}")
+
+
+if __name__ == '__main__':
+    main()
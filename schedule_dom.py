@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Single round-trip DOM extraction for the Selenium scraper.
+
+Every <table> on the page is serialized to JSON inside the browser with one
+execute_script call; header detection and column mapping then run in plain
+Python on that snapshot, so extraction costs O(1) WebDriver round-trips no
+matter how many rows the results table has.
+"""
+import logging
+from html.parser import HTMLParser
+from typing import Dict, List
+
+from schedule_columns import column_map
+from schedule_patterns import match_row
+
+log = logging.getLogger(__name__)
+
+# Mirrors what the per-element loop saw: every <tr> under each table (nested
+# ones included), with the text of its <th> and <td> descendants.
+SNAPSHOT_TABLES_JS = """
+return Array.prototype.map.call(document.querySelectorAll('table'), function (table) {
+    return Array.prototype.map.call(table.querySelectorAll('tr'), function (tr) {
+        var text = function (cell) { return (cell.innerText || cell.textContent || '').trim(); };
+        return {
+            th: Array.prototype.map.call(tr.querySelectorAll('th'), text),
+            td: Array.prototype.map.call(tr.querySelectorAll('td'), text)
+        };
+    });
+});
+"""
+
+SCHEDULE_HEADER_KEYWORDS = ('section', 'instructor', 'days', 'time', 'location')
+
+
+def snapshot_tables(driver) -> List[List[Dict[str, List[str]]]]:
+    """All tables on the current page as [[{'th': [...], 'td': [...]}, ...], ...] in one RPC"""
+    return driver.execute_script(SNAPSHOT_TABLES_JS) or []
+
+
+class TableSnapshotParser(HTMLParser):
+    """
+    Pure-Python equivalent of SNAPSHOT_TABLES_JS for recorded page_source:
+    tables in document order, each with every <tr> below it and each row with
+    the whitespace-collapsed text of every <th>/<td> below it.
+    """
+    def __init__(self):
+        super().__init__()
+        self.tables: List[List[Dict[str, List[str]]]] = []
+        self.open_tables: List[List[Dict[str, List[str]]]] = []
+        self.open_rows: List[Dict[str, List[str]]] = []
+        self.open_cells: List[List] = []  # [tag, text parts]
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            table: List[Dict[str, List[str]]] = []
+            self.tables.append(table)
+            self.open_tables.append(table)
+        elif tag == 'tr' and self.open_tables:
+            row: Dict[str, List[str]] = {'th': [], 'td': []}
+            for table in self.open_tables:
+                table.append(row)
+            self.open_rows.append(row)
+        elif tag in ('td', 'th') and self.open_rows:
+            self.open_cells.append([tag, []])
+
+    def handle_endtag(self, tag):
+        if tag == 'table' and self.open_tables:
+            self.open_tables.pop()
+        elif tag == 'tr' and self.open_rows:
+            self.open_rows.pop()
+        elif tag in ('td', 'th') and self.open_cells:
+            cell_tag, parts = self.open_cells.pop()
+            text = ' '.join(''.join(parts).split())
+            for row in self.open_rows:
+                row[cell_tag].append(text)
+
+    def handle_data(self, data):
+        for cell in self.open_cells:
+            cell[1].append(data)
+
+
+def snapshot_tables_from_html(html: str) -> List[List[Dict[str, List[str]]]]:
+    """Same structure as snapshot_tables(), computed from saved HTML without a browser"""
+    parser = TableSnapshotParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tables
+
+
+def header_cells(row: Dict[str, List[str]]) -> List[str]:
+    return row.get('th') or row.get('td') or []
+
+
+def is_schedule_header(cells: List[str]) -> bool:
+    header_text = ' '.join(cell.lower() for cell in cells)
+    return any(keyword in header_text for keyword in SCHEDULE_HEADER_KEYWORDS)
+
+
+def pattern_match_row(row_text: str, source: str, course: str = "MATH 451",
+                      instructor: str = "Conner") -> Dict[str, str]:
+    """Best-effort record for a row that only matched by text"""
+    found = match_row(row_text, course)
+    return {
+        "section": course,
+        "instructor": instructor,
+        "days": found["days"],
+        "time": found["time"],
+        "location": found["location"],
+        "extracted_from": source
+    }
+
+
+def extract_schedule_tables(tables: List[List[Dict[str, List[str]]]], department: str = "MATH",
+                            catalog: str = "451", instructor_hint: str = "Conner") -> List[Dict[str, str]]:
+    """
+    Run the scraper's table heuristics over a snapshot: large tables with a
+    schedule-looking header are read as results rows (columns mapped from
+    that header, or the classic 12-column layout), tiny tables
+    are scanned for a row naming the course and `instructor_hint`.
+    """
+    course = f"{department} {catalog}"
+    results = []
+    for table_idx, rows in enumerate(tables):
+        log.debug("Examining Table %d: %d rows", table_idx, len(rows))
+
+        if len(rows) > 2:
+            headers = header_cells(rows[0])
+            if not headers:
+                continue
+            log.debug("  Headers: %s", headers)
+            if not is_schedule_header(headers):
+                continue
+            log.debug("  This looks like a schedule table!")
+            columns = column_map(headers)
+
+            for row_idx in range(1, len(rows)):
+                cells = rows[row_idx].get('td') or []
+                if len(cells) <= 5:
+                    continue
+                row_text = " ".join(cells)
+                if catalog not in row_text or department not in row_text:
+                    continue
+                log.debug("    Found %s row %d: %s", course, row_idx, row_text)
+                if columns.fits(cells):
+                    results.append(columns.project(cells))
+                    log.debug("      Added %s section to results", course)
+        else:
+            for row in rows:
+                cells = row.get('td') or []
+                row_text = " ".join(cells)
+                if catalog in row_text and department in row_text and instructor_hint in row_text:
+                    results.append(pattern_match_row(row_text, "small_table_pattern_matching",
+                                                     course, instructor_hint))
+                    log.debug("      Added %s's section from small table", instructor_hint)
+    return results
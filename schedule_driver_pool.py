@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Pool of warm headless Chrome sessions shared by scrape calls in one process.
+
+Browser startup dominates short lookups, so drivers are started once and
+handed out with acquire()/release() (or the borrow() context manager).
+A driver is health-checked before it is handed out and is recycled after
+serving `max_pages` lookups or when its process tree grows past
+`max_memory_mb`.
+
+The chromedriver binary is resolved without network access: $CHROMEDRIVER,
+else the binary pinned in <cache dir>/chromedriver.json, else one on PATH.
+webdriver_manager (which checks for a newer driver on every call) is only
+asked when none of those exists, or when Chrome rejects the pinned driver,
+and its download is pinned for later runs.
+
+    python schedule_driver_pool.py --pin /usr/local/bin/chromedriver
+    python schedule_driver_pool.py --refresh
+"""
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from schedule_cache import DEFAULT_CACHE_DIR
+from schedule_page_profile import apply_options, get_page_profile, install
+
+try:
+    import psutil
+except ImportError:  # memory recycling falls back to the JS heap size
+    psutil = None
+
+CHROME_ARGUMENTS = (
+    "--headless=new",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--window-size=1920,1080",
+)
+
+CHROMEDRIVER_PIN = "chromedriver.json"
+
+_chromedriver_path: Optional[str] = None
+
+
+def pinned_chromedriver(directory: str = DEFAULT_CACHE_DIR) -> Optional[str]:
+    """The chromedriver recorded in <directory>/chromedriver.json, if it still exists"""
+    try:
+        with open(os.path.join(directory, CHROMEDRIVER_PIN), encoding='utf-8') as f:
+            path = json.load(f).get("path")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return path if path and os.access(path, os.X_OK) else None
+
+
+def pin_chromedriver(path: str, directory: str = DEFAULT_CACHE_DIR) -> str:
+    """Record `path` as the chromedriver to use from now on"""
+    path = os.path.abspath(path)
+    if not os.access(path, os.X_OK):
+        raise FileNotFoundError(f"not an executable chromedriver: {path}")
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({"path": path, "pinned_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, CHROMEDRIVER_PIN))
+    return path
+
+
+def download_chromedriver(directory: str = DEFAULT_CACHE_DIR) -> str:
+    """Fetch the chromedriver matching the installed Chrome through webdriver_manager and pin it"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return pin_chromedriver(ChromeDriverManager().install(), directory)
+
+
+def chromedriver_path(directory: str = DEFAULT_CACHE_DIR) -> str:
+    """Resolve the chromedriver binary once per process, from local files when possible"""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        _chromedriver_path = (os.environ.get("CHROMEDRIVER") or pinned_chromedriver(directory)
+                              or shutil.which("chromedriver") or download_chromedriver(directory))
+    return _chromedriver_path
+
+
+def create_driver(profile=None, performance_log: bool = False):
+    """
+    Start a headless Chrome session with the scraper's standard options and
+    `profile` (default: schedule_page_profile.get_page_profile()) applied.
+    With `performance_log` the DevTools network events can be read back
+    with driver.get_log("performance").
+    """
+    global _chromedriver_path
+    profile = profile if profile is not None else get_page_profile()
+    options = Options()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    apply_options(options, profile)
+    if performance_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    try:
+        driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+    except SessionNotCreatedException:
+        if os.environ.get("CHROMEDRIVER"):
+            raise
+        # Chrome has moved past the pinned driver: fetch a matching one, once
+        _chromedriver_path = download_chromedriver()
+        driver = webdriver.Chrome(service=Service(_chromedriver_path), options=options)
+    try:
+        install(driver, profile)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def driver_memory_mb(driver) -> float:
+    """Resident memory of chromedriver plus its Chrome children, or the page JS heap without psutil"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except (AttributeError, psutil.Error):
+            pass
+    used = driver.execute_script(
+        "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0")
+    return (used or 0) / (1024 * 1024)
+
+
+class PooledDriver:
+    """Bookkeeping for one pooled browser session"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.started_at = time.monotonic()
+
+
+class DriverPool:
+    """
+    Fixed-size pool of WebDriver sessions.
+
+    size           -- maximum number of live browsers
+    max_pages      -- lookups a browser serves before it is recycled
+    max_memory_mb  -- recycle a browser once its memory exceeds this (None disables)
+    factory        -- callable that starts a new driver
+    """
+    def __init__(self, size: int = 2, max_pages: int = 50, max_memory_mb: Optional[float] = 1024,
+                 factory: Callable = create_driver):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory
+        self._idle: List[PooledDriver] = []
+        self._busy: Dict[int, PooledDriver] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"started": 0, "recycled": 0, "unhealthy": 0, "borrowed": 0}
+
+    def warm(self, count: Optional[int] = None):
+        """Start browsers ahead of time so the first lookups do not pay startup"""
+        started = []
+        for _ in range(min(count or self.size, self.size)):
+            slot = self._start_slot()
+            if slot is None:
+                break
+            started.append(slot)
+        with self._cond:
+            self._idle.extend(started)
+            self._cond.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a healthy driver, starting one if the pool is not yet full"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            slot = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("driver pool is closed")
+                while not self._idle and self._live >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("no driver available in the pool")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # LIFO: the most recently used browser has the warmest caches
+                    slot = self._idle.pop()
+                else:
+                    self._live += 1
+
+            if slot is None:
+                try:
+                    slot = PooledDriver(self.factory())
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+                self._count("started")
+            elif not self.is_healthy(slot):
+                self._count("unhealthy")
+                self._discard(slot)
+                continue
+
+            slot.pages += 1
+            self._count("borrowed")
+            with self._cond:
+                self._busy[id(slot.driver)] = slot
+            return slot.driver
+
+    def release(self, driver):
+        """Return a borrowed driver; it is recycled if worn out or unhealthy"""
+        with self._cond:
+            slot = self._busy.pop(id(driver), None)
+        if slot is None:
+            return
+        if self._closed or self.needs_recycle(slot) or not self.is_healthy(slot):
+            self._count("recycled")
+            self._discard(slot)
+            return
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify()
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def is_healthy(self, slot: PooledDriver) -> bool:
+        try:
+            return slot.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def needs_recycle(self, slot: PooledDriver) -> bool:
+        if self.max_pages and slot.pages >= self.max_pages:
+            return True
+        if self.max_memory_mb is not None:
+            try:
+                return driver_memory_mb(slot.driver) > self.max_memory_mb
+            except Exception:
+                return True
+        return False
+
+    def close(self):
+        """Quit every idle browser; busy ones are quit when they are released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for slot in idle:
+            self._discard(slot)
+
+    def _count(self, key: str):
+        with self._cond:
+            self.stats[key] += 1
+
+    def _start_slot(self) -> Optional[PooledDriver]:
+        with self._cond:
+            if self._live >= self.size:
+                return None
+            self._live += 1
+        try:
+            slot = PooledDriver(self.factory())
+        except Exception:
+            with self._cond:
+                self._live -= 1
+            raise
+        self._count("started")
+        return slot
+
+    def _discard(self, slot: PooledDriver):
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+
+_default_pool: Optional[DriverPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool(size: int = 1, max_pages: int = 50, max_memory_mb: Optional[float] = 1024) -> DriverPool:
+    """Process-wide pool used by fetch_schedule(); browsers are quit at interpreter exit"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool(size=size, max_pages=max_pages, max_memory_mb=max_memory_mb)
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Show or change the pinned chromedriver binary")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--pin', metavar='PATH', help="use this chromedriver from now on")
+    group.add_argument('--refresh', action='store_true', help="download the driver matching Chrome and pin it")
+    args = parser.parse_args()
+
+    if args.pin:
+        print(pin_chromedriver(args.pin, args.cache_dir))
+    elif args.refresh:
+        print(download_chromedriver(args.cache_dir))
+    else:
+        print(chromedriver_path(args.cache_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Capture the request behind the class-search results from Chrome's network log.
+
+A browser lookup with performance logging on records every request the page
+makes. capture_template() picks the one that carried the department and
+catalog number (the form POST, or an XHR/fetch if the page loads results by
+script) and turns it into a RequestTemplate: URL, method, encoding, the
+fixed fields, and which fields take the term, department and catalog. The
+template is saved as JSON and becomes a SearchForm for ClassSearchClient, so
+later lookups go straight to that endpoint without reading the landing page
+or starting a browser:
+
+    python byu_class_schedule_scraper_v0.8.0.py --discover-endpoint search_endpoint.json
+    python byu_class_schedule_scraper_v0.8.0.py --endpoint search_endpoint.json --course "CS 235"
+    python schedule_endpoint.py search_endpoint.json --department CS --course 235
+
+Only form-encoded and query-string requests can be replayed by the HTTP
+client; a JSON-bodied endpoint is recorded but form() refuses it.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from schedule_http import DEFAULT_TERM, SearchForm, is_term_field, parse_search_form, term_code
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE_PATH = "search_endpoint.json"
+# Resource types that can carry a search: a form submission, or a script request
+SEARCH_TYPES = ("Document", "XHR", "Fetch")
+ENCODINGS = ("query", "form", "json")
+
+
+class RequestTemplate:
+    """
+    url            -- endpoint, without the query string for GET requests
+    method         -- GET or POST
+    encoding       -- "query" (GET parameters), "form" (urlencoded body) or "json"
+    fields         -- every field the request sent; the term, department and catalog ones are placeholders
+    term_field, dept_field, catalog_field -- names of the fields that vary per lookup
+    term_options   -- (value, label) pairs of the page's term selector
+    response_type  -- MIME type the endpoint answered with
+    """
+    def __init__(self, url: str, method: str = "GET", encoding: str = "query",
+                 fields: Optional[Dict[str, str]] = None, term_field: Optional[str] = None,
+                 dept_field: Optional[str] = None, catalog_field: Optional[str] = None,
+                 term_options: Sequence[Tuple[str, str]] = (), response_type: str = "",
+                 captured_at: Optional[str] = None):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"unknown request encoding {encoding!r}")
+        self.url = url
+        self.method = method.upper()
+        self.encoding = encoding
+        self.fields = dict(fields or {})
+        self.term_field = term_field
+        self.dept_field = dept_field
+        self.catalog_field = catalog_field
+        self.term_options = [tuple(option) for option in term_options]
+        self.response_type = response_type
+        self.captured_at = captured_at or time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def form(self) -> SearchForm:
+        """The template as the SearchForm ClassSearchClient submits"""
+        if self.encoding == "json":
+            raise ValueError(f"{self.url} takes a JSON body, which the HTTP client cannot send")
+        if not (self.dept_field and self.catalog_field):
+            raise ValueError(f"template for {self.url} does not say where the department and catalog go")
+        form = SearchForm(self.url, 'post' if self.method == 'POST' else 'get')
+        form.fields = dict(self.fields)
+        form.term_field = self.term_field
+        form.term_options = list(self.term_options)
+        form.dept_field = self.dept_field
+        form.catalog_field = self.catalog_field
+        return form
+
+    def to_dict(self) -> Dict:
+        return {
+            "url": self.url,
+            "method": self.method,
+            "encoding": self.encoding,
+            "fields": self.fields,
+            "term_field": self.term_field,
+            "dept_field": self.dept_field,
+            "catalog_field": self.catalog_field,
+            "term_options": self.term_options,
+            "response_type": self.response_type,
+            "captured_at": self.captured_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RequestTemplate":
+        return cls(**data)
+
+    def save(self, path: str = DEFAULT_TEMPLATE_PATH):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TEMPLATE_PATH) -> "RequestTemplate":
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self):
+        return f"RequestTemplate({self.method} {self.url}, {self.encoding}, fields={sorted(self.fields)})"
+
+
+def network_requests(entries: Iterable[Dict]) -> List[Dict]:
+    """
+    Requests in a Chrome performance log, in the order they were sent:
+    {id, url, method, type, post_data, headers, status, mime_type}
+    """
+    requests: Dict[str, Dict] = {}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            request = params["request"]
+            # A redirect reuses the request id; the latest hop is what gets answered
+            requests[params["requestId"]] = {
+                "id": params["requestId"], "url": request["url"], "method": request.get("method", "GET"),
+                "type": params.get("type", "Other"), "post_data": request.get("postData"),
+                "headers": request.get("headers", {}), "status": None, "mime_type": "",
+            }
+        elif method == "Network.responseReceived" and params.get("requestId") in requests:
+            response = params.get("response", {})
+            requests[params["requestId"]].update(status=response.get("status"),
+                                                 mime_type=response.get("mimeType", ""))
+    return list(requests.values())
+
+
+def header(headers: Dict[str, str], name: str) -> str:
+    return next((value for key, value in headers.items() if key.lower() == name.lower()), "")
+
+
+def request_fields(request: Dict) -> Tuple[str, str, Dict[str, str]]:
+    """(url, encoding, fields) of a captured request"""
+    if request["method"].upper() != "POST":
+        parts = urlsplit(request["url"])
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+        return url, "query", dict(parse_qsl(parts.query, keep_blank_values=True))
+    body = request.get("post_data") or ""
+    if "json" in header(request["headers"], "Content-Type").lower():
+        data = json.loads(body) if body else {}
+        if not isinstance(data, dict):
+            raise ValueError(f"JSON body of {request['url']} is not an object")
+        return request["url"], "json", {key: "" if value is None else str(value) for key, value in data.items()}
+    return request["url"], "form", dict(parse_qsl(body, keep_blank_values=True))
+
+
+def find_search_request(requests: List[Dict], department: str, catalog: str) -> Optional[Dict]:
+    """The last successful document/XHR/fetch request that sent both the department and the catalog number"""
+    for request in reversed(requests):
+        if request["type"] not in SEARCH_TYPES or (request["status"] or 200) >= 400:
+            continue
+        try:
+            _, _, fields = request_fields(request)
+        except ValueError:
+            continue
+        values = {value.strip().upper() for value in fields.values()}
+        if department.upper() in values and catalog.upper() in values:
+            return request
+    return None
+
+
+def template_from_request(request: Dict, department: str, catalog: str, term: str = DEFAULT_TERM,
+                          term_options: Sequence[Tuple[str, str]] = ()) -> RequestTemplate:
+    url, encoding, fields = request_fields(request)
+    term_values = {value for value, label in term_options if term.lower() in label.lower()} | {term_code(term)}
+    dept_field = catalog_field = term_field = None
+    for name, value in fields.items():
+        value = value.strip()
+        if dept_field is None and value.upper() == department.upper():
+            dept_field = name
+        elif catalog_field is None and value.upper() == catalog.upper():
+            catalog_field = name
+        elif term_field is None and (value in term_values or is_term_field({"name": name})):
+            term_field = name
+    for name in (dept_field, catalog_field, term_field):
+        if name is not None:
+            fields[name] = ""
+    return RequestTemplate(url, request["method"], encoding, fields, term_field, dept_field, catalog_field,
+                           term_options, request.get("mime_type", ""))
+
+
+def capture_template(driver, department: str, catalog: str, base_url: str,
+                     term: str = DEFAULT_TERM) -> Optional[RequestTemplate]:
+    """
+    The search request from a driver started with performance logging
+    (schedule_driver_pool.create_driver(performance_log=True)) that has just
+    looked up `department` `catalog`; None if no request carried them.
+    """
+    requests = network_requests(driver.get_log("performance"))
+    request = find_search_request(requests, department, catalog)
+    if request is None:
+        log.debug("None of %d captured requests carried %s %s", len(requests), department, catalog)
+        return None
+    # The results page still holds the form, and with it the term options
+    form = parse_search_form(driver.page_source, base_url)
+    template = template_from_request(request, department, catalog, term, form.term_options if form else ())
+    log.info("Search endpoint: %s %s (%s, %s)", template.method, template.url, template.encoding,
+             template.response_type or "unknown response type")
+    return template
+
+
+def logging_pool():
+    """A one-browser DriverPool whose sessions keep a performance (network) log"""
+    from functools import partial
+    from schedule_driver_pool import DriverPool, create_driver
+    return DriverPool(size=1, max_memory_mb=None, factory=partial(create_driver, performance_log=True))
+
+
+def main():
+    import argparse
+    from schedule_http import ClassSearchClient
+    parser = argparse.ArgumentParser(description="Look up a course through a captured search endpoint")
+    parser.add_argument('template', nargs='?', default=DEFAULT_TEMPLATE_PATH)
+    parser.add_argument('--department', default='MATH')
+    parser.add_argument('--course', default='451')
+    parser.add_argument('--term', default=DEFAULT_TERM)
+    parser.add_argument('--show', action='store_true', help="print the template instead")
+    args = parser.parse_args()
+
+    template = RequestTemplate.load(args.template)
+    if args.show:
+        print(json.dumps(template.to_dict(), indent=2))
+        return
+    client = ClassSearchClient(base_url=template.url, term=args.term, form=template.form())
+    try:
+        results = client.search(args.department, args.course)
+        payload = {"ok": True, "count": len(results), "results": results}
+    except Exception as exc:
+        payload = {"ok": False, "error": str(exc)}
+    print(json.dumps(payload, indent=2))
+
+
+if __name__ == '__main__':
+    main()
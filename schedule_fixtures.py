@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Record/replay fixtures for class-search pages.
+
+A fixture is a directory holding every HTTP response the client fetched and
+the browser's page_source at each Selenium phase (term selected, results),
+indexed by manifest.json. The manifest carries a format version so the
+layout can change without silently misreading old recordings:
+
+    fixtures/<name>/manifest.json
+    fixtures/<name>/http/000.html ...
+    fixtures/<name>/pages/000-results.html ...
+
+FixtureRecorder attaches to a ClassSearchClient (and is handed the driver at
+each phase); FixtureReplayer serves the recordings back to the same client
+and, through ReplayDriver, to the browser-side extraction code. The compare
+command runs the v0.1.1 and v0.8.0 pipelines over one fixture's pages
+without touching the network.
+"""
+import atexit
+import functools
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from schedule_cache import ResponseCache
+from schedule_columns import column_map
+from schedule_dom import SNAPSHOT_TABLES_JS, snapshot_tables_from_html
+from schedule_http import BYU_CLASS_SEARCH_URL, DEFAULT_TERM, ClassSearchClient, SimpleTableParser
+
+FIXTURE_FORMAT = 1
+DEFAULT_FIXTURE_DIR = "fixtures"
+MANIFEST = "manifest.json"
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+log = logging.getLogger(__name__)
+
+
+class FixtureError(LookupError):
+    """Raised when a fixture is missing, has an unknown format, or lacks a recorded response"""
+
+
+def _write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class FixtureRecorder:
+    """
+    Collects responses and page snapshots in memory-light form (bodies go
+    straight to disk) and writes the manifest on save(). The recording is
+    made in a hidden sibling directory and only replaces an existing fixture
+    in `directory` on save(), so a failed or interrupted run leaves the
+    previous recording intact.
+    """
+    def __init__(self, directory: str, base_url: str = BYU_CLASS_SEARCH_URL, term: str = DEFAULT_TERM):
+        self.directory = directory
+        parent, name = os.path.split(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        self.staging = tempfile.mkdtemp(dir=parent, prefix=f".{name}.", suffix=".recording")
+        # Gone by exit once saved; otherwise an abandoned recording
+        atexit.register(shutil.rmtree, self.staging, ignore_errors=True)
+        self.manifest = {
+            "format": FIXTURE_FORMAT,
+            "name": os.path.basename(os.path.normpath(directory)),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "base_url": base_url,
+            "term": term,
+            "http": [],
+            "pages": [],
+        }
+
+    def record_http(self, url: str, data: Optional[Dict[str, str]], body: str, seconds: float = 0.0):
+        entries = self.manifest["http"]
+        name = f"http/{len(entries):03d}.html"
+        _write(os.path.join(self.staging, name), body)
+        entries.append({
+            "method": "GET" if data is None else "POST",
+            "url": url,
+            "data": data,
+            "file": name,
+            "seconds": round(seconds, 4),
+        })
+
+    def record_page(self, phase: str, driver, query: Optional[str] = None):
+        """Save driver.page_source for one phase of a Selenium run"""
+        entries = self.manifest["pages"]
+        name = f"pages/{len(entries):03d}-{phase}.html"
+        _write(os.path.join(self.staging, name), driver.page_source)
+        entries.append({"phase": phase, "query": query, "url": driver.current_url, "file": name})
+
+    def wrap(self, fetch: Callable[..., str]) -> Callable[..., str]:
+        def recording_fetch(url: str, data: Optional[Dict[str, str]] = None) -> str:
+            start = time.perf_counter()
+            body = fetch(url, data)
+            self.record_http(url, data, body, time.perf_counter() - start)
+            return body
+        return recording_fetch
+
+    def attach(self, client: ClassSearchClient) -> ClassSearchClient:
+        """Record every response `client` fetches (responses are then parsed whole, not streamed)"""
+        self.manifest["base_url"] = client.base_url
+        self.manifest["term"] = client.term
+        client.fetch = self.wrap(client.fetch)
+        client.streams_from_socket = False
+        return client
+
+    def save(self):
+        """Write the manifest and swap the recording into place"""
+        _write(os.path.join(self.staging, MANIFEST), json.dumps(self.manifest, indent=2))
+        previous = None
+        if os.path.exists(self.directory):
+            # A directory cannot be renamed over a non-empty one; move the old fixture aside first
+            previous = tempfile.mkdtemp(dir=os.path.dirname(self.staging), suffix=".previous")
+            os.replace(self.directory, os.path.join(previous, "fixture"))
+        os.replace(self.staging, self.directory)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+
+
+class FixtureReplayer:
+    """Serves a recorded fixture; requests are matched on URL plus form payload, like the cache"""
+    def __init__(self, directory: str):
+        self.directory = directory
+        try:
+            with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise FixtureError(f"no readable fixture in {directory}: {e}")
+        if self.manifest.get("format") != FIXTURE_FORMAT:
+            raise FixtureError(f"{directory}: fixture format {self.manifest.get('format')!r}, "
+                               f"expected {FIXTURE_FORMAT}; re-record it")
+        # Later recordings of the same request win
+        self._responses = {ResponseCache.key(entry["url"], entry["data"]): entry["file"]
+                           for entry in self.manifest["http"]}
+
+    def read(self, name: str) -> str:
+        with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+            return f.read()
+
+    def fetch(self, url: str, data: Optional[Dict[str, str]] = None) -> str:
+        name = self._responses.get(ResponseCache.key(url, data))
+        if name is None:
+            raise FixtureError(f"no recorded response for {url} {data or ''}")
+        return self.read(name)
+
+    def attach(self, client: ClassSearchClient) -> ClassSearchClient:
+        client.fetch = self.fetch
+        client.streams_from_socket = False
+        return client
+
+    def client(self, **kwargs) -> ClassSearchClient:
+        kwargs.setdefault('base_url', self.manifest.get("base_url", BYU_CLASS_SEARCH_URL))
+        kwargs.setdefault('term', self.manifest.get("term", DEFAULT_TERM))
+        return self.attach(ClassSearchClient(**kwargs))
+
+    def page(self, phase: str, query: Optional[str] = None) -> Optional["ReplayDriver"]:
+        """The last page recorded for `phase` (and `query`, when given), as a ReplayDriver"""
+        for entry in reversed(self.manifest["pages"]):
+            if entry["phase"] == phase and (query is None or entry["query"] == query):
+                return ReplayDriver(self.read(entry["file"]), entry["url"])
+        return None
+
+    def documents(self) -> List[Dict[str, str]]:
+        """Every recorded HTML document: label, kind and body"""
+        docs = []
+        for entry in self.manifest["http"]:
+            docs.append({"label": entry["file"], "kind": "http", "html": self.read(entry["file"])})
+        for entry in self.manifest["pages"]:
+            docs.append({"label": entry["file"], "kind": entry["phase"], "html": self.read(entry["file"])})
+        return docs
+
+
+class ReplayDriver:
+    """
+    Stands in for a WebDriver that is sitting on a recorded page. It supports
+    what the snapshot extraction path needs (page_source, current_url and the
+    table snapshot script), not navigation or element lookups.
+    """
+    def __init__(self, page_source: str, current_url: str = ""):
+        self.page_source = page_source
+        self.current_url = current_url
+
+    def execute_script(self, script: str, *args):
+        if script == SNAPSHOT_TABLES_JS:
+            return snapshot_tables_from_html(self.page_source)
+        raise NotImplementedError("a replayed page only supports the table snapshot script")
+
+
+@functools.lru_cache(maxsize=None)
+def load_scraper(version: str):
+    """Import byu_class_schedule_scraper_v<version>.py (the file names are not importable as-is)"""
+    path = os.path.join(HERE, f"byu_class_schedule_scraper_v{version}.py")
+    spec = importlib.util.spec_from_file_location(f"byu_class_schedule_scraper_v{version.replace('.', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _v011_pipeline(html: str, department: str, catalog: str, instructor: str):
+    # The v0.1.1 lookup hard-codes MATH 451 / Conner; it is fed the recorded page in place of its GET
+    scraper = load_scraper("0.1.1")
+
+    def run():
+        scraper.fetch_page = lambda url, data=None, headers=None: html
+        return scraper.search_math_451_winter_2026(department, instructor)
+    return run
+
+
+def _v080_browser_pipeline(html: str, department: str, catalog: str, instructor: str):
+    scraper = load_scraper("0.8.0")
+    return lambda: scraper.extract_results(ReplayDriver(html), department, catalog, instructor)
+
+
+def _v080_http_pipeline(html: str, department: str, catalog: str, instructor: str):
+    def run():
+        parser = SimpleTableParser()
+        parser.feed(html)
+        parser.close()
+        columns = column_map(parser.header)
+        return [columns.project(row) for row in parser.rows]
+    return run
+
+
+PIPELINES = {
+    "v0.1.1": _v011_pipeline,
+    "v0.8.0-browser": _v080_browser_pipeline,
+    "v0.8.0-http": _v080_http_pipeline,
+}
+
+
+def compare(directory: str, department: str = "MATH", catalog: str = "451", instructor: str = "Conner",
+            repeat: int = 5) -> List[Dict]:
+    """Best-of-`repeat` extraction time and result count per pipeline for every recorded document"""
+    replayer = FixtureReplayer(directory)
+    report = []
+    for doc in replayer.documents():
+        entry = {"document": doc["label"], "kind": doc["kind"], "bytes": len(doc["html"].encode('utf-8'))}
+        for name, build in PIPELINES.items():
+            run = build(doc["html"], department, catalog, instructor)
+            best = float('inf')
+            results: List[Dict[str, str]] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results = run()
+                best = min(best, time.perf_counter() - start)
+            entry[name] = {"results": len(results), "ms": round(best * 1000, 3)}
+        report.append(entry)
+    return report
+
+
+def record_http(directory: str, department: str, catalog: str, term: str = DEFAULT_TERM,
+                base_url: str = BYU_CLASS_SEARCH_URL) -> List[Dict[str, str]]:
+    """
+    Record one HTTP lookup (landing page and search response) without a
+    browser. The fixture in `directory` is only replaced when the lookup
+    found results; otherwise the previous recording is kept.
+    """
+    recorder = FixtureRecorder(directory, base_url, term)
+    client = recorder.attach(ClassSearchClient(base_url=base_url, term=term))
+    try:
+        results = client.search(department, catalog)
+    except Exception:
+        log.warning("Lookup failed; keeping the previous fixture in %s", directory)
+        raise
+    if not results:
+        log.warning("No results; keeping the previous fixture in %s", directory)
+        return results
+    recorder.save()
+    return results
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Record and replay class-search fixtures")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="record an HTTP lookup into a fixture directory")
+    rec.add_argument('directory')
+    rec.add_argument('--department', default='MATH')
+    rec.add_argument('--course', default='451')
+    rec.add_argument('--term', default=DEFAULT_TERM)
+    rec.add_argument('--base-url', default=BYU_CLASS_SEARCH_URL)
+
+    rep = sub.add_parser('replay', help="run the HTTP client against a fixture")
+    rep.add_argument('directory')
+    rep.add_argument('--department', default='MATH')
+    rep.add_argument('--course', default='451')
+
+    cmp_ = sub.add_parser('compare', help="time the v0.1.1 and v0.8.0 extraction pipelines on a fixture")
+    cmp_.add_argument('directory')
+    cmp_.add_argument('--department', default='MATH')
+    cmp_.add_argument('--course', default='451')
+    cmp_.add_argument('--instructor', default='Conner')
+    cmp_.add_argument('--repeat', type=int, default=5)
+    cmp_.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        results = record_http(args.directory, args.department, args.course, args.term, args.base_url)
+        print(f"Recorded {args.department} {args.course} into {args.directory}: {len(results)} results")
+    elif args.command == 'replay':
+        results = FixtureReplayer(args.directory).client().search(args.department, args.course)
+        print(json.dumps({"ok": bool(results), "results": results}, indent=2))
+    else:
+        report = compare(args.directory, args.department, args.course, args.instructor, args.repeat)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        print(f"{'document':<28} {'kind':<14} {'bytes':>8}  " + "  ".join(f"{name:>18}" for name in PIPELINES))
+        for entry in report:
+            cells = "  ".join(f"{entry[name]['results']:>4} in {entry[name]['ms']:>8.3f}ms" for name in PIPELINES)
+            print(f"{entry['document']:<28} {entry['kind']:<14} {entry['bytes']:>8}  {cells}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Browserless HTTP client for the BYU class schedule search.
+
+Replays the class-search form (yearTerm / creditType / department / catalog)
+with plain urllib requests and parses the results table with SimpleTableParser,
+so a lookup costs one or two HTTP round-trips instead of a headless Chrome run.
+"""
+import codecs
+import re
+from collections import deque
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urljoin
+from urllib.request import HTTPCookieProcessor, OpenerDirector, Request, build_opener
+
+from schedule_columns import POSITIONAL, RESULT_COLUMNS, ColumnMap, column_map
+from schedule_section import Section
+
+BYU_CLASS_SEARCH_URL = "https://commtech.byu.edu/noauth/classSchedule/index.php"
+DEFAULT_TERM = "Winter 2026"
+DEFAULT_CREDIT_TYPE = "2"
+USER_AGENT = "Mozilla/5.0 (compatible; schedule-bot/0.1)"
+
+# BYU encodes terms as <year><season digit>, e.g. 20261 for Winter 2026
+TERM_SEASON_CODES = {"winter": "1", "spring": "3", "summer": "4", "fall": "5"}
+
+NO_RESULTS_RE = re.compile(r"\b0\s*courses\s*found", re.I)
+
+CHUNK_SIZE = 16 * 1024
+
+
+class SimpleTableParser(HTMLParser):
+    """
+    Minimal HTML table parser tailored to the BYU class schedule listing table.
+    Extracts rows from the first table that looks like the results grid.
+    Falls back gracefully if the page contains no results.
+
+    The cells of the most recent header row are kept in `header` so callers
+    can map columns by name.
+
+    With streaming=True completed rows are queued on `pending` instead of
+    accumulating in `rows`, and `done` is set as soon as the results table
+    (the first top-level table with a row of at least `min_columns` cells)
+    closes; everything after it is ignored.
+    """
+    def __init__(self, streaming: bool = False, min_columns: int = len(RESULT_COLUMNS)):
+        super().__init__()
+        self.in_table = False
+        self.in_tr = False
+        self.in_td = False
+        self.current_row = []
+        self.row_has_td = False
+        self.rows = []
+        self.header_seen = False
+        self.header: List[str] = []
+        self.table_depth = 0
+        self.cell_parts = []
+        self.streaming = streaming
+        self.min_columns = min_columns
+        self.pending = deque()
+        self.table_has_results = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'table':
+            self.table_depth += 1
+            if not self.in_table:
+                self.in_table = True
+        elif tag == 'tr' and self.in_table:
+            self.in_tr = True
+            self.current_row = []
+            self.row_has_td = False
+        elif tag in ('td', 'th') and self.in_tr:
+            self.in_td = True
+            self.row_has_td = self.row_has_td or tag == 'td'
+            self.cell_parts = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'table' and self.in_table:
+            self.table_depth -= 1
+            if self.table_depth <= 0:
+                self.in_table = False
+                if self.streaming and self.table_has_results:
+                    self.done = True
+        elif tag == 'tr' and self.in_tr:
+            self.in_tr = False
+            if self.current_row:
+                # The first row, and any row made only of <th> cells, is a header
+                if not self.header_seen or not self.row_has_td:
+                    self.header_seen = True
+                    self.header = [cell.strip() for cell in self.current_row]
+                else:
+                    self._emit([cell.strip() for cell in self.current_row])
+            self.current_row = []
+        elif tag in ('td', 'th') and self.in_td:
+            self.in_td = False
+            self.current_row.append(''.join(self.cell_parts).strip())
+
+    def handle_data(self, data):
+        if self.in_td:
+            self.cell_parts.append(data)
+
+    def _emit(self, row):
+        if len(row) >= self.min_columns:
+            self.table_has_results = True
+        if self.streaming:
+            self.pending.append(row)
+        else:
+            self.rows.append(row)
+
+
+class RowStream:
+    """
+    Results rows parsed incrementally from an iterable of text chunks.
+    Iteration stops as soon as the results table closes or the page says
+    "0 courses found" (`no_results` is then True); the chunk source is closed
+    at that point so a live response stops being read. `header` holds the
+    results table's header cells once its first row has been yielded.
+    """
+    def __init__(self, chunks: Iterable[str], min_columns: int = len(RESULT_COLUMNS)):
+        self.chunks = chunks
+        self.min_columns = min_columns
+        self.no_results = False
+        self.header: List[str] = []
+
+    def columns(self) -> ColumnMap:
+        return column_map(self.header)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        parser = SimpleTableParser(streaming=True, min_columns=self.min_columns)
+        tail = ''
+        try:
+            for chunk in self.chunks:
+                # Keep a little of the previous chunk so a message split across chunks still matches
+                window = tail + chunk
+                if NO_RESULTS_RE.search(window):
+                    self.no_results = True
+                    return
+                tail = window[-32:]
+                parser.feed(chunk)
+                yield from self._drain(parser)
+                if parser.done:
+                    return
+            parser.close()
+            yield from self._drain(parser)
+        finally:
+            close = getattr(self.chunks, 'close', None)
+            if close is not None:
+                close()
+
+    def _drain(self, parser: SimpleTableParser) -> Iterator[List[str]]:
+        while parser.pending:
+            row = parser.pending.popleft()
+            if len(row) >= self.min_columns:
+                self.header = parser.header
+                yield row
+
+
+class SearchForm:
+    """The class-search form as discovered on the landing page"""
+    def __init__(self, action: str, method: str = 'get'):
+        self.action = action
+        self.method = method
+        self.fields: Dict[str, str] = {}
+        self.term_field: Optional[str] = None
+        self.term_options: List[Tuple[str, str]] = []
+        self.dept_field: Optional[str] = None
+        self.catalog_field: Optional[str] = None
+        self.submit_field: Optional[str] = None
+
+    def term_value(self, term: str) -> str:
+        """Value of the term option whose label mentions `term` (e.g. 'Winter 2026')"""
+        for value, text in self.term_options:
+            if term.lower() in text.lower():
+                return value
+        return term_code(term)
+
+    def payload(self, term: str, department: str, catalog: str) -> Dict[str, str]:
+        data = dict(self.fields)
+        data[self.term_field or 'yearTerm'] = self.term_value(term)
+        if self.dept_field:
+            data[self.dept_field] = department
+        if self.catalog_field:
+            data[self.catalog_field] = catalog
+        return data
+
+
+class SearchFormParser(HTMLParser):
+    """Collects the inputs, selects and submit button of the class-search form"""
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+        self.forms: List[SearchForm] = []
+        self.form: Optional[SearchForm] = None
+        self.select_name: Optional[str] = None
+        self.option_value: Optional[str] = None
+        self.option_selected = False
+        self.option_text: List[str] = []
+        self.in_option = False
+
+    def handle_starttag(self, tag, attrs):
+        attr = {k: (v or '') for k, v in attrs}
+        if tag == 'form':
+            self.form = SearchForm(urljoin(self.base_url, attr.get('action') or self.base_url),
+                                   (attr.get('method') or 'get').lower())
+            self.forms.append(self.form)
+        elif self.form is None:
+            return
+        elif tag == 'input':
+            self._add_input(attr)
+        elif tag == 'select':
+            self.select_name = attr.get('name') or attr.get('id')
+            if self.select_name and self.form.term_field is None and is_term_field(attr):
+                self.form.term_field = self.select_name
+        elif tag == 'option' and self.select_name:
+            self.in_option = True
+            self.option_value = attr.get('value')
+            self.option_selected = 'selected' in attr
+            self.option_text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'option' and self.in_option:
+            self.in_option = False
+            text = ''.join(self.option_text).strip()
+            value = text if self.option_value is None else self.option_value
+            if self.form is not None:
+                if self.option_selected or self.select_name not in self.form.fields:
+                    self.form.fields[self.select_name] = value
+                if self.select_name == self.form.term_field:
+                    self.form.term_options.append((value, text))
+        elif tag == 'select':
+            self.select_name = None
+        elif tag == 'form':
+            self.form = None
+
+    def handle_data(self, data):
+        if self.in_option:
+            self.option_text.append(data)
+
+    def _add_input(self, attr: Dict[str, str]):
+        name = attr.get('name')
+        type_attr = attr.get('type', 'text').lower()
+        if not name or type_attr in ('button', 'reset', 'image', 'file'):
+            return
+        if type_attr in ('checkbox', 'radio') and 'checked' not in attr:
+            return
+        if type_attr == 'submit':
+            # Only the clicked button is submitted; keep the first search button
+            value = attr.get('value', '').lower()
+            if self.form.submit_field or ('search' not in value and 'submit' not in value):
+                return
+            self.form.submit_field = name
+        self.form.fields[name] = attr.get('value', '')
+        if type_attr not in ('text', 'search', 'number'):
+            return
+        if self.form.dept_field is None and is_department_field(attr):
+            self.form.dept_field = name
+        elif self.form.catalog_field is None and is_catalog_field(attr):
+            self.form.catalog_field = name
+
+
+def _attr_mentions(attr: Dict[str, str], keywords: Tuple[str, ...]) -> bool:
+    for key in ('placeholder', 'name', 'id'):
+        value = (attr.get(key) or '').lower()
+        if value and any(keyword in value for keyword in keywords):
+            return True
+    return False
+
+
+def is_term_field(attr: Dict[str, str]) -> bool:
+    return _attr_mentions(attr, ('yearterm', 'year', 'term'))
+
+
+def is_department_field(attr: Dict[str, str]) -> bool:
+    return _attr_mentions(attr, ('department', 'dept', 'subject'))
+
+
+def is_catalog_field(attr: Dict[str, str]) -> bool:
+    return _attr_mentions(attr, ('catalog', 'course', 'number'))
+
+
+def term_code(term: str) -> str:
+    """'Winter 2026' -> '20261'; returns the input unchanged if it is not a season/year label"""
+    match = re.match(r"\s*(winter|spring|summer|fall)\s+(\d{4})\s*$", term, re.I)
+    if not match:
+        return term
+    return match.group(2) + TERM_SEASON_CODES[match.group(1).lower()]
+
+
+def open_url(url: str, data: Optional[Dict[str, str]] = None, headers: Optional[Dict[str, str]] = None,
+             opener: Optional[OpenerDirector] = None, timeout: float = 30):
+    """Open a GET (or form POST when `data` is given) and return the live response"""
+    req_headers: Dict[str, str] = {"User-Agent": USER_AGENT}
+    if headers:
+        req_headers.update(headers)
+    if data is None:
+        req = Request(url, headers=req_headers)
+    else:
+        payload = urlencode(data).encode()
+        req = Request(url, data=payload, headers=req_headers)
+    opener = opener if opener is not None else build_opener()
+    return opener.open(req, timeout=timeout)
+
+
+def fetch_page(url: str, data: Optional[Dict[str, str]] = None, headers: Optional[Dict[str, str]] = None,
+               opener: Optional[OpenerDirector] = None, timeout: float = 30) -> str:
+    with open_url(url, data, headers, opener, timeout) as resp:
+        return resp.read().decode('utf-8', errors='ignore')
+
+
+def iter_response_text(resp, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Decode a response body chunk by chunk as it arrives"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    while True:
+        block = resp.read(chunk_size)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_text_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+def parse_search_form(html: str, base_url: str) -> Optional[SearchForm]:
+    """Return the form that carries the term selector, or the first form on the page"""
+    parser = SearchFormParser(base_url)
+    parser.feed(html)
+    for form in parser.forms:
+        if form.term_field:
+            return form
+    return parser.forms[0] if parser.forms else None
+
+
+def section_matches(section: str, target: str) -> bool:
+    """'001' matches both a bare '001' cell and 'MATH 451 001'"""
+    section = section.strip()
+    return section == target or section.endswith(' ' + target)
+
+
+def row_to_result(row: List[str]) -> Dict[str, str]:
+    """Map a row in the fixed 12-column layout onto the scraper's result record"""
+    return POSITIONAL.project(row)
+
+
+class ClassSearchClient:
+    """
+    Replays the class-search form over HTTP. The landing page is fetched once per
+    client to learn the form fields and term options; every search after that is
+    a single request. Cookies are kept for the lifetime of the client. With a
+    `cache` (schedule_cache.ResponseCache) responses are served from disk and
+    revalidated with conditional requests.
+
+    By default results are parsed incrementally with SimpleTableParser. Naming a
+    `parser` backend from schedule_parsers ('lxml', 'selectolax' or 'auto' for
+    the fastest installed one) parses the whole response with it instead.
+
+    A known `form` (e.g. schedule_endpoint.RequestTemplate.form()) skips the
+    landing page; searches go straight to its action URL.
+    """
+    def __init__(self, base_url: str = BYU_CLASS_SEARCH_URL, term: str = DEFAULT_TERM,
+                 credit_type: str = DEFAULT_CREDIT_TYPE, timeout: float = 30,
+                 fetch: Optional[Callable[..., str]] = None, cache=None, parser: Optional[str] = None,
+                 form: Optional[SearchForm] = None):
+        self.base_url = base_url
+        self.term = term
+        self.credit_type = credit_type
+        self.timeout = timeout
+        self.cache = cache
+        self.parser = parser
+        self.opener = build_opener(HTTPCookieProcessor())
+        self.fetch = fetch or self._fetch
+        self.streams_from_socket = fetch is None and cache is None
+        self.form: Optional[SearchForm] = form
+
+    def _fetch(self, url: str, data: Optional[Dict[str, str]] = None) -> str:
+        if self.cache is not None:
+            return self.cache.fetch(url, data, opener=self.opener, timeout=self.timeout)
+        return fetch_page(url, data, opener=self.opener, timeout=self.timeout)
+
+    def load_form(self) -> SearchForm:
+        if self.form is None:
+            html = self.fetch(self.base_url)
+            form = parse_search_form(html, self.base_url)
+            if form is None:
+                # No <form> markup: fall back to the query parameters the site is known to accept
+                form = SearchForm(self.base_url)
+                form.fields['creditType'] = self.credit_type
+            form.fields.setdefault('creditType', self.credit_type)
+            self.form = form
+        return self.form
+
+    def request_for(self, department: str, catalog: str) -> Tuple[str, Optional[Dict[str, str]]]:
+        """URL and POST body (None for GET) that submit the form for one course"""
+        form = self.load_form()
+        payload = form.payload(self.term, department, catalog)
+        if not form.dept_field:
+            payload.setdefault('dept', department)
+        if not form.catalog_field:
+            payload.setdefault('catalogNumber', catalog)
+        if form.method == 'post':
+            return form.action, payload
+        separator = '&' if '?' in form.action else '?'
+        return form.action + separator + urlencode(payload), None
+
+    def search_html(self, department: str, catalog: str) -> str:
+        url, data = self.request_for(department, catalog)
+        return self.fetch(url, data)
+
+    def search_chunks(self, department: str, catalog: str) -> Iterator[str]:
+        """
+        The search response as text chunks. Read straight off the socket when
+        possible; cached or injected responses are sliced from the full body.
+        """
+        url, data = self.request_for(department, catalog)
+        if not self.streams_from_socket:
+            yield from iter_text_chunks(self.fetch(url, data))
+            return
+        with open_url(url, data, opener=self.opener, timeout=self.timeout) as resp:
+            yield from iter_response_text(resp)
+
+    def row_stream(self, department: str, catalog: str) -> RowStream:
+        return RowStream(self.search_chunks(department, catalog))
+
+    def search_rows(self, department: str, catalog: str) -> List[List[str]]:
+        """
+        Results rows for one course. An explicit "0 courses found" page yields [];
+        a page with neither results rows nor that message raises LookupError so
+        callers can fall back to the browser.
+        """
+        return self.search_table(department, catalog)[1]
+
+    def search_table(self, department: str, catalog: str) -> Tuple[ColumnMap, List[List[str]]]:
+        """search_rows() together with the column map read from the results table's header"""
+        if self.parser is not None:
+            columns, rows, no_results = self._parse_with_backend(department, catalog)
+        else:
+            stream = self.row_stream(department, catalog)
+            rows, no_results = list(stream), stream.no_results
+            columns = stream.columns()
+        if not rows and not no_results:
+            raise LookupError(f"no results table in class-search response for {department} {catalog}")
+        return columns, rows
+
+    def _parse_with_backend(self, department: str, catalog: str) -> Tuple[ColumnMap, List[List[str]], bool]:
+        from schedule_parsers import get_backend
+        html = self.search_html(department, catalog)
+        if NO_RESULTS_RE.search(html):
+            return POSITIONAL, [], True
+        header, rows = get_backend(self.parser).table(html)
+        return column_map(header), [row for row in rows if len(row) >= len(RESULT_COLUMNS)], False
+
+    def search(self, department: str, catalog: str) -> List[Dict[str, str]]:
+        columns, rows = self.search_table(department, catalog)
+        return [columns.project(row) for row in rows]
+
+    def search_sections(self, department: str, catalog: str) -> List[Section]:
+        """search() as compact Section records (see schedule_section)"""
+        columns, rows = self.search_table(department, catalog)
+        return [Section.from_row(row, columns) for row in rows]
+
+    def iter_search(self, department: str, catalog: str,
+                    sections: Optional[Iterable[str]] = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield results as their rows are parsed. With `sections`, reading stops
+        as soon as every requested section number has been seen.
+        """
+        wanted: Set[str] = {section.strip() for section in sections} if sections else set()
+        stream = self.row_stream(department, catalog)
+        rows = iter(stream)
+        columns: Optional[ColumnMap] = None
+        try:
+            for row in rows:
+                if columns is None:
+                    # The header has been parsed by the time the first row arrives
+                    columns = stream.columns()
+                record = columns.project(row)
+                if sections:
+                    hit = next((target for target in wanted if section_matches(record["section"], target)), None)
+                    if hit is None:
+                        continue
+                    wanted.discard(hit)
+                yield record
+                if sections and not wanted:
+                    return
+        finally:
+            rows.close()
+
+
+def http_fetch_schedule(department: str = "MATH", catalog: str = "451", term: str = DEFAULT_TERM,
+                        base_url: str = BYU_CLASS_SEARCH_URL, cache=None) -> List[Dict[str, str]]:
+    """One-shot HTTP lookup; raises on network errors so callers can fall back to Selenium"""
+    client = ClassSearchClient(base_url=base_url, term=term, cache=cache)
+    return client.search(department, catalog)
+
+
+def main():
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Look up BYU class sections over plain HTTP")
+    parser.add_argument('--department', default='MATH')
+    parser.add_argument('--course', default='451')
+    parser.add_argument('--term', default=DEFAULT_TERM)
+    parser.add_argument('--base-url', default=BYU_CLASS_SEARCH_URL)
+    parser.add_argument('--parser', help="table parser backend: html.parser, lxml, selectolax or auto")
+    parser.add_argument('--section', action='append', default=[],
+                        help="stop reading once these section numbers are found (repeatable)")
+    args = parser.parse_args()
+
+    try:
+        client = ClassSearchClient(base_url=args.base_url, term=args.term, parser=args.parser)
+        if args.section:
+            results = list(client.iter_search(args.department, args.course, args.section))
+        else:
+            results = client.search(args.department, args.course)
+        payload = {"ok": True, "count": len(results), "results": results}
+    except Exception as exc:
+        payload = {"ok": False, "error": str(exc)}
+    print(json.dumps(payload, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Logging setup shared by the scraper command lines.
+
+Progress goes to stderr through the standard logging module, so stdout
+carries only the final JSON. The default level is INFO (one line per phase);
+-v adds DEBUG row and field dumps, -vv also stamps each line with time and
+logger, and -q keeps only errors. Call sites log with %-style arguments and
+guard anything that costs extra work (WebDriver round-trips, diagnostic
+regex scans) with log.isEnabledFor(logging.DEBUG), so disabled levels are
+close to free.
+"""
+import logging
+import sys
+
+PLAIN_FORMAT = "%(message)s"
+DETAILED_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+def add_logging_arguments(parser):
+    """Register -v/--verbose (repeatable) and -q/--quiet"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-v', '--verbose', action='count', default=0,
+                       help="show debug detail (row and field dumps); -vv adds timestamps and logger names")
+    group.add_argument('-q', '--quiet', action='store_true', help="print only the final JSON (and errors on stderr)")
+
+
+def configure_logging(verbose: int = 0, quiet: bool = False):
+    if quiet:
+        level = logging.ERROR
+    elif verbose:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(DETAILED_FORMAT if verbose > 1 else PLAIN_FORMAT))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+
+def logging_from_args(args):
+    configure_logging(args.verbose, args.quiet)
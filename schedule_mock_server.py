@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for classSchedule/index.php, for load and latency testing.
+
+Serves the pieces both scraper paths rely on: the term <select> (choosing a
+term reloads the page, like the live site), the department and catalog
+inputs, the Search button, and a results page with an "N courses found"
+counter above a 12-column results table. Row count, response latency and
+jitter, and injected failures (HTTP error statuses or dropped connections)
+are configurable, and /stats reports what the server saw. Search results
+carry an ETag and honour If-None-Match; with --seat-period the seat counts
+change every that many seconds, for exercising schedule_watch.py. With
+--assets the page also pulls in a stylesheet, a web font, banner images and
+an analytics script from another host name, like the live page, for
+benchmark_page_load.py.
+
+    python schedule_mock_server.py serve --port 8000 --rows 40 --latency 0.2
+    python byu_class_schedule_scraper_v0.8.0.py --base-url http://127.0.0.1:8000/index.php
+    python schedule_mock_server.py bench --lookups 500 --concurrency 32 --jitter 0.3
+    python schedule_mock_server.py bench --lookups 10 --selenium-batch 5
+"""
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from schedule_http import RESULT_COLUMNS
+
+TERMS = (("20255", "Fall 2025"), ("20261", "Winter 2026"), ("20263", "Spring 2026"), ("20264", "Summer 2026"))
+DEFAULT_YEAR_TERM = "20261"
+
+INSTRUCTORS = ("Conner, Greg", "Humpherys, Jeffrey", "Jarvis, Tyler", "Barker, William", "Whitehead, Jared")
+MEETINGS = (("MWF", "8:00 AM", "8:50 AM"), ("TTh", "9:30 AM", "10:45 AM"), ("MWF", "2:00 PM", "2:50 PM"),
+            ("MW", "4:00 PM", "5:15 PM"), ("TTh", "1:00 PM", "2:15 PM"))
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Class Schedule</title>{head}</head><body>
+{banner}
+<form id="classSearch" action="index.php" method="post">
+<label for="yearTerm">Term</label>
+<select name="yearTerm" id="yearTerm"
+ onchange="location.href='index.php?yearTerm=' + this.value + '&amp;creditType=2'">{options}</select>
+<input type="hidden" name="creditType" value="2">
+<label for="dept">Department</label>
+<input type="text" name="dept" id="dept" placeholder="Department" value="{dept}">
+<label for="catalogNumber">Catalog Number</label>
+<input type="text" name="catalogNumber" id="catalogNumber" placeholder="Catalog Number" value="{catalog}">
+<input type="submit" name="search" value="Search">
+</form>
+{results}
+</body></html>
+"""
+
+# name -> bytes served under /static/ with --assets
+ASSET_SIZES = {
+    "site.css": 24_000, "font.woff2": 80_000, "analytics.js": 60_000,
+    "banner-1.png": 150_000, "banner-2.png": 150_000, "banner-3.jpg": 120_000, "logo.svg": 12_000,
+}
+ASSET_TYPES = {".css": "text/css", ".woff2": "font/woff2", ".js": "application/javascript", ".png": "image/png",
+               ".jpg": "image/jpeg", ".svg": "image/svg+xml"}
+
+
+def asset_body(name: str) -> bytes:
+    """Deterministic filler of the asset's size; the stylesheet really uses the font"""
+    size = ASSET_SIZES[name]
+    if name.endswith(".css"):
+        head = b"@font-face{font-family:Mock;src:url(font.woff2)}body{font-family:Mock,sans-serif}\n/*"
+        return head + b"." * (size - len(head) - 2) + b"*/"
+    if name.endswith(".js"):
+        return b"/*" + b"." * (size - 4) + b"*/"
+    return bytes(i % 251 for i in range(size))
+
+
+def asset_markup(port: int):
+    """(head, body) markup referencing every asset; the script comes from "localhost", a second host"""
+    head = ('\n<link rel="stylesheet" href="/static/site.css">'
+            f'\n<script src="http://localhost:{port}/static/analytics.js"></script>')
+    banner = "".join(f'<img src="/static/{name}" alt="">' for name in ASSET_SIZES
+                     if name.endswith((".png", ".jpg", ".svg")))
+    return head, banner
+
+
+def result_rows(department: str, catalog: str, term: str, count: int, epoch: int = 0) -> List[List[str]]:
+    """Deterministic 12-column rows for one course; every other section's seats move with `epoch`"""
+    rows = []
+    for i in range(count):
+        days, start, end = MEETINGS[i % len(MEETINGS)]
+        rows.append([
+            f"{department} {catalog} {i + 1:03d}", "DAY", "Classroom", INSTRUCTORS[i % len(INSTRUCTORS)], "3.00",
+            term, days, start, end, f"TMCB {120 + i % 40}", f"{(i * 7 + epoch * (i % 2)) % 36}/35", str(i % 3),
+        ])
+    return rows
+
+
+def render_page(year_term: str, department: str = "", catalog: str = "", rows: Optional[List[List[str]]] = None,
+                assets: Tuple[str, str] = ("", "")) -> str:
+    options = "".join(
+        f"<option value=\"{code}\"{' selected' if code == year_term else ''}>{label}</option>" for code, label in TERMS)
+    results = ""
+    if rows is not None:
+        header = "".join(f"<th>{column}</th>" for column in RESULT_COLUMNS)
+        body = "".join("<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>\n" for row in rows)
+        results = (f"<p class=\"count\">{len(rows)} courses found</p>\n"
+                   f"<table id=\"results\"><thead><tr>{header}</tr></thead><tbody>\n{body}</tbody></table>")
+    return PAGE.format(options=options, dept=html.escape(department), catalog=html.escape(catalog), results=results,
+                       head=assets[0], banner=assets[1])
+
+
+class MockClassSearchHandler(BaseHTTPRequestHandler):
+    server: "MockClassSearchServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.respond({})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.respond(parse_qs(self.rfile.read(length).decode('utf-8', errors='ignore')))
+
+    def respond(self, form: Dict[str, List[str]]):
+        server = self.server
+        url = urlsplit(self.path)
+        if url.path == '/stats':
+            self.send_body(200, json.dumps(server.stats_snapshot()), 'application/json')
+            return
+
+        fault = server.begin_request()
+        if fault == "drop":
+            # Close the socket without a response, like a reset upstream connection
+            self.close_connection = True
+            return
+        if fault is not None:
+            self.send_body(fault, f"<html><body><h1>{fault} {HTTPStatus(fault).phrase}</h1></body></html>")
+            return
+        if server.assets and url.path.startswith('/static/') and url.path[8:] in ASSET_SIZES:
+            name = url.path[8:]
+            self.send_body(200, asset_body(name), ASSET_TYPES[name[name.rindex('.'):]])
+            return
+        if url.path not in ('/', '/index.php'):
+            self.send_body(404, "<html><body>Not Found</body></html>")
+            return
+
+        params = parse_qs(url.query)
+        params.update(form)
+        value = lambda name: (params.get(name) or [""])[0].strip()
+        year_term = value('yearTerm')
+        year_term = year_term if year_term in dict(TERMS) else DEFAULT_YEAR_TERM
+        department, catalog = value('dept').upper(), value('catalogNumber')
+        rows = None
+        if department and catalog:
+            server.count("searches")
+            rows = result_rows(department, catalog, dict(TERMS)[year_term], server.rows, server.seat_epoch())
+        assets = asset_markup(server.server_address[1]) if server.assets else ("", "")
+        body = render_page(year_term, department, catalog, rows, assets).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if rows is not None and self.headers.get('If-None-Match') == etag:
+            server.count("not_modified")
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_body(200, body, etag=etag if rows is not None else None)
+
+    def send_body(self, status: int, text, content_type: str = 'text/html; charset=utf-8',
+                  etag: Optional[str] = None):
+        body = text.encode('utf-8') if isinstance(text, str) else text
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockClassSearchServer(ThreadingHTTPServer):
+    """
+    rows         -- result rows returned for every course search
+    latency      -- seconds added to every response
+    jitter       -- up to this many extra seconds, uniformly random per response
+    error_rate   -- fraction of requests answered with `error_status`
+    drop_rate    -- fraction of requests whose connection is closed without a response
+    seed         -- makes latency and fault injection reproducible
+    seat_period  -- seconds between seat-count changes (0: seats never change)
+    assets       -- reference and serve page assets (stylesheet, font, images, analytics)
+    """
+    daemon_threads = True
+    # The stdlib default backlog of 5 makes concurrent clients pay SYN retransmits
+    request_queue_size = 128
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rows: int = 12, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503, drop_rate: float = 0.0,
+                 seed: Optional[int] = None, seat_period: float = 0.0, assets: bool = False):
+        super().__init__((host, port), MockClassSearchHandler)
+        self.rows = rows
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.seat_period = seat_period
+        self.assets = assets
+        self.started = time.time()
+        self.stats = {"requests": 0, "searches": 0, "errors": 0, "dropped": 0, "not_modified": 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/index.php"
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def seat_epoch(self) -> int:
+        return int((time.time() - self.started) / self.seat_period) if self.seat_period else 0
+
+    def stats_snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def begin_request(self):
+        """Sleep for the configured latency; returns None, an error status, or "drop" """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + self.random.uniform(0, self.jitter) if self.jitter else self.latency
+            roll = self.random.random()
+            fault = None
+            if roll < self.drop_rate:
+                fault = "drop"
+                self.stats["dropped"] += 1
+            elif roll < self.drop_rate + self.error_rate:
+                fault = self.error_status
+                self.stats["errors"] += 1
+        if delay:
+            time.sleep(delay)
+        return fault
+
+    def start(self) -> "MockClassSearchServer":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-class-search", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(seconds, 0.50), 4),
+        "p95": round(percentile(seconds, 0.95), 4),
+        "p99": round(percentile(seconds, 0.99), 4),
+        "max": round(max(seconds), 4) if seconds else 0.0,
+    }
+
+
+def bench_http(server: MockClassSearchServer, lookups: int, concurrency: int, per_host: int) -> Dict:
+    """Concurrent HTTP lookups of distinct courses through the asyncio engine"""
+    from schedule_async import SweepQuery, sweep
+    queries = [SweepQuery("MATH", str(100 + i)) for i in range(lookups)]
+    start = time.perf_counter()
+    outcomes = sweep(queries, concurrency, per_host, server.base_url)
+    wall = time.perf_counter() - start
+    ok = [outcome.seconds for outcome in outcomes if outcome.error is None]
+    return {
+        "path": "http",
+        "lookups": lookups,
+        "failed": lookups - len(ok),
+        "wall_seconds": round(wall, 3),
+        "lookups_per_second": round(lookups / wall, 2) if wall else 0.0,
+        "latency_seconds": latency_summary(ok),
+    }
+
+
+def bench_selenium(server: MockClassSearchServer, lookups: int) -> Dict:
+    """Sequential browser lookups through the v0.8.0 scraper's Selenium path"""
+    from schedule_fixtures import load_scraper
+    scraper = load_scraper("0.8.0")
+    seconds, failed = [], 0
+    start = time.perf_counter()
+    for i in range(lookups):
+        began = time.perf_counter()
+        results = scraper.fetch_schedule_selenium("MATH", str(100 + i), base_url=server.base_url)
+        if results:
+            seconds.append(time.perf_counter() - began)
+        else:
+            failed += 1
+    wall = time.perf_counter() - start
+    return {
+        "path": "selenium",
+        "lookups": lookups,
+        "failed": failed,
+        "wall_seconds": round(wall, 3),
+        "lookups_per_second": round(lookups / wall, 2) if wall else 0.0,
+        "latency_seconds": latency_summary(seconds),
+    }
+
+
+def bench_selenium_batch(server: MockClassSearchServer, lookups: int) -> Dict:
+    """
+    Browser lookups in one session, as a batch runs them: the term is chosen
+    once and each course is searched from the previous results page. Every
+    course has the same number of rows, so a results wait that ran out its
+    timeout shows up in results_timeouts.
+    """
+    from byu_schedule.browser import open_class_search, search_course
+    from schedule_driver_pool import DriverPool
+    pool = DriverPool(size=1, max_memory_mb=None)
+    seconds, waits = [], []
+    start = time.perf_counter()
+    try:
+        with pool.borrow() as driver:
+            readiness = open_class_search(driver, base_url=server.base_url)
+            for i in range(lookups):
+                began = time.perf_counter()
+                waited = readiness.timings.get("results", 0.0)
+                search_course(driver, readiness, "MATH", str(100 + i))
+                seconds.append(time.perf_counter() - began)
+                waits.append(readiness.timings.get("results", 0.0) - waited)
+            timeouts = readiness.timeouts.count("results")
+    finally:
+        pool.close()
+    wall = time.perf_counter() - start
+    return {
+        "path": "selenium-batch",
+        "lookups": lookups,
+        "results_timeouts": timeouts,
+        "wall_seconds": round(wall, 3),
+        "lookups_per_second": round(lookups / wall, 2) if wall else 0.0,
+        "latency_seconds": latency_summary(seconds),
+        "results_wait_seconds": latency_summary(waits),
+    }
+
+
+def add_server_arguments(parser):
+    parser.add_argument('--rows', type=int, default=12, help="result rows per course search")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra random seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="fraction of connections closed without a response")
+    parser.add_argument('--seed', type=int, help="make latency and faults reproducible")
+    parser.add_argument('--seat-period', type=float, default=0.0, help="change seat counts every this many seconds")
+    parser.add_argument('--assets', action='store_true', help="serve the page with images, fonts, css and analytics")
+
+
+def server_from_args(args, port: int = 0) -> MockClassSearchServer:
+    return MockClassSearchServer("127.0.0.1", port, args.rows, args.latency, args.jitter,
+                                 args.error_rate, args.error_status, args.drop_rate, args.seed, args.seat_period,
+                                 args.assets)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Local mock of the BYU class-search page")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help="serve in the foreground")
+    serve.add_argument('--port', type=int, default=8000)
+    add_server_arguments(serve)
+
+    bench = sub.add_parser('bench', help="measure scraper throughput and tail latency against the mock")
+    bench.add_argument('--lookups', type=int, default=200)
+    bench.add_argument('--concurrency', type=int, default=16)
+    bench.add_argument('--per-host', type=int, default=16)
+    bench.add_argument('--selenium', type=int, default=0, metavar='N', help="also time N browser lookups")
+    bench.add_argument('--selenium-batch', type=int, default=0, metavar='N',
+                       help="also time N browser lookups in one session, as a batch runs them")
+    add_server_arguments(bench)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = server_from_args(args, args.port)
+        print(f"Mock class search on {server.base_url} (stats at /stats)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    with server_from_args(args) as server:
+        report = [bench_http(server, args.lookups, args.concurrency, args.per_host)]
+        if args.selenium:
+            report.append(bench_selenium(server, args.selenium))
+        if args.selenium_batch:
+            report.append(bench_selenium_batch(server, args.selenium_batch))
+        stats = server.stats_snapshot()
+    print(json.dumps({"server": stats, "runs": report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
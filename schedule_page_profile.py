@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Lean page-load profile for the Selenium path.
+
+The scraper only reads the search form and the results table, but a full
+page load also pulls in images, fonts, stylesheets, media and analytics
+scripts, and driver.get() waits for every one of them. LEAN_PROFILE:
+
+  - uses the "eager" page-load strategy, so navigation returns once the DOM
+    is parsed (schedule_readiness then accepts readyState "interactive");
+  - turns image loading off in the Chrome profile;
+  - blocks the remaining non-essential requests with the DevTools
+    Network.setBlockedURLs command: by file extension for fonts,
+    stylesheets and media, and by host/path pattern for well-known
+    third-party analytics and tag managers (add site-specific hosts with
+    `extra_hosts`).
+
+Page scripts from the site itself are left alone; the term <select> needs
+them. Blocking is per browser session, so it is applied once when the
+driver is created (schedule_driver_pool.create_driver) and holds for every
+page that session loads.
+
+    python benchmark_page_load.py            # full vs lean against the mock server
+"""
+import json
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif")
+FONT_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot")
+STYLESHEET_PATTERNS = ("*.css", "*.css?*")
+MEDIA_PATTERNS = ("*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.m4a")
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*newrelic.com*", "*nr-data.net*", "*siteimproveanalytics.com*", "*qualtrics.com*",
+    "*/analytics.js*", "*/gtag/js*", "*/gtm.js*",
+)
+
+
+class PageProfile(NamedTuple):
+    name: str
+    page_load_strategy: str = "normal"
+    block_images: bool = False
+    blocked_urls: Tuple[str, ...] = ()
+
+
+FULL_PROFILE = PageProfile("full")
+LEAN_PROFILE = PageProfile(
+    "lean", "eager", True,
+    IMAGE_PATTERNS + FONT_PATTERNS + STYLESHEET_PATTERNS + MEDIA_PATTERNS + THIRD_PARTY_PATTERNS,
+)
+PROFILES = {profile.name: profile for profile in (FULL_PROFILE, LEAN_PROFILE)}
+
+# Navigation timing and every resource the page fetched, in one round-trip
+PAGE_WEIGHT_JS = r"""
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource').map(function (r) {
+    return {name: r.name, type: r.initiatorType, bytes: r.transferSize || 0};
+});
+return {
+    dom_content_loaded: nav.domContentLoadedEventEnd || 0,
+    load: nav.loadEventEnd || 0,
+    document_bytes: nav.transferSize || 0,
+    resources: resources
+};
+"""
+
+
+def with_hosts(profile: PageProfile, extra_hosts: Iterable[str] = ()) -> PageProfile:
+    """`profile` also blocking every request to the given hosts"""
+    patterns = tuple(f"*://{host}/*" for host in extra_hosts)
+    return profile._replace(blocked_urls=profile.blocked_urls + patterns) if patterns else profile
+
+
+def apply_options(options, profile: Optional[PageProfile]):
+    """Set the profile's launch-time parts on Chrome Options"""
+    if profile is None:
+        return options
+    options.page_load_strategy = profile.page_load_strategy
+    if profile.block_images:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def install(driver, profile: Optional[PageProfile]):
+    """Start blocking the profile's URL patterns in this browser session"""
+    if profile is None or not profile.blocked_urls:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_urls)})
+
+
+def page_weight(driver) -> Dict:
+    """Bytes and requests the current page cost, by initiator type, from the Resource Timing API"""
+    found = driver.execute_script(PAGE_WEIGHT_JS) or {}
+    resources = found.get("resources") or []
+    by_type: Dict[str, int] = {}
+    for resource in resources:
+        by_type[resource["type"]] = by_type.get(resource["type"], 0) + resource["bytes"]
+    return {
+        "dom_content_loaded_ms": round(found.get("dom_content_loaded", 0), 1),
+        "load_ms": round(found.get("load", 0), 1),
+        "requests": 1 + len(resources),
+        "bytes": found.get("document_bytes", 0) + sum(resource["bytes"] for resource in resources),
+        "bytes_by_type": by_type,
+    }
+
+
+def network_summary(entries: Iterable[Dict]) -> Dict:
+    """
+    Requests, blocked requests and encoded bytes by resource type, from
+    Chrome performance-log entries (a session started with performance
+    logging on; see create_driver(performance_log=True)). Unlike Resource
+    Timing this also counts cross-origin bytes and blocked requests.
+    """
+    types: Dict[str, str] = {}
+    summary = {"requests": 0, "blocked": 0, "failed": 0, "bytes": 0}
+    by_type: Dict[str, int] = {}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            summary["requests"] += 1
+            types[params["requestId"]] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength", 0))
+            summary["bytes"] += size
+            kind = types.get(params["requestId"], "Other")
+            by_type[kind] = by_type.get(kind, 0) + size
+        elif method == "Network.loadingFailed":
+            summary["blocked" if params.get("blockedReason") else "failed"] += 1
+    summary["bytes_by_type"] = by_type
+    return summary
+
+
+_active: Optional[PageProfile] = None
+
+
+def get_page_profile() -> Optional[PageProfile]:
+    """The profile new browsers are started with (None: Chrome's defaults)"""
+    return _active
+
+
+def set_page_profile(profile: Optional[PageProfile]):
+    global _active
+    _active = profile
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Interchangeable HTML table parser backends.
+
+Every backend turns a class-search page into the same row model as
+SimpleTableParser.rows: one list of stripped cell strings per table row, with
+the first row and any row made only of <th> cells treated as headers and
+skipped. table() also returns the last header row, for column mapping.
+html.parser (SimpleTableParser) is the reference implementation;
+lxml and selectolax are optional C-accelerated backends used when installed.
+"""
+from typing import Dict, List, Optional, Tuple, Type
+
+from schedule_http import SimpleTableParser
+
+# Fastest first; get_backend() picks the first one that is installed
+PREFERENCE = ("selectolax", "lxml", "html.parser")
+
+
+class TableParserBackend:
+    """Base class: subclasses set `name` and implement available() and table()"""
+    name = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def table(self, html: str) -> Tuple[List[str], List[List[str]]]:
+        """(last header row, data rows)"""
+        raise NotImplementedError
+
+    def rows(self, html: str) -> List[List[str]]:
+        return self.table(html)[1]
+
+
+def _split_rows(rows) -> Tuple[List[str], List[List[str]]]:
+    """Apply SimpleTableParser's header rule to (cells, has_td) pairs"""
+    result = []
+    header: List[str] = []
+    header_seen = False
+    for cells, has_td in rows:
+        if not cells:
+            continue
+        if not header_seen or not has_td:
+            header_seen = True
+            header = cells
+        else:
+            result.append(cells)
+    return header, result
+
+
+class HtmlParserBackend(TableParserBackend):
+    name = "html.parser"
+
+    def table(self, html: str) -> Tuple[List[str], List[List[str]]]:
+        parser = SimpleTableParser()
+        parser.feed(html)
+        parser.close()
+        return parser.header, parser.rows
+
+
+class LxmlBackend(TableParserBackend):
+    name = "lxml"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import lxml.html  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def table(self, html: str) -> Tuple[List[str], List[List[str]]]:
+        import lxml.html
+        if not html.strip():
+            return [], []
+        doc = lxml.html.document_fromstring(html)
+        rows = []
+        for tr in doc.iter('tr'):
+            if next(tr.iterancestors('table'), None) is None:
+                continue
+            cells = list(tr.iterchildren('td', 'th'))
+            rows.append(([cell.text_content().strip() for cell in cells],
+                         any(cell.tag == 'td' for cell in cells)))
+        return _split_rows(rows)
+
+
+class SelectolaxBackend(TableParserBackend):
+    name = "selectolax"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import selectolax.lexbor  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def table(self, html: str) -> Tuple[List[str], List[List[str]]]:
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html)
+        rows = []
+        for tr in tree.css('table tr'):
+            cells = [node for node in tr.iter() if node.tag in ('td', 'th')]
+            rows.append(([cell.text(deep=True).strip() for cell in cells],
+                         any(cell.tag == 'td' for cell in cells)))
+        return _split_rows(rows)
+
+
+BACKENDS: Dict[str, Type[TableParserBackend]] = {
+    backend.name: backend for backend in (HtmlParserBackend, LxmlBackend, SelectolaxBackend)
+}
+
+
+def available_backends() -> List[str]:
+    return [name for name in PREFERENCE if BACKENDS[name].available()]
+
+
+def get_backend(name: Optional[str] = None) -> TableParserBackend:
+    """The named backend, or the fastest installed one for None/'auto'"""
+    if name in (None, "auto"):
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"unknown parser backend {name!r}; choose from {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]
+    if not backend.available():
+        raise ImportError(f"parser backend {name!r} is not installed")
+    return backend()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Precompiled patterns and a single-pass tokenizer for the fallback parsers.
+
+When no results table can be read, the scraper falls back to scanning text
+for schedule-looking fragments. Instead of one full-document regex pass per
+thing it looks for, tokenize() runs a single alternation over the text and
+classifies every hit as it goes:
+
+    days        MWF, TTh, M ...   (whole words built from day codes)
+    time        2:00 PM, 14:00
+    room        TMCB 121, JFSB B092   (building code + room; course codes look the same,
+                                       so callers drop the course they searched for)
+    instructor  Conner, Greg
+    hint        the instructor hint in any other form (e.g. "Greg Conner")
+    row_end     a closing </tr> in HTML input
+
+Markup is consumed by the same pass, so attribute values never produce
+tokens. scan_sections() groups the tokens that follow each instructor match
+into section candidates.
+"""
+import functools
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+DAYS = "days"
+TIME = "time"
+ROOM = "room"
+INSTRUCTOR = "instructor"
+HINT = "hint"
+ROW_END = "row_end"
+
+# Alternatives are tried in this order at each position: markup first, then the
+# most specific text shapes. "MATH 451" is a room-shaped token, never days.
+_MARKUP_PATTERNS = (
+    ("row_end", r"</tr\s*>"),
+    # A whole run of other markup is one match, so tag-heavy pages stay cheap
+    ("tag", r"(?:<(?!/tr\b)[^>]*>\s*)+"),
+)
+# Text tokens all start on a word boundary; the shared \b is checked once per
+# position, so the scan moves through the middle of words without trying each shape
+_TEXT_PATTERNS = (
+    ("time", r"\d{1,2}:\d{2}(?:\s*[AaPp]\.?[Mm]\b\.?)?"),
+    ("instructor", r"[A-Z][a-z]+(?:[-'][A-Z]?[a-z]+)*,\s*[A-Z][a-z]+\b"),
+    # Not followed by ':' so "MWF 2:00" stays days + time
+    ("room", r"[A-Z]{2,5}\s+[A-Z]?\d{1,4}[A-Z]?\b(?!:)"),
+    ("days", r"(?:Th|Tu|Sa|Su|M|T|W|F|S)+\b"),
+)
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class SectionMatch(NamedTuple):
+    instructor: str
+    days: str
+    times: List[str]
+    room: str
+    start: int
+
+    @property
+    def time(self) -> str:
+        """'2:00 PM - 2:50 PM' when both ends were found, else the one time (or '')"""
+        return " - ".join(self.times[:2])
+
+
+@functools.lru_cache(maxsize=32)
+def tokenizer(hint: str = "") -> "re.Pattern":
+    """The combined token pattern, with an extra alternative for `hint` when given"""
+    text = list(_TEXT_PATTERNS)
+    if hint:
+        # After "instructor", so "Conner, Greg" stays one instructor token
+        text.insert(2, (HINT, f"(?i:{re.escape(hint)})"))
+    alternatives = [f"(?P<{kind}>{pattern})" for kind, pattern in _MARKUP_PATTERNS]
+    alternatives.append(r"\b(?:" + "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in text) + ")")
+    return re.compile("|".join(alternatives))
+
+
+def tokenize(text: str, hint: str = "") -> Iterator[Token]:
+    """Typed tokens in document order, from one pass over `text`"""
+    for match in tokenizer(hint).finditer(text):
+        kind = match.lastgroup
+        if kind == "tag":
+            continue
+        yield Token(kind, match.group(kind), match.start(), match.end())
+
+
+def first_of(tokens: List[Token], kind: str, exclude: str = "") -> str:
+    return next((t.text for t in tokens if t.kind == kind and _squash(t.text) != exclude), "")
+
+
+def _squash(text: str) -> str:
+    return " ".join(text.split())
+
+
+def match_row(row_text: str, course: str = "") -> Dict[str, str]:
+    """First days, time and room (other than `course` itself) in one row of text"""
+    tokens = list(tokenize(row_text))
+    return {
+        "days": first_of(tokens, DAYS),
+        "time": first_of(tokens, TIME),
+        "location": first_of(tokens, ROOM, exclude=_squash(course)),
+    }
+
+
+def scan_sections(text: str, hint: str, course: str = "", window: int = 12) -> List[SectionMatch]:
+    """
+    Section candidates for the instructor named by `hint`: each instructor or
+    hint token containing it starts a candidate, which collects the days,
+    times and first room (other than `course`) among the next `window`
+    tokens, stopping early at the end of a table row or another instructor.
+    """
+    needle = hint.lower()
+    course = _squash(course)
+    sections: List[SectionMatch] = []
+    current: Optional[Dict] = None
+    seen = 0
+    for token in tokenize(text, hint):
+        if token.kind in (INSTRUCTOR, HINT):
+            if current is not None:
+                sections.append(_close(current))
+                current = None
+            if needle in token.text.lower():
+                current = {"instructor": token.text, "days": "", "times": [], "room": "", "start": token.start}
+                seen = 0
+            continue
+        if current is None:
+            continue
+        if token.kind == ROW_END or seen >= window:
+            sections.append(_close(current))
+            current = None
+            continue
+        seen += 1
+        if token.kind == DAYS and not current["days"]:
+            current["days"] = token.text
+        elif token.kind == TIME:
+            current["times"].append(_squash(token.text))
+        elif token.kind == ROOM and not current["room"] and _squash(token.text) != course:
+            current["room"] = _squash(token.text)
+    if current is not None:
+        sections.append(_close(current))
+    # Only candidates that found something schedule-like are worth reporting
+    return [s for s in sections if s.days or s.times or s.room]
+
+
+def _close(current: Dict) -> SectionMatch:
+    return SectionMatch(current["instructor"], current["days"], current["times"], current["room"], current["start"])
+
+
+# Day codes as bits, Monday first; "T"/"Tu" is Tuesday, "S"/"Sa" Saturday
+DAY_BITS = {"M": 1, "T": 2, "Tu": 2, "W": 4, "Th": 8, "F": 16, "S": 32, "Sa": 32, "Su": 64}
+_DAY_CODE_RE = re.compile(r"Th|Tu|Sa|Su|M|T|W|F|S")
+_CLOCK_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(?:([AaPp])\.?[Mm]\.?)?")
+
+
+def day_mask(days: str) -> int:
+    """'MWF' -> 0b10101; 0 when no day codes are present"""
+    mask = 0
+    for code in _DAY_CODE_RE.findall(days or ""):
+        mask |= DAY_BITS[code]
+    return mask
+
+
+def clock_minutes(text: str) -> Optional[int]:
+    """'2:00 PM' / '14:00' / '2pm' -> minutes after midnight, or None"""
+    match = _CLOCK_RE.search(text or "")
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    meridiem = (match.group(3) or "").lower()
+    if meridiem == "p" and hour < 12:
+        hour += 12
+    elif meridiem == "a" and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def split_room(location: str) -> Tuple[str, str]:
+    """'TMCB 121' -> ('TMCB', '121'); anything else is all building"""
+    parts = " ".join((location or "").split()).rsplit(" ", 1)
+    if len(parts) == 2 and any(ch.isdigit() for ch in parts[1]):
+        return parts[0], parts[1]
+    return " ".join(parts), ""
+
+
+def token_counts(text: str, hint: str = "") -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for token in tokenize(text, hint):
+        counts[token.kind] = counts.get(token.kind, 0) + 1
+    return counts
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Tokenize a saved class-search page with the fallback patterns")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--hint', default='Conner')
+    parser.add_argument('--course', default='MATH 451')
+    args = parser.parse_args()
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        start = time.perf_counter()
+        sections = scan_sections(text, args.hint, args.course)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {len(text):,} chars, {elapsed * 1000:.2f} ms, tokens {token_counts(text, args.hint)}")
+        for section in sections:
+            print(f"  {section.instructor}: {section.days} {section.time} {section.room}")
+
+
+if __name__ == '__main__':
+    main()
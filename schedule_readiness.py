@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Event-driven readiness waits for the Selenium scraper.
+
+Replaces fixed time.sleep() pauses with WebDriverWait conditions on concrete
+page signals (document ready, the term <select> repopulating, the search
+navigating away from the marked page, or for script-loaded results the
+table or "N courses found" counter changing). Each phase has its own timeout
+and the observed wait is recorded so slow phases show up in the output.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+TERM_SELECT_CSS = "select[name='yearTerm'], select[id*='year'], select[id*='term']"
+
+DEFAULT_TIMEOUTS = {
+    "page_load": 15.0,
+    "term_select": 10.0,
+    "term_reload": 1.0,
+    "term_update": 10.0,
+    "results": 15.0,
+}
+
+# One round-trip summary of the things that change when results arrive
+PAGE_STATE_JS = r"""
+var text = document.body ? (document.body.innerText || '') : '';
+var found = text.match(/(\d+)\s*courses?\s*found/i);
+return {
+    ready: document.readyState,
+    courses: found ? found[1] : null,
+    rows: document.querySelectorAll('table tr').length,
+    url: location.href,
+    marked: window.__scheduleSearchMark === true
+};
+"""
+
+# Tags the current document before a search; a navigation replaces the window
+# object, so the mark disappears even when the results page has the same URL and size
+MARK_PAGE_JS = "window.__scheduleSearchMark = true;\n" + PAGE_STATE_JS
+
+
+def page_state(driver) -> Dict:
+    return driver.execute_script(PAGE_STATE_JS) or {}
+
+
+def mark_page(driver) -> Dict:
+    """Mark the current document and return its state, for results_changed()"""
+    return driver.execute_script(MARK_PAGE_JS) or {}
+
+
+def ready_states(driver) -> tuple:
+    """readyStates that count as loaded: an "eager" session is done once the DOM is parsed"""
+    capabilities = getattr(driver, "capabilities", None) or {}
+    return ("interactive", "complete") if capabilities.get("pageLoadStrategy") == "eager" else ("complete",)
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") in ready_states(driver)
+
+
+def select_populated(css: str = TERM_SELECT_CSS, min_options: int = 2):
+    """The select matched by `css`, once it holds at least `min_options` options"""
+    def condition(driver):
+        for element in driver.find_elements(By.CSS_SELECTOR, css):
+            if len(element.find_elements(By.TAG_NAME, "option")) >= min_options:
+                return element
+        return False
+    return condition
+
+
+def results_changed(before: Dict):
+    """
+    True once a new document has loaded in place of the one marked by
+    mark_page(), or, when the results arrive by script without a navigation,
+    once the result rows, course counter or URL differ from `before`
+    """
+    def condition(driver):
+        state = page_state(driver)
+        if state.get("ready") not in ready_states(driver):
+            return False
+        if before.get("marked") and not state.get("marked"):
+            return state
+        if state.get("courses") is not None and state.get("courses") != before.get("courses"):
+            return state
+        if state.get("rows") != before.get("rows") or state.get("url") != before.get("url"):
+            return state
+        return False
+    return condition
+
+
+class Readiness:
+    """
+    Waits on page conditions phase by phase and records how long each took.
+
+    timings  -- seconds actually spent waiting, per phase
+    timeouts -- phases that hit their timeout (the scraper carries on regardless)
+    """
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None, poll: float = 0.1):
+        self.driver = driver
+        self.phase_timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.phase_timeouts.update(timeouts)
+        self.poll = poll
+        self.timings: Dict[str, float] = {}
+        self.timeouts: List[str] = []
+
+    def wait(self, phase: str, condition: Callable, timeout: Optional[float] = None):
+        """Wait for `condition`; returns its value, or None if the phase timed out"""
+        limit = timeout if timeout is not None else self.phase_timeouts.get(phase, 10.0)
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, limit, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            self.timeouts.append(phase)
+            return None
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def wait_for_term_update(self, old_select):
+        """
+        After choosing a term the page may reload and repopulate the term
+        selector. Give the reload a short window to start, then wait for the
+        selector to be populated again.
+        """
+        reloaded = self.wait("term_reload", EC.staleness_of(old_select))
+        if reloaded is None:
+            self.timeouts.remove("term_reload")
+        return self.wait("term_update", select_populated())
+
+    def summary(self) -> str:
+        parts = [f"{phase}={seconds:.2f}s" for phase, seconds in self.timings.items()]
+        if self.timeouts:
+            parts.append(f"timed out: {', '.join(self.timeouts)}")
+        return "; ".join(parts)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Merge the records the extraction passes produce into one per section.
+
+The same section can be reported by the results-table pass, the small-table
+pass and the text fallbacks (extracted_from = small_table_pattern_matching,
+pattern_matching, conner_pattern_matching), each with a different subset of
+fields. reconcile() groups them by (term, course, section) and fills every
+field from the most reliable source that has a value:
+
+    table                          1.0   full results-table row
+    small_table_pattern_matching   0.6   row text of a short table
+    pattern_matching               0.5   row text after a failed cell read
+    conner_pattern_matching        0.4   page-wide token scan
+
+Fallback records do not know their section number (their "section" is the
+course), so each is attached to the one table section of its course whose
+instructor, days and start time agree with it; when none or several do, the
+fallbacks that agree with each other become one record of their own.
+
+A field's confidence is the chance that at least one of the sources that
+agree on its value is right, 1 - prod(1 - rank), so a value confirmed by two
+passes scores higher than either alone. With provenance=True each output
+record gains {"provenance": {field: {"source", "confidence"}}}.
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from schedule_patterns import clock_minutes
+from schedule_section import FALLBACK_COLUMNS, Section
+
+TABLE_SOURCE = "table"
+SOURCE_RANKS = {
+    TABLE_SOURCE: 1.0,
+    "small_table_pattern_matching": 0.6,
+    "pattern_matching": 0.5,
+    "conner_pattern_matching": 0.4,
+}
+# Unknown extraction passes rank below every known one
+UNKNOWN_RANK = 0.3
+
+# Fields merged across sources; "time" is rebuilt from start/end when a table row is present
+MERGED_FIELDS = ("type", "mode", "instructor", "credits", "term", "days", "start_time", "end_time", "time",
+                 "location", "available", "waitlist")
+
+
+def source_of(record: Dict[str, str]) -> str:
+    return record.get("extracted_from") or TABLE_SOURCE
+
+
+def rank_of(source: str) -> float:
+    return SOURCE_RANKS.get(source, UNKNOWN_RANK)
+
+
+def course_of(record: Dict[str, str], department: str, catalog: str) -> Tuple[str, str]:
+    if not (record.get("department") or department):
+        # "MATH 451 001" from a results row, or "MATH 451" from a fallback, names the course
+        parts = record.get("section", "").split()
+        if len(parts) == (2 if source_of(record) != TABLE_SOURCE else 3):
+            return parts[0], parts[1]
+    return record.get("department") or department, record.get("catalog") or catalog
+
+
+def section_number(record: Dict[str, str], course: str) -> str:
+    """'MATH 451 001' -> '001'"""
+    section = " ".join(record.get("section", "").split())
+    if course and section.startswith(course + " "):
+        return section[len(course) + 1:]
+    return section
+
+
+def _start_minute(record: Dict[str, str]) -> Optional[int]:
+    text = record.get("start_time") or record.get("time", "").partition("-")[0]
+    return clock_minutes(text)
+
+
+def agrees(fallback: Dict[str, str], table: Dict[str, str]) -> bool:
+    """Whether a fallback record can describe this table row: nothing it found contradicts it"""
+    instructor = fallback.get("instructor", "").lower()
+    if instructor and instructor not in table.get("instructor", "").lower():
+        return False
+    if fallback.get("days") and table.get("days") and fallback["days"] != table["days"]:
+        return False
+    start, table_start = _start_minute(fallback), _start_minute(table)
+    if start is not None and table_start is not None and start != table_start:
+        return False
+    location = " ".join(fallback.get("location", "").split())
+    if location and table.get("location") and location != " ".join(table["location"].split()):
+        return False
+    return True
+
+
+def merge(records: List[Dict[str, str]], provenance: bool = False) -> Dict:
+    """One canonical record from records of the same section, best source first"""
+    ranked = sorted(records, key=lambda record: -rank_of(source_of(record)))
+    best = ranked[0]
+    merged: Dict[str, str] = {"section": best.get("section", "")}
+    origin: Dict[str, Dict] = {}
+    has_table = any(source_of(record) == TABLE_SOURCE for record in records)
+    for field in MERGED_FIELDS:
+        if field == "time" and has_table:
+            continue
+        value, source = next(((record[field], source_of(record)) for record in ranked if record.get(field)),
+                             ("", None))
+        merged[field] = value
+        if source is not None:
+            # Independent passes agreeing on a value make it more likely right
+            doubt = 1.0
+            for agreeing in {source_of(record) for record in ranked if record.get(field) == value}:
+                doubt *= 1 - rank_of(agreeing)
+            origin[field] = {"source": source, "confidence": round(1 - doubt, 3)}
+    if not has_table:
+        merged["extracted_from"] = source_of(best)
+    for tag in ("department", "catalog"):
+        value = next((record[tag] for record in ranked if record.get(tag)), None)
+        if value is not None:
+            merged[tag] = value
+    section = Section(**merged).to_record()
+    if has_table and "start_time" in origin and "end_time" in origin:
+        # "time" is derived from the merged start/end, so it is as sure as the weaker of the two
+        origin["time"] = min(origin["start_time"], origin["end_time"], key=lambda o: o["confidence"])
+    if provenance:
+        keys = section.keys() if has_table else FALLBACK_COLUMNS
+        section["provenance"] = {field: origin[field] for field in keys if field in origin}
+    return section
+
+
+def reconcile(results: Iterable[Dict[str, str]], term: str = "", department: str = "", catalog: str = "",
+              provenance: bool = False) -> List[Dict]:
+    """
+    One record per (term, course, section), in first-seen order. `term`,
+    `department` and `catalog` stand in for records that do not carry them
+    (single-course runs leave department/catalog off the records).
+    """
+    groups: Dict[Tuple[str, str, str, str], List[Dict[str, str]]] = {}
+    # (department, catalog) -> keys of that course's numbered sections
+    courses: Dict[Tuple[str, str], List[Tuple[str, str, str, str]]] = {}
+    fallbacks: List[Tuple[Tuple[str, str, str], Dict[str, str]]] = []
+    for record in results:
+        record_department, record_catalog = course_of(record, department, catalog)
+        course = f"{record_department} {record_catalog}".strip()
+        record_term = record.get("term") or term
+        if source_of(record) != TABLE_SOURCE:
+            fallbacks.append(((record_term, record_department, record_catalog), record))
+            continue
+        number = section_number(record, course)
+        key = (record_term, record_department, record_catalog, number)
+        if key not in groups:
+            groups[key] = []
+            courses.setdefault(key[1:3], []).append(key)
+        groups[key].append(record)
+
+    # Each fallback joins the one table section it agrees with, or a group of like fallbacks
+    for course, record in fallbacks:
+        # Text fallbacks rarely see the term; a missing one matches any
+        matches = [key for key in courses.get(course[1:], ()) if not course[0] or key[0] == course[0]
+                   if any(source_of(member) == TABLE_SOURCE and agrees(record, member) for member in groups[key])]
+        if len(matches) == 1:
+            groups[matches[0]].append(record)
+            continue
+        signature = "|".join((record.get("instructor", "").lower(), record.get("days", ""),
+                              str(_start_minute(record)), " ".join(record.get("location", "").split())))
+        groups.setdefault(course + ("?" + signature,), []).append(record)
+
+    return [merge(members, provenance) for members in groups.values()]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Deduplicate scraper results into one record per section")
+    parser.add_argument('files', nargs='+', help="scraper output files ({\"results\": [...]}) or record lists")
+    parser.add_argument('--term', default='', help="for records that do not name their term")
+    parser.add_argument('--department', default='', help="for records without batch department/catalog tags")
+    parser.add_argument('--catalog', default='')
+    parser.add_argument('--provenance', action='store_true', help="add per-field source and confidence")
+    args = parser.parse_args()
+
+    from schedule_store import load_results
+    records = []
+    for path in args.files:
+        records.extend(load_results(path))
+    merged = reconcile(records, args.term, args.department, args.catalog, args.provenance)
+    print(json.dumps({"ok": bool(merged), "input": len(records), "count": len(merged), "results": merged}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
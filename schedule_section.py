@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compact record type for scraped sections.
+
+The scrapers build each result as a fresh 13-key dict whose "time" value is
+derived from start_time and end_time. A Section holds the same fields in
+__slots__ (no per-instance dict), derives "time" on demand, and interns the
+values that repeat across a term (type, mode, credits, term, days, times,
+location, instructor, department, catalog), so a full-term snapshot keeps
+one copy of "Winter 2026" or "TMCB 121" instead of one per row.
+
+to_record() gives back exactly the JSON shape the scrapers emit: the full
+table record, the short pattern-matching shape (section, instructor, days,
+time, location, extracted_from), and the department/catalog tags added in
+batch mode only when they were present.
+"""
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from schedule_columns import POSITIONAL, RESULT_COLUMNS, ColumnMap
+
+# Keys of the records the text fallbacks produce
+FALLBACK_COLUMNS = ("section", "instructor", "days", "time", "location", "extracted_from")
+# Keys of a result record that Section keeps (its constructor arguments)
+RECORD_FIELDS = frozenset(RESULT_COLUMNS + ("time", "extracted_from", "department", "catalog"))
+
+
+def _intern(value) -> str:
+    return sys.intern(value) if isinstance(value, str) else ""
+
+
+class Section:
+    __slots__ = RESULT_COLUMNS + ("_time", "extracted_from", "department", "catalog")
+
+    def __init__(self, section: str = "", type: str = "", mode: str = "", instructor: str = "",
+                 credits: str = "", term: str = "", days: str = "", start_time: str = "", end_time: str = "",
+                 location: str = "", available: str = "", waitlist: str = "", time: Optional[str] = None,
+                 extracted_from: Optional[str] = None, department: Optional[str] = None,
+                 catalog: Optional[str] = None):
+        self.section = section
+        self.type = _intern(type)
+        self.mode = _intern(mode)
+        self.instructor = _intern(instructor)
+        self.credits = _intern(credits)
+        self.term = _intern(term)
+        self.days = _intern(days)
+        self.start_time = _intern(start_time)
+        self.end_time = _intern(end_time)
+        self.location = _intern(location)
+        self.available = available
+        self.waitlist = waitlist
+        # Only kept when it is not simply "start - end" (fallback records, combined time columns)
+        self._time = _intern(time) if time is not None and time != f"{start_time} - {end_time}" else None
+        self.extracted_from = _intern(extracted_from) if extracted_from is not None else None
+        self.department = _intern(department) if department is not None else None
+        self.catalog = _intern(catalog) if catalog is not None else None
+
+    @property
+    def time(self) -> str:
+        if self._time is not None:
+            return self._time
+        return f"{self.start_time} - {self.end_time}"
+
+    @classmethod
+    def from_record(cls, record: Dict[str, str]) -> "Section":
+        """
+        A Section from either record shape the scrapers produce; keys it does
+        not model (the "provenance" block of --provenance output) are dropped
+        """
+        return cls(**{key: value for key, value in record.items() if key in RECORD_FIELDS})
+
+    @classmethod
+    def from_row(cls, row: Sequence[str], columns: ColumnMap = POSITIONAL) -> "Section":
+        return cls(**columns.project(row))
+
+    def to_record(self) -> Dict[str, str]:
+        """The dict the scrapers would have emitted for this section"""
+        if self.extracted_from is not None:
+            record = {column: getattr(self, column) for column in FALLBACK_COLUMNS}
+        else:
+            record = {}
+            for column in RESULT_COLUMNS:
+                record[column] = getattr(self, column)
+                if column == "end_time":
+                    record["time"] = self.time
+        if self.department is not None:
+            record["department"] = self.department
+        if self.catalog is not None:
+            record["catalog"] = self.catalog
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, Section):
+            return NotImplemented
+        return self.to_record() == other.to_record()
+
+    def __repr__(self):
+        return f"Section({self.to_record()!r})"
+
+
+def sections_from_records(records: Iterable[Dict[str, str]]) -> List[Section]:
+    return [Section(**record) for record in records]
+
+
+def records_from_sections(sections: Iterable[Section]) -> List[Dict[str, str]]:
+    return [section.to_record() for section in sections]
+
+
+def json_default(value):
+    """json.dump(..., default=json_default) writes Sections in the usual record shape"""
+    if isinstance(value, Section):
+        return value.to_record()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Form-field discovery in one WebDriver call, cached per form layout.
+
+Finding the term select, department and catalog inputs and the Search
+button used to cost a get_attribute round-trip per attribute per <input>,
+plus XPath scans when that failed. probe_form() instead runs one script that
+returns every form control's attributes, label text and a CSS selector,
+together with the elements themselves. The controls' structure (tag, type,
+name, id, placeholder) is hashed into a fingerprint; SelectorCache remembers
+which control plays which role for each fingerprint, in
+<cache dir>/selectors.json. Later runs on an unchanged page resolve all four
+roles from that one call; a changed layout gets a new fingerprint and is
+classified afresh.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from schedule_cache import DEFAULT_CACHE_DIR
+
+ROLES = ("term_select", "dept_field", "catalog_field", "search_button")
+SELECTORS_FILE = "selectors.json"
+
+# Every form control with what the classifier needs, plus the elements in the same order
+PROBE_FORM_JS = r"""
+function cssFor(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.id) return '#' + CSS.escape(el.id);
+    if (el.name) {
+        var byName = tag + '[name="' + el.name.replace(/"/g, '\\"') + '"]';
+        if (document.querySelectorAll(byName).length === 1) return byName;
+    }
+    var path = [];
+    for (var node = el; node && node.nodeType === 1 && node !== document.body; node = node.parentElement) {
+        var index = 1;
+        for (var sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+            if (sib.tagName === node.tagName) index++;
+        }
+        path.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+    }
+    return 'body > ' + path.join(' > ');
+}
+function labelFor(el) {
+    if (el.labels && el.labels.length) return (el.labels[0].textContent || '').trim();
+    var prev = el.previousElementSibling;
+    if (prev && !/^(INPUT|SELECT|BUTTON)$/.test(prev.tagName)) return (prev.textContent || '').trim().slice(0, 80);
+    return '';
+}
+var elements = Array.prototype.slice.call(document.querySelectorAll('input, select, button'));
+var controls = elements.map(function (el) {
+    var type = (el.getAttribute('type') || (el.tagName === 'BUTTON' ? 'submit' : '')).toLowerCase();
+    return {
+        tag: el.tagName.toLowerCase(),
+        type: type,
+        name: el.getAttribute('name') || '',
+        id: el.id || '',
+        placeholder: el.getAttribute('placeholder') || '',
+        value: /^(submit|button|image)$/.test(type) ? (el.value || el.textContent || '').trim() : '',
+        label: labelFor(el),
+        options: el.tagName === 'SELECT'
+            ? Array.prototype.slice.call(el.options, 0, 50).map(function (o) { return o.text; }) : null,
+        css: cssFor(el)
+    };
+});
+return {controls: controls, elements: elements};
+"""
+
+_TERM_RE = re.compile(r"year|term", re.I)
+_TERM_OPTION_RE = re.compile(r"\b(?:Winter|Spring|Summer|Fall)\s+\d{4}\b")
+_DEPT_RE = re.compile(r"dept|department|subject", re.I)
+_CATALOG_RE = re.compile(r"catalog|course|number", re.I)
+_BUTTON_RE = re.compile(r"search|submit", re.I)
+_TEXT_TYPES = ("", "text", "search")
+
+
+class FormProbe(NamedTuple):
+    controls: List[Dict]
+    elements: List
+    fingerprint: str
+
+
+class FormFields(NamedTuple):
+    """The located controls (WebElements or None) and whether they came from the cache"""
+    term_select: Optional[object]
+    dept_field: Optional[object]
+    catalog_field: Optional[object]
+    search_button: Optional[object]
+    cached: bool = False
+
+
+def fingerprint(controls: List[Dict]) -> str:
+    """Hash of the form's structure; values, labels and option lists do not affect it"""
+    shape = [[c["tag"], c["type"], c["name"], c["id"], c["placeholder"]] for c in controls]
+    return hashlib.sha1(json.dumps(shape).encode()).hexdigest()[:16]
+
+
+def probe_form(driver) -> FormProbe:
+    """Every form control on the page, from a single execute_script call"""
+    found = driver.execute_script(PROBE_FORM_JS) or {}
+    controls, elements = found.get("controls") or [], found.get("elements") or []
+    return FormProbe(controls, elements, fingerprint(controls))
+
+
+def classify(controls: List[Dict]) -> Dict[str, int]:
+    """Control index per role, by the scraper's name/id/placeholder/label heuristics"""
+    roles: Dict[str, int] = {}
+    for index, control in enumerate(controls):
+        names = " ".join((control["name"], control["id"]))
+        hints = " ".join((control["placeholder"], control["label"]))
+        if control["tag"] == "select":
+            if "term_select" not in roles and (_TERM_RE.search(names) or any(
+                    _TERM_OPTION_RE.search(text or "") for text in control["options"] or ())):
+                roles["term_select"] = index
+        elif control["type"] in ("submit", "image") or (control["type"] == "button" and control["value"]):
+            if "search_button" not in roles and (control["type"] == "submit" or _BUTTON_RE.search(control["value"])):
+                roles["search_button"] = index
+        elif control["tag"] == "input" and control["type"] in _TEXT_TYPES:
+            if "dept_field" not in roles and (_DEPT_RE.search(names) or _DEPT_RE.search(hints)):
+                roles["dept_field"] = index
+            elif "catalog_field" not in roles and (_CATALOG_RE.search(names) or _CATALOG_RE.search(hints)):
+                roles["catalog_field"] = index
+    return roles
+
+
+class SelectorCache:
+    """
+    fingerprint -> {role: {"index": control index, "css": selector}}, kept in
+    memory and, with a `directory`, in <directory>/selectors.json
+    """
+    def __init__(self, directory: Optional[str] = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+        if directory:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, SELECTORS_FILE)
+
+    def lookup(self, probe: FormProbe) -> Optional[Dict[str, int]]:
+        entry = self.entries.get(probe.fingerprint)
+        if entry is None or any(role["index"] >= len(probe.controls) for role in entry.values()):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return {name: role["index"] for name, role in entry.items()}
+
+    def remember(self, probe: FormProbe, roles: Dict[str, int]):
+        self.entries[probe.fingerprint] = {
+            name: {"index": index, "css": probe.controls[index]["css"]} for name, index in roles.items()
+        }
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def discover_form(driver, cache: Optional[SelectorCache] = None) -> Tuple[FormProbe, FormFields]:
+    """
+    Locate the four form roles with one WebDriver call: from the cache when
+    this layout has been seen, else by classify(). Roles that cannot be
+    found are None; resolve them some other way and report back with
+    remember_fields().
+    """
+    probe = probe_form(driver)
+    roles = cache.lookup(probe) if cache is not None else None
+    cached = roles is not None
+    if roles is None:
+        roles = classify(probe.controls)
+        if cache is not None and all(role in roles for role in ROLES[1:]):
+            cache.remember(probe, roles)
+    fields = [probe.elements[roles[role]] if role in roles else None for role in ROLES]
+    return probe, FormFields(*fields, cached=cached)
+
+
+def index_of(probe: FormProbe, element) -> Optional[int]:
+    """Position of `element` among the probed controls (WebElement equality is local, no round-trip)"""
+    return next((i for i, probed in enumerate(probe.elements) if probed == element), None)
+
+
+def control_of(probe: FormProbe, element) -> Optional[Dict]:
+    """The probed attributes of `element`, or None"""
+    index = index_of(probe, element)
+    return probe.controls[index] if index is not None else None
+
+
+def remember_fields(cache: Optional[SelectorCache], probe: FormProbe, fields: FormFields):
+    """Cache roles found by the slow fallbacks, matched back to the probed elements"""
+    if cache is None:
+        return
+    roles: Dict[str, int] = {}
+    for role, element in zip(ROLES, fields):
+        if element is None:
+            continue
+        index = index_of(probe, element)
+        if index is not None:
+            roles[role] = index
+    if all(role in roles for role in ROLES[1:]):
+        cache.remember(probe, roles)
+
+
+_active: Optional[SelectorCache] = None
+
+
+def get_selector_cache() -> SelectorCache:
+    """The process-wide cache (under the default cache directory unless set_selector_cache() chose another)"""
+    global _active
+    if _active is None:
+        _active = SelectorCache()
+    return _active
+
+
+def set_selector_cache(cache: Optional[SelectorCache]):
+    global _active
+    _active = cache
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite store for scraped sections.
+
+Every scrape can be upserted into one local database, keyed by (term,
+department, catalog, section), so later questions are index lookups instead
+of new browser runs:
+
+    python schedule_store.py import byu_math451_winter2026_schedule.json --department MATH --catalog 451
+    python schedule_store.py query --instructor Conner
+    python schedule_store.py query --room "TMCB 121" --days MWF --at "2:00 PM"
+
+Meeting times are also stored as minutes after midnight and days as a
+bitmask (see schedule_patterns.clock_minutes / day_mask), and locations are
+split into building and room. Indexes cover instructor (case-insensitive
+prefix, i.e. last name), start time, building + room, and department +
+catalog for lookups without a term; the day filter is a bitmask test on the
+rows those indexes narrow down. Records come back in the scrapers' JSON
+shape with department and catalog added.
+
+Fallback records (pattern-matched from page text) carry the course name,
+not a section number, as their section; they are keyed as
+"MATH 451 [MWF 2:00 PM TMCB 121]" so each meeting keeps its own row.
+"""
+import json
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from schedule_patterns import clock_minutes, day_mask, split_room
+from schedule_section import Section
+
+DEFAULT_STORE_PATH = "schedule.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    term TEXT NOT NULL,
+    department TEXT NOT NULL,
+    catalog TEXT NOT NULL,
+    section TEXT NOT NULL,
+    type TEXT NOT NULL DEFAULT '',
+    mode TEXT NOT NULL DEFAULT '',
+    instructor TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    credits TEXT NOT NULL DEFAULT '',
+    days TEXT NOT NULL DEFAULT '',
+    day_mask INTEGER NOT NULL DEFAULT 0,
+    start_time TEXT NOT NULL DEFAULT '',
+    end_time TEXT NOT NULL DEFAULT '',
+    time TEXT,
+    start_minute INTEGER,
+    end_minute INTEGER,
+    location TEXT NOT NULL DEFAULT '',
+    building TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    room TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    available TEXT NOT NULL DEFAULT '',
+    waitlist TEXT NOT NULL DEFAULT '',
+    extracted_from TEXT,
+    scraped_at REAL NOT NULL,
+    PRIMARY KEY (term, department, catalog, section)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sections_instructor ON sections (instructor);
+CREATE INDEX IF NOT EXISTS sections_start ON sections (start_minute);
+CREATE INDEX IF NOT EXISTS sections_room ON sections (building, room);
+CREATE INDEX IF NOT EXISTS sections_course ON sections (department, catalog);
+"""
+
+COLUMNS = (
+    "term", "department", "catalog", "section", "type", "mode", "instructor", "credits", "days", "day_mask",
+    "start_time", "end_time", "time", "start_minute", "end_minute", "location", "building", "room",
+    "available", "waitlist", "extracted_from", "scraped_at",
+)
+KEY = ("term", "department", "catalog", "section")
+# A full table record's keys, in the scrapers' order
+RECORD_COLUMNS = (
+    "section", "type", "mode", "instructor", "credits", "term", "days", "start_time", "end_time", "time",
+    "location", "available", "waitlist",
+)
+
+UPSERT = (
+    f"INSERT INTO sections ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+    f"ON CONFLICT ({', '.join(KEY)}) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS if column not in KEY)
+)
+
+
+def fallback_key(section: str, days: str, start_time: str, location: str) -> str:
+    """Stored section of a fallback record: its section text plus what tells its meetings apart"""
+    meeting = " ".join(" ".join(part.split()) for part in (days, start_time, location) if part.strip())
+    return f"{' '.join(section.split())} [{meeting}]"
+
+
+class SectionStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, results: Iterable[Dict[str, str]], term: str = "", department: str = "",
+               catalog: str = "") -> int:
+        """
+        Insert or update scraper result records in one transaction; term,
+        department and catalog fill in what a record does not carry itself.
+        Returns the number of records written.
+        """
+        now = time.time()
+        rows = []
+        for result in results:
+            record = result.to_record() if isinstance(result, Section) else result
+            rows.append(self._row(record, term, department, catalog, now))
+        with self.db:
+            self.db.executemany(UPSERT, rows)
+        return len(rows)
+
+    @staticmethod
+    def _row(record: Dict[str, str], term: str, department: str, catalog: str, now: float) -> tuple:
+        start_time, end_time = record.get("start_time", ""), record.get("end_time", "")
+        time_text = record.get("time") or ""
+        if not start_time and time_text:
+            # Fallback records only carry "time"; take what they have
+            start_time, _, end_time = (part.strip() for part in time_text.partition("-"))
+        building, room = split_room(record.get("location", ""))
+        section = record.get("section", "")
+        if record.get("extracted_from"):
+            section = fallback_key(section, record.get("days", ""), start_time, record.get("location", ""))
+        values = {
+            "term": record.get("term") or term,
+            "department": record.get("department") or department,
+            "catalog": record.get("catalog") or catalog,
+            "section": section,
+            "type": record.get("type", ""),
+            "mode": record.get("mode", ""),
+            "instructor": record.get("instructor", ""),
+            "credits": record.get("credits", ""),
+            "days": record.get("days", ""),
+            "day_mask": day_mask(record.get("days", "")),
+            "start_time": start_time,
+            "end_time": end_time,
+            "time": time_text or None,
+            "start_minute": clock_minutes(start_time),
+            "end_minute": clock_minutes(end_time),
+            "location": record.get("location", ""),
+            "building": building,
+            "room": room,
+            "available": record.get("available", ""),
+            "waitlist": record.get("waitlist", ""),
+            "extracted_from": record.get("extracted_from"),
+            "scraped_at": now,
+        }
+        return tuple(values[column] for column in COLUMNS)
+
+    def find(self, term: Optional[str] = None, department: Optional[str] = None, catalog: Optional[str] = None,
+             instructor: Optional[str] = None, days: Optional[str] = None, at: Optional[str] = None,
+             location: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Sections matching every given filter:
+        instructor -- name prefix, case-insensitive ("Conner" or "Conner, Greg")
+        days       -- sections meeting on any of these days ("MWF")
+        at         -- sections in session at this clock time ("2:00 PM")
+        location   -- "TMCB 121", or just a building ("TMCB")
+        """
+        where, params = self._where(term, department, catalog, instructor, days, at, location)
+        sql = "SELECT * FROM sections"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY term, department, catalog, section"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [self._record(row) for row in self.db.execute(sql, params)]
+
+    @staticmethod
+    def _where(term, department, catalog, instructor, days, at, location):
+        where: List[str] = []
+        params: List = []
+        for column, value in (("term", term), ("department", department), ("catalog", catalog)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if instructor:
+            # A prefix LIKE on a NOCASE column is answered from the instructor index
+            where.append("instructor LIKE ? ESCAPE '\\'")
+            params.append(instructor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if location:
+            building, room = split_room(location)
+            where.append("building = ?")
+            params.append(building)
+            if room:
+                where.append("room = ?")
+                params.append(room)
+        if days:
+            mask = day_mask(days)
+            if not mask:
+                raise ValueError(f"no day codes in {days!r}")
+            where.append("(day_mask & ?) != 0")
+            params.append(mask)
+        if at:
+            minute = clock_minutes(at)
+            if minute is None:
+                raise ValueError(f"not a clock time: {at!r}")
+            where.append("start_minute <= ? AND end_minute > ?")
+            params.extend((minute, minute))
+        return where, params
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> Dict[str, str]:
+        if row["extracted_from"] is not None:
+            record = {column: row[column] for column in ("section", "instructor", "days", "time", "location",
+                                                         "extracted_from")}
+            record["section"] = record["section"].partition(" [")[0]
+        else:
+            record = {column: row[column] for column in RECORD_COLUMNS}
+            if record["time"] is None:
+                record["time"] = f"{row['start_time']} - {row['end_time']}"
+        record["department"] = row["department"]
+        record["catalog"] = row["catalog"]
+        return record
+
+    def explain(self, **filters) -> List[str]:
+        """SQLite's query plan for find(**filters), to check which index is used"""
+        where, params = self._where(*(filters.get(name) for name in (
+            "term", "department", "catalog", "instructor", "days", "at", "location")))
+        sql = "EXPLAIN QUERY PLAN SELECT * FROM sections"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return [row["detail"] for row in self.db.execute(sql, params)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sections": self.db.execute("SELECT COUNT(*) FROM sections").fetchone()[0],
+            "courses": self.db.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT term, department, catalog FROM sections)").fetchone()[0],
+            "terms": self.db.execute("SELECT COUNT(DISTINCT term) FROM sections").fetchone()[0],
+        }
+
+
+def load_results(path: str) -> List[Dict[str, str]]:
+    """Result records from a scraper output file ({"results": [...]}) or a bare list"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get("results", []) if isinstance(data, dict) else data
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Store and query scraped sections in a local SQLite database")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    load = sub.add_parser('import', help="upsert the results of scraper output files")
+    load.add_argument('files', nargs='+')
+    load.add_argument('--term', default='', help="for records that do not name their term")
+    load.add_argument('--department', default='', help="for records without batch department/catalog tags")
+    load.add_argument('--catalog', default='')
+    query = sub.add_parser('query', help="print matching sections as JSON")
+    query.add_argument('--term')
+    query.add_argument('--course', help="'DEPT NUMBER'")
+    query.add_argument('--instructor', help="name prefix, e.g. a last name")
+    query.add_argument('--days', help="meeting on any of these days, e.g. MWF")
+    query.add_argument('--at', help="in session at this time, e.g. '2:00 PM'")
+    query.add_argument('--room', help="'TMCB 121' or a building code")
+    query.add_argument('--limit', type=int)
+    query.add_argument('--explain', action='store_true', help="show the query plan and timing instead")
+    sub.add_parser('stats', help="row counts")
+    args = parser.parse_args()
+
+    with SectionStore(args.db) as store:
+        if args.command == 'import':
+            for path in args.files:
+                count = store.upsert(load_results(path), args.term, args.department, args.catalog)
+                print(f"{path}: {count} sections")
+        elif args.command == 'query':
+            department, catalog = (args.course.split() + [None])[:2] if args.course else (None, None)
+            filters = dict(term=args.term, department=department, catalog=catalog, instructor=args.instructor,
+                           days=args.days, at=args.at, location=args.room)
+            start = time.perf_counter()
+            results = store.find(limit=args.limit, **filters)
+            elapsed = time.perf_counter() - start
+            if args.explain:
+                for line in store.explain(**filters):
+                    print(line)
+                print(f"{len(results)} sections in {elapsed * 1000:.2f} ms")
+            else:
+                print(json.dumps(results, indent=2))
+        else:
+            print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Span-based timing for the scraper phases.
+
+A Tracer records nested spans (driver setup, page load, term selection,
+field discovery, search, extraction, HTTP lookups) with their durations and
+the counters accumulated while they were open: WebDriver commands sent and
+bytes read from the network. The trace is written in Chrome trace-event
+format (load it in chrome://tracing or Perfetto); its otherData block holds
+a per-phase summary so two runs can be compared with
+
+    python schedule_trace.py diff old.trace.json new.trace.json
+
+Nothing is recorded unless a Tracer has been activated; the default tracer's
+spans and counters are no-ops.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class Span:
+    def __init__(self, name: str, start: float, tid: int, attrs: Dict):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.tid = tid
+        self.attrs = attrs
+        self.counters: Dict[str, int] = {}
+
+
+class CountingResponse:
+    """Wraps a urllib response and reports every block read from it"""
+    def __init__(self, resp, on_bytes):
+        self._resp = resp
+        self._on_bytes = on_bytes
+
+    def read(self, *args):
+        block = self._resp.read(*args)
+        self._on_bytes(len(block))
+        return block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._resp.close()
+
+    def __getattr__(self, name):
+        return getattr(self._resp, name)
+
+
+class Tracer:
+    enabled = True
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.totals: Dict[str, int] = {}
+        self.commands: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the enclosed block; counters recorded inside it are attributed to it and its parents"""
+        span = Span(name, time.perf_counter() - self.origin, threading.get_ident(), attrs)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - self.origin - span.start
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+
+    def count(self, name: str, amount: int = 1):
+        stack = self._stack()
+        with self._lock:
+            # Worker threads running bind()-ed calls count into the caller's spans too
+            for span in stack:
+                span.counters[name] = span.counters.get(name, 0) + amount
+            self.totals[name] = self.totals.get(name, 0) + amount
+
+    def bind(self, func: Callable) -> Callable:
+        """
+        `func` to run on another thread with the caller's open spans, so the
+        counters it records (bytes, requests) are attributed to them
+        """
+        spans = list(self._stack())
+
+        def bound(*args, **kwargs):
+            previous = getattr(self._local, 'stack', None)
+            self._local.stack = list(spans)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.stack = previous
+        return bound
+
+    @contextmanager
+    def watch_driver(self, driver):
+        """Count every WebDriver command (element calls included) sent while the block runs"""
+        execute = driver.execute
+
+        def counted_execute(command, params=None):
+            self.count("webdriver_calls")
+            with self._lock:
+                self.commands[command] = self.commands.get(command, 0) + 1
+            return execute(command, params)
+
+        driver.execute = counted_execute
+        try:
+            yield driver
+        finally:
+            # Pooled drivers outlive the trace; drop the instance override
+            del driver.execute
+
+    def attach(self, client):
+        """Count the bytes a ClassSearchClient reads from the network (cache hits read none)"""
+        opener_open = client.opener.open
+
+        def counted_open(*args, **kwargs):
+            self.count("http_requests")
+            return CountingResponse(opener_open(*args, **kwargs), lambda n: self.count("bytes_fetched", n))
+
+        client.opener.open = counted_open
+        return client
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per span name: how often it ran, total seconds and the counters recorded inside it"""
+        phases: Dict[str, Dict] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in sorted(spans, key=lambda s: s.start):
+            phase = phases.setdefault(span.name, {"count": 0, "seconds": 0.0})
+            phase["count"] += 1
+            phase["seconds"] = round(phase["seconds"] + span.duration, 6)
+            for name, value in span.counters.items():
+                phase[name] = phase.get(name, 0) + value
+        return phases
+
+    def chrome_trace(self) -> Dict:
+        events = []
+        threads: Dict[int, int] = {}
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        for span in spans:
+            tid = threads.setdefault(span.tid, len(threads) + 1)
+            events.append({
+                "name": span.name,
+                "cat": "scraper",
+                "ph": "X",
+                "ts": round(span.start * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {**span.attrs, **span.counters},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "started_at": self.started_at,
+                "totals": dict(self.totals),
+                "webdriver_commands": dict(self.commands),
+                "phases": self.summary(),
+            },
+        }
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, indent=2)
+
+
+class NullTracer(Tracer):
+    """The inactive default: every hook is a no-op"""
+    enabled = False
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        yield None
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def bind(self, func: Callable) -> Callable:
+        return func
+
+    @contextmanager
+    def watch_driver(self, driver):
+        yield driver
+
+    def attach(self, client):
+        return client
+
+
+_active: Tracer = NullTracer()
+
+
+def get_tracer() -> Tracer:
+    return _active
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Tracer:
+    """Make `tracer` the process-wide tracer (None deactivates tracing); returns the previous one"""
+    global _active
+    previous = _active
+    _active = tracer if tracer is not None else NullTracer()
+    return previous
+
+
+def span(name: str, **attrs):
+    return _active.span(name, **attrs)
+
+
+def trace_path_for(out_path: str) -> str:
+    """'schedule.json' -> 'schedule.trace.json', written next to the results"""
+    root, _ = os.path.splitext(out_path)
+    return root + ".trace.json"
+
+
+def load_phases(path: str) -> Dict[str, Dict]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get("otherData", {}).get("phases", {})
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect scraper traces")
+    sub = parser.add_subparsers(dest='command', required=True)
+    show = sub.add_parser('show', help="per-phase summary of one trace")
+    show.add_argument('trace')
+    diff = sub.add_parser('diff', help="per-phase change between two traces")
+    diff.add_argument('old')
+    diff.add_argument('new')
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        print(f"{'phase':<18} {'count':>5} {'seconds':>9} {'webdriver':>9} {'bytes':>10}")
+        for name, phase in load_phases(args.trace).items():
+            print(f"{name:<18} {phase['count']:>5} {phase['seconds']:>9.3f} "
+                  f"{phase.get('webdriver_calls', 0):>9} {phase.get('bytes_fetched', 0):>10}")
+        return
+
+    old, new = load_phases(args.old), load_phases(args.new)
+    print(f"{'phase':<18} {'old s':>9} {'new s':>9} {'change':>8} {'old calls':>9} {'new calls':>9}")
+    for name in list(old) + [name for name in new if name not in old]:
+        before, after = old.get(name, {}), new.get(name, {})
+        old_s, new_s = before.get('seconds', 0.0), after.get('seconds', 0.0)
+        change = f"{(new_s - old_s) / old_s * 100:+.0f}%" if old_s else "new"
+        print(f"{name:<18} {old_s:>9.3f} {new_s:>9.3f} {change:>8} "
+              f"{before.get('webdriver_calls', 0):>9} {after.get('webdriver_calls', 0):>9}")
+
+
+if __name__ == '__main__':
+    main()
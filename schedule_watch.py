@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Watch open seats for a set of courses during registration.
+
+One ClassSearchClient is kept for the whole run (cookies and the parsed
+search form stay warm; no browser is started), and each poll re-submits the
+search with the ETag / Last-Modified validators of the previous response, so
+an unchanged page costs a 304 and no parsing. Only differences are written
+to a JSONL log, one event per section:
+
+    {"at": "...", "event": "changed", "course": "MATH 451", "section": "001",
+     "instructor": "Conner, Greg", "available": "3/35", "waitlist": "0",
+     "previous": {"available": "4/35"}}
+
+("added" and "removed" events carry no "previous"). On restart the last known
+state is rebuilt from the log, so resuming does not repeat old events.
+
+The poll interval relaxes by --backoff after every poll that finds nothing
+new, up to --max-interval, and drops back to --interval when something
+changes. Inside a registration window (--window START/END, ISO local times),
+or within --lead seconds before one, it polls every --min-interval, and a
+relaxed interval never sleeps past the start of the next window's lead.
+
+    python schedule_watch.py --query "MATH 451" --section 001 --window 2026-11-02T07:00/2026-11-02T10:00
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.error import HTTPError, URLError
+
+from schedule_batch import CourseQuery
+from schedule_http import (BYU_CLASS_SEARCH_URL, DEFAULT_TERM, ClassSearchClient, RowStream, iter_text_chunks,
+                           open_url, section_matches)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_LOG_PATH = "seat_watch.jsonl"
+WATCHED_FIELDS = ("available", "waitlist")
+
+
+class RegistrationWindow(NamedTuple):
+    start: datetime
+    end: datetime
+
+
+def parse_window(text: str) -> RegistrationWindow:
+    """'2026-11-02T07:00/2026-11-02T10:00' -> RegistrationWindow"""
+    start, sep, end = text.partition('/')
+    if not sep:
+        raise ValueError(f"registration window must be START/END, got {text!r}")
+    window = RegistrationWindow(datetime.fromisoformat(start.strip()), datetime.fromisoformat(end.strip()))
+    if window.end <= window.start:
+        raise ValueError(f"registration window ends before it starts: {text!r}")
+    return window
+
+
+class PollSchedule:
+    """
+    interval     -- seconds between polls after a change
+    minimum      -- seconds between polls inside a registration window
+    maximum      -- longest interval reached by backing off
+    backoff      -- factor the interval grows by after each unchanged poll
+    windows      -- RegistrationWindows
+    lead         -- seconds before a window starts that count as inside it
+    """
+    def __init__(self, interval: float = 60, minimum: float = 10, maximum: float = 900, backoff: float = 1.5,
+                 windows: Sequence[RegistrationWindow] = (), lead: float = 900):
+        self.interval = interval
+        self.minimum = min(minimum, interval)
+        self.maximum = max(maximum, interval)
+        self.backoff = backoff
+        self.windows = sorted(windows)
+        self.lead = lead
+        self.current = interval
+
+    def in_window(self, now: datetime) -> bool:
+        return any((window.start - now).total_seconds() <= self.lead and now < window.end
+                   for window in self.windows)
+
+    def seconds_to_next_window(self, now: datetime) -> Optional[float]:
+        """Seconds until the next window's lead time begins, or None"""
+        upcoming = [(window.start - now).total_seconds() - self.lead for window in self.windows
+                    if window.start > now]
+        upcoming = [seconds for seconds in upcoming if seconds > 0]
+        return min(upcoming) if upcoming else None
+
+    def next_interval(self, changed: bool, failed: bool = False, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now()
+        if self.in_window(now):
+            self.current = self.minimum
+            return self.current
+        if changed:
+            self.current = self.interval
+        else:
+            # A failed poll backs off twice as hard as a quiet one
+            self.current = min(self.maximum, self.current * (self.backoff ** (2 if failed else 1)))
+        wait = self.current
+        until_window = self.seconds_to_next_window(now)
+        if until_window is not None:
+            wait = min(wait, until_window)
+        return max(wait, 1.0)
+
+
+class SeatWatcher:
+    def __init__(self, client: ClassSearchClient, queries: Iterable[CourseQuery], sections: Sequence[str] = (),
+                 log_path: str = DEFAULT_LOG_PATH, fields: Sequence[str] = WATCHED_FIELDS):
+        self.client = client
+        self.queries = list(queries)
+        self.sections = list(sections)
+        self.log_path = log_path
+        self.fields = tuple(fields)
+        # Per course: the validators and body digest of the last response
+        self.validators: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self.digests: Dict[Tuple[str, str], str] = {}
+        self.state: Dict[Tuple[str, str], Dict[str, str]] = self.load_state()
+        self.stats = {"polls": 0, "requests": 0, "not_modified": 0, "unchanged": 0, "parsed": 0,
+                      "errors": 0, "events": 0}
+
+    def load_state(self) -> Dict[Tuple[str, str], Dict[str, str]]:
+        """Last known values per (course, section), replayed from an existing log"""
+        state: Dict[Tuple[str, str], Dict[str, str]] = {}
+        if not os.path.exists(self.log_path):
+            return state
+        with open(self.log_path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                key = (event["course"], event["section"])
+                if event["event"] == "removed":
+                    state.pop(key, None)
+                else:
+                    state[key] = {field: event.get(field, "") for field in ("instructor",) + self.fields}
+        return state
+
+    def fetch(self, query: CourseQuery) -> Optional[str]:
+        """The results page, or None when the server says it has not changed"""
+        course = (query.department, query.catalog)
+        url, data = self.client.request_for(query.department, query.catalog)
+        self.stats["requests"] += 1
+        try:
+            with open_url(url, data, self.validators.get(course), self.client.opener, self.client.timeout) as resp:
+                body = resp.read().decode('utf-8', errors='ignore')
+                validators = {}
+                if resp.headers.get("ETag"):
+                    validators["If-None-Match"] = resp.headers["ETag"]
+                if resp.headers.get("Last-Modified"):
+                    validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        except HTTPError as e:
+            if e.code == 304:
+                self.stats["not_modified"] += 1
+                return None
+            raise
+        self.validators[course] = validators
+        digest = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        if self.digests.get(course) == digest:
+            # No validators from the server, but the same bytes as last time
+            self.stats["unchanged"] += 1
+            return None
+        self.digests[course] = digest
+        return body
+
+    def current(self, query: CourseQuery, html: str) -> Optional[Dict[Tuple[str, str], Dict[str, str]]]:
+        """Watched values per section on the page, or None when no results table could be read"""
+        stream = RowStream(iter_text_chunks(html))
+        rows = list(stream)
+        if not rows and not stream.no_results:
+            return None
+        self.stats["parsed"] += 1
+        columns = stream.columns()
+        course = f"{query.department} {query.catalog}"
+        needle = query.instructor.lower()
+        found = {}
+        for row in rows:
+            record = columns.project(row)
+            if self.sections and not any(section_matches(record["section"], s) for s in self.sections):
+                continue
+            if needle and needle not in record["instructor"].lower():
+                continue
+            found[(course, record["section"])] = {field: record[field] for field in ("instructor",) + self.fields}
+        return found
+
+    def diff(self, course: str, found: Dict[Tuple[str, str], Dict[str, str]]) -> List[Dict]:
+        at = datetime.now().isoformat(timespec='seconds')
+        events = []
+        for key, values in found.items():
+            before = self.state.get(key)
+            if before is None:
+                events.append({"at": at, "event": "added", "course": key[0], "section": key[1], **values})
+                continue
+            previous = {field: before.get(field, "") for field in self.fields if before.get(field, "") != values[field]}
+            if previous:
+                events.append({"at": at, "event": "changed", "course": key[0], "section": key[1], **values,
+                               "previous": previous})
+        for key in [key for key in self.state if key[0] == course and key not in found]:
+            events.append({"at": at, "event": "removed", "course": key[0], "section": key[1],
+                           **self.state[key]})
+        return events
+
+    def record(self, events: List[Dict]):
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+                key = (event["course"], event["section"])
+                if event["event"] == "removed":
+                    self.state.pop(key, None)
+                else:
+                    self.state[key] = {field: event.get(field, "") for field in ("instructor",) + self.fields}
+                log.info("%s %s %s: %s", event["event"], event["course"], event["section"],
+                         ", ".join(f"{field} {event.get(field, '')}" for field in self.fields))
+        self.stats["events"] += len(events)
+
+    def poll_once(self) -> Tuple[List[Dict], bool]:
+        """Poll every course once; returns (events written, whether any request failed)"""
+        self.stats["polls"] += 1
+        events: List[Dict] = []
+        failed = False
+        for query in self.queries:
+            try:
+                html = self.fetch(query)
+            except (HTTPError, URLError, OSError) as e:
+                log.warning("Poll of %s %s failed: %s", query.department, query.catalog, e)
+                self.stats["errors"] += 1
+                # The session may have expired; read the form again next time
+                self.client.form = None
+                failed = True
+                continue
+            if html is None:
+                continue
+            found = self.current(query, html)
+            if found is None:
+                log.warning("No results table for %s %s; keeping the last known seats",
+                            query.department, query.catalog)
+                continue
+            events.extend(self.diff(f"{query.department} {query.catalog}", found))
+        if events:
+            self.record(events)
+        return events, failed
+
+    def run(self, schedule: PollSchedule, polls: Optional[int] = None, jitter: float = 0.1):
+        """Poll until interrupted (or `polls` times), sleeping as `schedule` says in between"""
+        count = 0
+        try:
+            while polls is None or count < polls:
+                events, failed = self.poll_once()
+                count += 1
+                if polls is not None and count >= polls:
+                    break
+                wait = schedule.next_interval(bool(events), failed)
+                # Spread polls a little so many watchers do not arrive in lockstep
+                wait *= 1 + random.uniform(-jitter, jitter)
+                log.debug("Next poll in %.1f s", wait)
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            log.info("Stopped")
+        log.info("Watch stats: %s", self.stats)
+
+
+def main():
+    import argparse
+    from schedule_batch import load_queries, parse_query
+    from schedule_log import add_logging_arguments, logging_from_args
+    parser = argparse.ArgumentParser(description="Watch open seats and log only the changes")
+    parser.add_argument('--query', action='append', default=[], metavar='QUERY',
+                        help="'DEPT NUMBER [INSTRUCTOR]' to watch (repeatable)")
+    parser.add_argument('--batch', metavar='FILE', help="file of queries, as for the scraper's --batch")
+    parser.add_argument('--section', action='append', default=[], help="only these sections (repeatable)")
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH, help="JSONL file the changes are appended to")
+    parser.add_argument('--term', default=DEFAULT_TERM)
+    parser.add_argument('--base-url', default=BYU_CLASS_SEARCH_URL)
+    parser.add_argument('--interval', type=float, default=60, help="seconds between polls after a change")
+    parser.add_argument('--min-interval', type=float, default=10, help="seconds between polls in a window")
+    parser.add_argument('--max-interval', type=float, default=900, help="longest interval when nothing changes")
+    parser.add_argument('--backoff', type=float, default=1.5, help="interval growth per quiet poll")
+    parser.add_argument('--window', action='append', default=[], type=parse_window, metavar='START/END',
+                        help="registration window in ISO local time (repeatable)")
+    parser.add_argument('--lead', type=float, default=900, help="seconds before a window to start polling fast")
+    parser.add_argument('--polls', type=int, help="stop after this many polls")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    logging_from_args(args)
+
+    queries = load_queries(args.batch) if args.batch else []
+    queries.extend(parse_query(query) for query in args.query)
+    if not queries:
+        parser.error("nothing to watch: give --query or --batch")
+    client = ClassSearchClient(base_url=args.base_url, term=args.term)
+    watcher = SeatWatcher(client, queries, args.section, args.log)
+    schedule = PollSchedule(args.interval, args.min_interval, args.max_interval, args.backoff, args.window, args.lead)
+    log.info("Watching %d course(s); changes go to %s", len(queries), args.log)
+    watcher.run(schedule, args.polls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Regression tests for fixture recording against a local schedule_mock_server.
+
+    python -m pytest -q test_schedule_fixtures.py
+"""
+import logging
+import os
+import socket
+import tempfile
+import unittest
+
+from schedule_fixtures import FixtureReplayer, record_http
+from schedule_mock_server import MockClassSearchServer
+
+
+def unreachable_url() -> str:
+    """A local URL nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/index.php"
+
+
+class RecordHttpTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "math451")
+        logging.disable(logging.WARNING)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        self.tmp.cleanup()
+
+    def replay(self):
+        return FixtureReplayer(self.directory).client().search("MATH", "451")
+
+    def test_records_a_lookup(self):
+        with MockClassSearchServer() as server:
+            results = record_http(self.directory, "MATH", "451", base_url=server.base_url)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(self.replay(), results)
+
+    def test_failed_lookup_keeps_previous_fixture(self):
+        with MockClassSearchServer() as server:
+            recorded = record_http(self.directory, "MATH", "451", base_url=server.base_url)
+        with self.assertRaises(OSError):
+            record_http(self.directory, "MATH", "451", base_url=unreachable_url())
+        self.assertEqual(self.replay(), recorded)
+
+    def test_rerecording_replaces_fixture(self):
+        with MockClassSearchServer(rows=3) as server:
+            record_http(self.directory, "MATH", "451", base_url=server.base_url)
+        with MockClassSearchServer(rows=5) as server:
+            record_http(self.directory, "MATH", "451", base_url=server.base_url)
+        self.assertEqual(len(self.replay()), 5)
+        leftovers = [name for name in os.listdir(self.tmp.name) if name != "math451"]
+        self.assertEqual(leftovers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()